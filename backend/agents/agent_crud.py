@@ -1,10 +1,14 @@
+import asyncio
 import os
 from strands import Agent
 from .language_model import LanguageModel
+from .agent_executor import agent_executor
+from .review_gate import ReviewAwareCallbackHandler
 from rich.console import Console
 from .tools.task_tools import (
     find_task_tool, create_task_tool, 
-    update_task_tool, delete_task_tool
+    update_task_tool, delete_task_tool,
+    create_tasks_tool, update_tasks_tool, delete_tasks_tool
 )
 
 console = Console()
@@ -36,16 +40,21 @@ class AgentCrud(LanguageModel):
                                     find_task_tool,
                                     create_task_tool,
                                     update_task_tool,
-                                    delete_task_tool
+                                    delete_task_tool,
+                                    create_tasks_tool,
+                                    update_tasks_tool,
+                                    delete_tasks_tool
                                 ],
-                                system_prompt=self.__crud_sys_prompt
+                                system_prompt=self.__crud_sys_prompt,
+                                callback_handler=ReviewAwareCallbackHandler()
                             )
 
         except Exception as e:
             console.print(f"[red](agent_crud.py) | Error initialize agent:[/red]: {e}")
             raise
 
-    async def call(self, prompt):
+    def run(self, prompt):
+        """Blocking model and tool loop; call it on an agent worker thread"""
         try:
             
             agent = self.__agent(prompt)
@@ -56,6 +65,41 @@ class AgentCrud(LanguageModel):
             console.print(f"[red](agent_crud.py) | Error processing your prompt:[/red]: {e}")
             return f"(agent_crud.py) | Error processing your prompt: {str(e)}"
             
+    async def call(self, prompt):
+        return await agent_executor.run(self.run, prompt)
+
+    def stream(self, prompt, emit):
+        """
+        Blocking run through strands' `stream_async`, passing client events to
+        `emit` as they happen: `text` deltas, `tool_start` / `tool_end` per tool
+        call, and a final `result`. Call it on an agent worker thread.
+        """
+        async def run():
+            tools = {}
+            async for event in self.__agent.stream_async(prompt):
+                if "data" in event:
+                    emit({"type": "text", "delta": event["data"]})
+                elif "current_tool_use" in event:
+                    tool_use = event["current_tool_use"] or {}
+                    tool_use_id = tool_use.get("toolUseId")
+                    if tool_use_id and tool_use_id not in tools:
+                        tools[tool_use_id] = tool_use.get("name")
+                        emit({"type": "tool_start", "id": tool_use_id, "tool": tool_use.get("name")})
+                elif "message" in event:
+                    for content in event["message"].get("content", []):
+                        tool_result = content.get("toolResult")
+                        if tool_result:
+                            tool_use_id = tool_result.get("toolUseId")
+                            emit({"type": "tool_end", "id": tool_use_id, "tool": tools.get(tool_use_id),
+                                  "status": tool_result.get("status")})
+                elif "result" in event:
+                    emit({"type": "result", "response": str(event["result"])})
+        asyncio.run(run())
+
+    def reset(self):
+        """Forget the previous conversation so the next prompt starts fresh"""
+        self.__agent.messages.clear()
+
     def close(self):
         """Cleanup resources used by the agents"""
         try:
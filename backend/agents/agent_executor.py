@@ -0,0 +1,127 @@
+"""
+Bounded execution of agent work.
+
+A strands Agent call is a synchronous, multi-second model and tool loop.
+Agents run it on the worker threads of `agent_executor` instead of inline,
+and `/api/agent/*` requests are admitted through `admission()`. At most
+`max_active` prompts are processed at once and at most `queue_size` more
+wait for a slot. Anything beyond that is refused straight away with a
+`Retry-After` estimate, so a burst of prompts cannot take every server
+thread away from the plain task endpoints.
+"""
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable
+from utils.thread_budget import AGENT_THREADS, capped
+
+class AgentBusyError(Exception):
+    """Raised when the agent queue is full; `retry_after` is a hint in seconds"""
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class AgentExecutor:
+    def __init__(self, workers: int = 8, max_active: int = 4, queue_size: int = 4,
+                 initial_estimate: float = 10.0, max_retry_after: int = 60):
+        self.workers = max(workers, 1)
+        self.max_active = max(max_active, 1)
+        self.queue_size = max(queue_size, 0)
+        self.max_retry_after = max_retry_after
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='agent-worker')
+        self._lock = threading.Lock()
+        self._admitted = 0
+        # Moving average of how long an admitted request takes, for Retry-After
+        self._avg_seconds = initial_estimate
+
+        # Monitoring counters
+        self.accepted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.running = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_active + self.queue_size
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up"""
+        with self._lock:
+            waves = max(self._admitted - self.max_active + 1, 1) / self.max_active
+            return min(max(math.ceil(self._avg_seconds * waves), 1), self.max_retry_after)
+
+    @contextmanager
+    def admission(self):
+        """Admit one agent request for the duration of the block, or raise AgentBusyError"""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self.rejected += 1
+                full = True
+            else:
+                self._admitted += 1
+                self.accepted += 1
+                full = False
+        if full:
+            raise AgentBusyError(f'Agent queue is full ({self.capacity} requests), try again later',
+                                 self.retry_after())
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._admitted -= 1
+                self.completed += 1
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * elapsed
+
+    def _track(self, fn: Callable, *args):
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def submit(self, fn: Callable, *args):
+        """Run `fn(*args)` on an agent worker (with the caller's context); returns a concurrent Future"""
+        return self._executor.submit(contextvars.copy_context().run, self._track, fn, *args)
+
+    async def run(self, fn: Callable, *args):
+        """Await `fn(*args)` on an agent worker without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'running': self.running,
+                'admitted': self._admitted,
+                'max_active': self.max_active,
+                'queue_size': self.queue_size,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+                'avg_request_seconds': round(self._avg_seconds, 2)
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_pool_size = int(os.getenv('AGENT_POOL_SIZE', '4'))
+# Admitted prompts hold a server thread each, so running plus waiting stays within the agent share
+_max_active = max(min(_pool_size, AGENT_THREADS), 1)
+
+# Global executor; two workers per pooled gateway so a speculative review and CRUD run can overlap
+agent_executor = AgentExecutor(
+    workers=int(os.getenv('AGENT_WORKERS', str(_pool_size * 2))),
+    max_active=_max_active,
+    queue_size=capped('AGENT_QUEUE_SIZE', AGENT_THREADS - _max_active)
+)
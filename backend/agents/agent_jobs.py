@@ -0,0 +1,254 @@
+"""
+Background agent jobs stored in Postgres.
+
+`POST /api/agent/jobs` inserts a row into `agent_jobs` and returns straight
+away. Worker threads in every API process claim queued rows with
+`FOR UPDATE SKIP LOCKED`, run the prompt through a pooled AgentGateway and
+write the outcome back, so a job survives client disconnects and restarts
+and is picked up by whichever process is free. Running jobs are
+heartbeated; a job whose process died is failed (or re-queued, when
+AGENT_JOBS_MAX_ATTEMPTS allows another try) once its heartbeat is stale.
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+from typing import Optional
+from utils.db_connection import db
+from utils.jwt_utils import generate_jwt_token
+from .gateway_pool import agent_pool, AgentPoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_QUERY = """
+INSERT INTO agent_jobs (user_id, username, role, prompt, speculative)
+VALUES (%s, %s, %s, %s, %s)
+RETURNING *
+"""
+
+GET_QUERY = "SELECT * FROM agent_jobs WHERE job_id = %s"
+
+# Oldest queued job nobody else is claiming right now
+CLAIM_QUERY = """
+UPDATE agent_jobs SET
+    status = 'running',
+    attempts = attempts + 1,
+    locked_by = %s,
+    started_at = now(),
+    heartbeat_at = now()
+WHERE job_id = (
+    SELECT job_id FROM agent_jobs
+    WHERE status = 'queued'
+    ORDER BY created_at, job_id
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+)
+RETURNING *
+"""
+
+# Guarded by locked_by: a job taken over after a stale heartbeat is not overwritten
+FINISH_QUERY = """
+UPDATE agent_jobs SET
+    status = %s,
+    response = %s,
+    error = %s,
+    finished_at = now(),
+    locked_by = NULL
+WHERE job_id = %s AND locked_by = %s
+"""
+
+# Give a claimed job back without counting the attempt (no gateway was free)
+REQUEUE_QUERY = """
+UPDATE agent_jobs SET status = 'queued', attempts = attempts - 1, locked_by = NULL, started_at = NULL
+WHERE job_id = %s AND locked_by = %s
+"""
+
+HEARTBEAT_QUERY = "UPDATE agent_jobs SET heartbeat_at = now() WHERE job_id = ANY(%s::bigint[]) AND locked_by = %s"
+
+# An agent run may already have written tasks, so a stale job is only retried when attempts allow it
+RECOVER_QUERY = """
+UPDATE agent_jobs SET
+    status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'queued' END,
+    error = CASE WHEN attempts >= %s THEN 'Worker stopped before the job finished' ELSE error END,
+    finished_at = CASE WHEN attempts >= %s THEN now() END,
+    locked_by = NULL
+WHERE status = 'running' AND heartbeat_at < now() - make_interval(secs => %s)
+RETURNING job_id, status
+"""
+
+class AgentJobQueue:
+    def __init__(self, workers: int = 2, poll_interval: float = 2.0, heartbeat_interval: float = 30.0,
+                 stale_after: float = 300.0, max_attempts: int = 1):
+        self.workers = max(workers, 0)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.max_attempts = max(max_attempts, 1)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._threads = []
+        self._running = set()           # job ids this process is running
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._stop = threading.Event()
+
+        # Monitoring counters
+        self.enqueued = 0
+        self.claimed = 0
+        self.succeeded = 0
+        self.rejected = 0
+        self.failed = 0
+        self.recovered = 0
+        self.last_error = None
+
+    # API side
+
+    def enqueue(self, prompt: str, user: dict, speculative: bool = False) -> dict:
+        """Queue a prompt on behalf of `user` (the JWT payload); the job later runs as that user"""
+        if user.get('user_id') is None:
+            raise ValueError('Agent jobs need the submitting user')
+        job = db.execute_query(
+            ENQUEUE_QUERY, (user['user_id'], user.get('username'), user.get('role'), prompt, speculative),
+            fetch_one=True
+        )
+        with self._wake:
+            self.enqueued += 1
+            # A local worker can start at once instead of at its next poll
+            self._wake.notify()
+        return job
+
+    def get(self, job_id: int) -> Optional[dict]:
+        # Status changes are written on the primary; a replica could report a finished job as running
+        with db.use_primary():
+            return db.execute_query(GET_QUERY, (job_id,), fetch_one=True)
+
+    # Worker side
+
+    def start(self):
+        """Start the worker threads and the heartbeat / recovery thread (no-op when workers is 0)"""
+        if not self.workers or self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'agent-job-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._maintain, name='agent-job-maintenance', daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        logger.info(f"Agent job workers started ({self.workers} threads, worker id {self.worker_id})")
+
+    def _claim(self) -> Optional[dict]:
+        job = db.execute_query(CLAIM_QUERY, (self.worker_id,), fetch_one=True)
+        if job:
+            with self._lock:
+                self.claimed += 1
+                self._running.add(job['job_id'])
+        return job
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Claiming an agent job failed: {e}")
+                job = None
+            if job is None:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            try:
+                self._run(job)
+            finally:
+                with self._lock:
+                    self._running.discard(job['job_id'])
+
+    def _run(self, job: dict):
+        job_id = job['job_id']
+        logger.info(f"Running agent job {job_id} (attempt {job['attempts']})")
+        if job['user_id'] is None:
+            self._finish(job_id, 'failed', error='Job has no submitting user')
+            return
+        # The job acts as the user who submitted it: the tools get a token for that user, never a fallback login
+        token = generate_jwt_token({'id': job['user_id'], 'username': job['username'], 'role': job['role']})
+        try:
+            with agent_pool.gateway() as gateway:
+                result = asyncio.run(gateway.call_agents(job['prompt'], token, speculative=job['speculative']))
+        except AgentPoolTimeoutError as e:
+            logger.warning(f"Agent job {job_id} re-queued: {e}")
+            db.execute_query(REQUEUE_QUERY, (job_id, self.worker_id))
+            return
+        except Exception as e:
+            logger.error(f"Agent job {job_id} failed: {e}")
+            self._finish(job_id, 'failed', error=str(e))
+            return
+
+        status = result.get('status') if isinstance(result, dict) else 'success'
+        message = result.get('message') if isinstance(result, dict) else result
+        if status == 'success':
+            self._finish(job_id, 'succeeded', response=str(message))
+        elif status == 'rejected':
+            self._finish(job_id, 'rejected', response=str(message))
+        else:
+            self._finish(job_id, 'failed', error=str(message))
+
+    def _finish(self, job_id: int, status: str, response: Optional[str] = None, error: Optional[str] = None):
+        try:
+            db.execute_query(FINISH_QUERY, (status, response, error, job_id, self.worker_id))
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Recording the outcome of agent job {job_id} failed: {e}")
+            return
+        with self._lock:
+            setattr(self, status, getattr(self, status) + 1)
+
+    def _maintain(self):
+        """Heartbeat this process's running jobs and recover jobs whose process went away"""
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                with self._lock:
+                    running = list(self._running)
+                if running:
+                    db.execute_query(HEARTBEAT_QUERY, (running, self.worker_id))
+                recovered = db.execute_query(
+                    RECOVER_QUERY, (self.max_attempts,) * 3 + (self.stale_after,), fetch_all=True
+                ) or []
+                for job in recovered:
+                    logger.warning(f"Agent job {job['job_id']} had a stale heartbeat, now {job['status']}")
+                with self._wake:
+                    self.recovered += len(recovered)
+                    if any(job['status'] == 'queued' for job in recovered):
+                        self._wake.notify_all()
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Agent job maintenance failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'worker_id': self.worker_id,
+                'running': len(self._running),
+                'enqueued': self.enqueued,
+                'claimed': self.claimed,
+                'succeeded': self.succeeded,
+                'rejected': self.rejected,
+                'failed': self.failed,
+                'recovered': self.recovered,
+                'last_error': self.last_error
+            }
+
+    def close(self):
+        """Stop claiming jobs; runs in progress finish in the background"""
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+
+# Global job queue; AGENT_JOB_WORKERS=0 only enqueues and leaves the work to other processes
+agent_jobs = AgentJobQueue(
+    workers=int(os.getenv('AGENT_JOB_WORKERS', '2')),
+    poll_interval=float(os.getenv('AGENT_JOBS_POLL_INTERVAL', '2')),
+    stale_after=float(os.getenv('AGENT_JOBS_STALE_SECONDS', '300')),
+    max_attempts=int(os.getenv('AGENT_JOBS_MAX_ATTEMPTS', '1'))
+)
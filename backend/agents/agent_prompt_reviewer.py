@@ -1,6 +1,7 @@
-import os
 from strands import Agent
 from .language_model import LanguageModel
+from .agent_executor import agent_executor
+from .verdict_cache import verdict_cache, REVIEWER_PROMPT_PATH
 from rich.console import Console
 
 
@@ -11,10 +12,7 @@ class AgentPromptReviewer(LanguageModel):
         try:
             super().__init__()
             
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            prompt_path = os.path.join(base_dir, "system_prompts", "ai-agent-reviewer.txt")
-            with open(prompt_path,"r") as f:
-                self.__reviewer_sys_prompt = f.read()
+            self.__load_system_prompt()
             
             self.__initialize_reviewer_agent()
             
@@ -25,6 +23,11 @@ class AgentPromptReviewer(LanguageModel):
             console.print(f"[red](agent_prompt_reviewer.py) | Error in model initialization: {e}[/red]")
             raise
     
+    def __load_system_prompt(self):
+        self.__prompt_version = verdict_cache.prompt_version()
+        with open(REVIEWER_PROMPT_PATH,"r") as f:
+            self.__reviewer_sys_prompt = f.read()
+
     def __initialize_reviewer_agent(self):
         try:
             self.__agent = Agent(
@@ -41,6 +44,14 @@ class AgentPromptReviewer(LanguageModel):
         Review the user prompt to ensure it is relevant to the task management capabilities.
         Returns True if the prompt is relevant, False otherwise.
         """
+        # The verdict cache is flushed when the prompt file changes; pick up the new text too
+        if verdict_cache.prompt_version() != self.__prompt_version:
+            self.__load_system_prompt()
+
+        cached = verdict_cache.get(prompt)
+        if cached is not None:
+            console.print(f"[yellow]Prompt REVIEW (cached): {prompt}[/yellow]")
+            return cached
         
         review_prompt = self.__reviewer_sys_prompt.format(
                 prompt=str(prompt),
@@ -59,10 +70,9 @@ class AgentPromptReviewer(LanguageModel):
                  # Fallback for unexpected response structure
                  result = str(response).strip()
 
-            if "SAFE" in result:
-                return True, None
-            else:
-                return False, result
+            verdict = (True, None) if "SAFE" in result else (False, result)
+            verdict_cache.put(prompt, *verdict)
+            return verdict
                 
         except Exception as e:
             console.print(f"[red]Error in prompt review: {e}[/red]")
@@ -70,8 +80,8 @@ class AgentPromptReviewer(LanguageModel):
 
     async def call(self, prompt):
         try:
-            # Step 1: Review the prompt
-            is_relevant, review_message = self.__review_prompt(prompt)
+            # Step 1: Review the prompt (blocking model call, kept off the event loop)
+            is_relevant, review_message = await agent_executor.run(self.__review_prompt, prompt)
             
             return is_relevant, review_message
 
@@ -80,6 +90,10 @@ class AgentPromptReviewer(LanguageModel):
             console.print(f"[red](agent_prompt_reviewer.py) | Error processing your prompt:[/red]: {e}")
             return f"(agent_prompt_reviewer.py) | Error processing your prompt: {str(e)}"
             
+    def reset(self):
+        """Forget the previous conversation so the next prompt starts fresh"""
+        self.__agent.messages.clear()
+
     def close(self):
         """Cleanup resources used by the agents"""
         try:
@@ -1,27 +1,102 @@
+import asyncio
+import queue
+from .agent_executor import agent_executor
 from .agent_crud import AgentCrud
 from .agent_prompt_reviewer import AgentPromptReviewer
-from utils.context import request_token
+from .review_gate import ReviewGate, REVIEW_TIMEOUT
+from utils.context import request_token, review_gate, task_snapshot
+from utils.task_snapshot import TaskSnapshot
 from rich.console import Console
 
 console = Console()
 
+# Queued by the CRUD worker once its stream has ended
+_STREAM_END = object()
+
 class AgentGateway():
     def __init__(self):
         try:
             self.__reviewer_agent = AgentPromptReviewer()
             self.__crud_agent = AgentCrud()
+            # Speculative CRUD run still finishing after a rejection; the pool waits for it
+            self.pending = None
 
         except Exception as e:
             console.print_exception(show_locals=True)
             console.print(f"[red](geteway.py) | Error in model initialization: {e}[/red]")
             raise
 
-    async def call_agents(self, prompt, token=None):
+    def reset(self):
+        """Clear both agents' conversations; pooled gateways are reused across requests"""
+        self.__reviewer_agent.reset()
+        self.__crud_agent.reset()
+
+    def __abandon(self, gate, crud_future):
+        """
+        Reject the gate: held writes are dropped and the run stops at its next
+        step. The gateway goes back to the pool once the run has wound down.
+        """
+        gate.reject()
+        self.pending = crud_future
+        crud_future.add_done_callback(lambda _: self.reset())
+
+    async def __call_speculative(self, prompt):
+        """
+        Start the CRUD agent and the review at the same time. Mutating tools
+        wait on the review gate, so the CRUD agent can look tasks up and plan
+        but writes nothing until the prompt is approved.
+        """
+        gate = ReviewGate()
+        gate_ctx = review_gate.set(gate)
+        try:
+            # The worker runs in a copy of this context, gate included
+            crud_future = agent_executor.submit(self.__crud_agent.run, prompt)
+        finally:
+            review_gate.reset(gate_ctx)
+
+        try:
+            is_relevant, review_message = await self.__reviewer_agent.call(prompt)
+        except BaseException:
+            self.__abandon(gate, crud_future)
+            raise
+
+        if not is_relevant:
+            self.__abandon(gate, crud_future)
+            console.print(f"\n[red]Prompt rejected by Reviewer Agent: {review_message}[/red]")
+            return {
+                "status": "rejected",
+                "message": review_message
+            }
+
+        gate.approve()
+        if gate.timed_out:
+            # A write waited longer than REVIEW_TIMEOUT and was dropped; the run is being stopped
+            self.__abandon(gate, crud_future)
+            console.print(f"\n[red]Review verdict arrived after {REVIEW_TIMEOUT:.0f}s, speculative run discarded[/red]")
+            return {
+                "status": "timeout",
+                "message": f"The prompt review took longer than {REVIEW_TIMEOUT:.0f}s, so no changes were made. Please try again."
+            }
+        console.print(f"\n[green]Prompt accepted by Reviewer Agent (speculative run released)[/green]")
+        agent = await asyncio.wrap_future(crud_future)
+        return {
+            "status": "success",
+            "message": agent
+        }
+
+    async def call_agents(self, prompt, token=None, speculative=False):
+        token_ctx = None
+        # One task snapshot per run, shared by every tool call (see utils/task_snapshot.py)
+        snapshot_ctx = task_snapshot.set(TaskSnapshot())
         try:
-            token_ctx = None
+            # Each request starts from an empty conversation, whoever used this gateway before
+            self.reset()
             
             if token:
                 token_ctx = request_token.set(token)
+
+            if speculative:
+                return await self.__call_speculative(prompt)
             
             is_relevant, review_message = await self.__reviewer_agent.call(prompt)
             
@@ -51,6 +126,80 @@ class AgentGateway():
         finally:
             if token_ctx:
                 request_token.reset(token_ctx)
+            task_snapshot.reset(snapshot_ctx)
+
+            # Don't keep the prompt (and tool results) around until the next request;
+            # a still-running speculative run resets when it finishes
+            if self.pending is None:
+                self.reset()
+
+    def stream_agents(self, prompt, token=None, heartbeat=15.0):
+        """
+        Generator of client events for one prompt: `status` straight away,
+        the reviewer's `review` verdict, then the CRUD agent's `text`,
+        `tool_start` and `tool_end` events as they happen, and finally `done`
+        (or `error`). Yields None after `heartbeat` idle seconds so the caller
+        can keep the connection alive. The review is not speculative here.
+        """
+        crud_future = None
+        try:
+            # Each request starts from an empty conversation, whoever used this gateway before
+            self.reset()
+            yield {"type": "status", "stage": "reviewing"}
+
+            is_relevant, review_message = asyncio.run(self.__reviewer_agent.call(prompt))
+            if not is_relevant:
+                console.print(f"\n[red]Prompt rejected by Reviewer Agent: {review_message}[/red]")
+                yield {"type": "review", "status": "rejected", "message": review_message}
+                yield {"type": "done", "status": "rejected", "response": review_message}
+                return
+
+            console.print(f"\n[green]Prompt accepted by Reviewer Agent (streaming)[/green]")
+            yield {"type": "review", "status": "accepted"}
+
+            events = queue.Queue()
+            # The worker runs in a copy of this context, token and task snapshot included
+            token_ctx = request_token.set(token) if token else None
+            snapshot_ctx = task_snapshot.set(TaskSnapshot())
+            try:
+                crud_future = agent_executor.submit(self.__crud_agent.stream, prompt, events.put)
+            finally:
+                task_snapshot.reset(snapshot_ctx)
+                if token_ctx:
+                    request_token.reset(token_ctx)
+            crud_future.add_done_callback(lambda _: events.put(_STREAM_END))
+
+            response = None
+            while True:
+                try:
+                    event = events.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield None
+                    continue
+                if event is _STREAM_END:
+                    break
+                if event["type"] == "result":
+                    response = event["response"]
+                    continue
+                yield event
+
+            crud_future.result()
+            yield {"type": "done", "status": "success", "response": response}
+
+        except Exception as e:
+            console.print_exception(show_locals=True)
+            console.print(f"[red](geteway.py) | Error streaming your prompt:[/red]: {e}")
+            yield {"type": "error", "message": f"(geteway.py) | Error processing your prompt: {str(e)}"}
+
+        finally:
+            if crud_future is not None and not crud_future.done():
+                # Client went away mid-run; the pool waits for the run before lending the gateway out
+                self.pending = crud_future
+                crud_future.add_done_callback(lambda _: self.reset())
+            else:
+                self.reset()
 
-            self.__reviewer_agent.close()
-            self.__crud_agent.close()
\ No newline at end of file
+    def close(self):
+        """Release both agents; called when a gateway leaves the pool"""
+        self.__reviewer_agent.close()
+        self.__crud_agent.close()
\ No newline at end of file
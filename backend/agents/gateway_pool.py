@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from rich.console import Console
+from .gateway import AgentGateway
+
+console = Console()
+
+class AgentPoolTimeoutError(Exception):
+    """Raised when no agent gateway becomes free within the acquire timeout"""
+
+class AgentGatewayPool:
+    """
+    Per-process pool of long-lived AgentGateway instances.
+    Building a gateway creates two Gemini clients, reads both system prompts
+    and builds two strands Agents; pooled gateways pay that once and are then
+    lent to one request at a time (each call starts from an empty conversation).
+    """
+    def __init__(self, max_size: int = 4, timeout: float = 30.0):
+        self.max_size = max(max_size, 1)
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        # Monitoring counters
+        self.created = 0
+        self.reused = 0
+        self.setup_seconds = 0.0
+
+    def _create(self) -> AgentGateway:
+        start = time.perf_counter()
+        gateway = AgentGateway()
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self.created += 1
+            self.setup_seconds += elapsed
+        console.print(f"[green]Agent gateway ready in {elapsed * 1000:.0f}ms ({self._size}/{self.max_size})[/green]")
+        return gateway
+
+    def acquire(self) -> AgentGateway:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise AgentPoolTimeoutError('Agent pool is closed')
+                if self._idle:
+                    self._in_use += 1
+                    self.reused += 1
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    # Reserve the slot, build the gateway outside the lock
+                    self._size += 1
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    raise AgentPoolTimeoutError(f'No agent available within {self.timeout:.0f}s')
+
+        try:
+            return self._create()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, gateway: AgentGateway, discard: bool = False):
+        pending = gateway.pending
+        if pending is not None:
+            if not pending.done():
+                # A rejected speculative run is still winding down; lend the gateway out only after it
+                pending.add_done_callback(lambda _: self.release(gateway, discard))
+                return
+            gateway.pending = None
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append(gateway)
+            self._cond.notify()
+        if discard or self._closed:
+            gateway.close()
+
+    @contextmanager
+    def gateway(self):
+        """Borrow a gateway for the duration of one request"""
+        gateway = self.acquire()
+        discard = False
+        try:
+            yield gateway
+        except BaseException:
+            # Agent state after an unexpected failure is unknown; build a fresh one next time
+            discard = True
+            raise
+        finally:
+            self.release(gateway, discard=discard)
+
+    def warm(self, count: int):
+        """Build up to `count` idle gateways ahead of the first request"""
+        gateways = []
+        try:
+            for _ in range(min(count, self.max_size)):
+                gateways.append(self.acquire())
+        finally:
+            for gateway in gateways:
+                self.release(gateway)
+
+    def stats(self) -> dict:
+        with self._cond:
+            avg_setup_ms = self.setup_seconds / self.created * 1000 if self.created else None
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'max_size': self.max_size,
+                'created': self.created,
+                'reused': self.reused,
+                'avg_setup_ms': round(avg_setup_ms, 1) if avg_setup_ms is not None else None,
+                # Setup time requests did not pay because a warm gateway was ready
+                'saved_setup_ms': round(avg_setup_ms * self.reused, 1) if avg_setup_ms is not None else 0
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for gateway in idle:
+            gateway.close()
+
+# Global gateway pool instance
+agent_pool = AgentGatewayPool(
+    max_size=int(os.getenv('AGENT_POOL_SIZE', '4')),
+    timeout=float(os.getenv('AGENT_POOL_TIMEOUT', '30'))
+)
@@ -0,0 +1,79 @@
+import logging
+import os
+import threading
+from strands.handlers.callback_handler import PrintingCallbackHandler
+from rich.console import Console
+from utils.context import review_gate
+
+console = Console()
+logger = logging.getLogger(__name__)
+
+REVIEW_TIMEOUT = float(os.getenv('AGENT_REVIEW_TIMEOUT', '60'))
+
+class ReviewRejected(Exception):
+    """Raised inside a speculative CRUD run once the reviewer has rejected the prompt"""
+
+class ReviewGate:
+    """
+    Verdict of the Reviewer Agent for one speculative request.
+    The CRUD agent starts planning before the verdict is known; every
+    mutating task operation waits here, so nothing is written unless the
+    reviewer said SAFE. If no verdict arrives within REVIEW_TIMEOUT the gate
+    closes for good: the run is stopped like a rejected one and the gateway
+    answers with a timeout error instead of a success.
+    """
+    def __init__(self):
+        self._decided = threading.Event()
+        self._lock = threading.Lock()
+        self.approved = None
+        self.timed_out = False
+
+    @property
+    def decided(self) -> bool:
+        return self._decided.is_set()
+
+    @property
+    def rejected(self) -> bool:
+        return self.approved is False
+
+    def _decide(self, approved: bool):
+        with self._lock:
+            # A late verdict cannot reopen a gate that timed out
+            if not self.timed_out:
+                self.approved = approved
+                self._decided.set()
+
+    def approve(self):
+        self._decide(True)
+
+    def reject(self):
+        self._decide(False)
+
+    def wait(self, timeout: float = REVIEW_TIMEOUT) -> bool:
+        """Block until the verdict is in; True only if the prompt was approved"""
+        if not self._decided.wait(timeout):
+            with self._lock:
+                if not self._decided.is_set():
+                    self.timed_out = True
+                    self.approved = False
+                    self._decided.set()
+            if self.timed_out:
+                logger.warning(f"No review verdict within {timeout:.0f}s, speculative run stopped without writing")
+                console.print(f"[red]No review verdict within {timeout:.0f}s, holding back write[/red]")
+        return bool(self.approved)
+
+def review_passed() -> bool:
+    """
+    Called by mutating task tools before they write. Outside speculative mode
+    there is no gate (the review already passed before the CRUD agent ran).
+    """
+    gate = review_gate.get()
+    return gate is None or gate.wait()
+
+class ReviewAwareCallbackHandler(PrintingCallbackHandler):
+    """Default console streaming, but stops a speculative run as soon as the prompt is rejected"""
+    def __call__(self, **kwargs):
+        gate = review_gate.get()
+        if gate is not None and gate.rejected:
+            raise ReviewRejected('Prompt rejected by the reviewer, speculative run stopped')
+        super().__call__(**kwargs)
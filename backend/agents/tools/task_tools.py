@@ -1,77 +1,511 @@
 """
 Task management tools for AI agent
-These tools provide CRUD operations for tasks via HTTP requests to the Flask API
+These tools provide CRUD operations for tasks through a pluggable backend:
+`local` (default) calls the shared task repository in-process, `http` calls
+the Flask API over HTTP for agents deployed apart from the API.
 """
-import requests
 import os
+import threading
+from abc import ABC, abstractmethod
+import requests
 from strands import tool
 from dotenv import load_dotenv
 from typing import Dict, Any, List, Optional
 from rich.console import Console
-from utils.context import request_token
+from utils.context import request_token, task_snapshot
+from utils.task_snapshot import UNKNOWN
+from utils.db_connection import db
+from utils.status_cache import status_cache
+from repositories.task_repository import task_repository, validate_new_task, validate_task_update
+from agents.review_gate import review_passed
 
 load_dotenv()
 console = Console()
 
-class TaskTools:
-    def __init__(self):
-        self.base_url = os.getenv('BASE_URL')
-        token = request_token.get() or self.get_auth_token()
-        self.headers = {"Authorization": f"Bearer {token}"}
-        console.print(f"[green]Successfully create token {self.headers}[/green]")
-    
-    def get_auth_token(self):
-        """Get JWT token by logging in"""
-        try:
-            login_data = {
-                "username": "admin",
-                "password": "admin"
-            }
-            response = requests.post(f"{self.base_url}/api/users/login", json=login_data)
-            if response.status_code == 200:
-                return response.json()['token']
-            return None
-        except Exception as e:
-            console.print(f"[red]Error create JWT: {e}[/red]")
-        
+TASK_TOOLS_BACKEND = os.getenv('TASK_TOOLS_BACKEND', 'local').lower()
+
+def as_task_id(value) -> Optional[int]:
+    """Task id from model output, which may send 3, 3.0 or "3"; None when it is not one"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+class TaskToolsBase(ABC):
+    """
+    Operations shared by every backend. Writes are checked against the
+    review gate here, so a backend only implements the data access hooks
+    (the abstract methods); a backend missing one cannot be instantiated.
+    """
+    def _remember(self, tasks: List[Dict[str, Any]]):
+        """Record this run's own writes in its snapshot"""
+        snapshot = task_snapshot.get()
+        if snapshot is not None:
+            snapshot.put(tasks)
+
+    def _forget(self, task_ids: List[int]):
+        snapshot = task_snapshot.get()
+        if snapshot is not None:
+            snapshot.remove(task_ids)
+
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        """Get all tasks from the database"""
-        try:
-            response = requests.get(f"{self.base_url}/api/tasks", headers=self.headers)
-            response.raise_for_status()
-            tasks = response.json()
-            console.print(f"[green]Successfully retrieved {len(tasks)} tasks[/green]")
-            return tasks
-        except requests.exceptions.RequestException as e:
-            console.print(f"[red]Error getting tasks: {e}[/red]")
-            return []
-    
+        """Get all tasks; a second call in the same agent run is answered from its snapshot"""
+        snapshot = task_snapshot.get()
+        tasks = snapshot.tasks() if snapshot else None
+        if tasks is None:
+            try:
+                tasks = self._fetch_all_tasks()
+            except Exception as e:
+                console.print(f"[red]Error getting tasks: {e}[/red]")
+                return []
+            if snapshot:
+                snapshot.loaded(tasks)
+        console.print(f"[green]Successfully retrieved {len(tasks)} tasks[/green]")
+        return tasks
+
     def get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific task by ID"""
-        try:
-            response = requests.get(f"{self.base_url}/api/tasks/{task_id}", headers=self.headers)
-            response.raise_for_status()
-            task = response.json()
-            console.print(f"[green]Successfully retrieved task {task_id}[/green]")
-            return task
-        except requests.exceptions.RequestException as e:
-            console.print(f"[red]Error getting task {task_id}: {e}[/red]")
+        snapshot = task_snapshot.get()
+        task = snapshot.get(task_id) if snapshot else UNKNOWN
+        if task is UNKNOWN:
+            try:
+                task = self._get_task_by_id(task_id)
+            except Exception as e:
+                console.print(f"[red]Error getting task {task_id}: {e}[/red]")
+                return None
+            if task and snapshot:
+                snapshot.seen([task])
+        if not task:
+            console.print(f"[red]Error getting task {task_id}: not found[/red]")
             return None
-    
+        console.print(f"[green]Successfully retrieved task {task_id}[/green]")
+        return task
+
+    def search_tasks(self, query: str, mode: str = "fuzzy", limit: int = 5) -> List[Dict[str, Any]]:
+        """Search tasks by title (exact | prefix | fuzzy), best match first"""
+        try:
+            tasks = self._search_tasks(query, mode, limit)
+        except Exception as e:
+            console.print(f"[red]Error searching tasks: {e}[/red]")
+            return []
+        console.print(f"[green]Search '{query}' ({mode}) returned {len(tasks)} tasks[/green]")
+        return tasks
+
+    def find_task_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """Find a task by its title (case-insensitive): the run's snapshot, else the indexed search"""
+        snapshot = task_snapshot.get()
+        task = snapshot.find(title) if snapshot else UNKNOWN
+        if task is UNKNOWN:
+            try:
+                task = self._find_task_by_title(title)
+            except Exception as e:
+                console.print(f"[red]Error finding task '{title}': {e}[/red]")
+                return None
+            if snapshot:
+                snapshot.found(title, task)
+        if not task:
+            console.print(f"[yellow]Task with title '{title}' not found[/yellow]")
+        return task
+
+    def _find_titles(self, titles: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Tasks keyed by lower-cased title: the run's snapshot, and one lookup for the titles it can't answer"""
+        snapshot = task_snapshot.get()
+        found = {}
+        missing = []
+        for title in titles:
+            task = snapshot.find(title) if snapshot else UNKNOWN
+            if task is UNKNOWN:
+                missing.append(title)
+            elif task:
+                found[title.lower()] = task
+        if missing:
+            try:
+                looked_up = self._find_by_titles(missing)
+            except Exception as e:
+                console.print(f"[red]Error finding tasks {missing}: {e}[/red]")
+                return found
+            for title in missing:
+                if snapshot:
+                    snapshot.found(title, looked_up.get(title.lower()))
+            found.update(looked_up)
+        return found
+
     def create_task(self, title: str, description: str = "no description", status_id: str = "TODO") -> Optional[Dict[str, Any]]:
         """Create a new task"""
-        try:
-            data = {
-                "title": title,
-                "description": description,
-                "status_id": status_id
-            }
+        if not review_passed():
+            console.print(f"[red]Create of '{title}' cancelled: prompt did not pass review[/red]")
+            return None
+        data = {
+            "title": title,
+            "description": description,
+            "status_id": status_id
+        }
+        console.print(f"[green]Created task payload: {data}[/green]")
+        task = self._create_task(data)
+        if task:
+            self._remember([task])
+        return task
 
-            console.print(f"[green]Created task payload: {data}[/green]")
+    def update_task(self, task_id: int, current_title:str, title: str,  status_id: str,
+                   description: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Update an existing task"""
+        if not review_passed():
+            console.print(f"[red]Update of task {task_id} cancelled: prompt did not pass review[/red]")
+            return None
+        data = {}
+
+        if title is not None:
+            data["title"] = title
+        if description is not None:
+            data["description"] = description
+        if status_id is not None:
+            data["status_id"] = status_id
+        
+        console.print(f"[yellow]Update payload: {data}[/yellow]")
             
-            response = requests.post(f"{self.base_url}/api/tasks", 
-                                   headers=self.headers, 
-                                   json=data)
+        if not data:
+            console.print("[yellow]No fields provided for update[/yellow]")
+            return None
+        task = self._update_task(task_id, current_title, data)
+        if task:
+            self._remember([task])
+        return task
+
+    def delete_task(self, task_id: int, title:str) -> bool:
+        """Delete a task"""
+        if not review_passed():
+            console.print(f"[red]Delete of task {task_id} cancelled: prompt did not pass review[/red]")
+            return False
+        deleted = self._delete_task(task_id, title)
+        if deleted:
+            self._forget([task_id])
+        return deleted
+
+    def create_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many tasks in one transaction. Returns one result per item, in
+        order: {"status": "created", "task": ...} or {"status": "error", "error": ...}.
+        """
+        if not review_passed():
+            console.print(f"[red]Create of {len(tasks)} tasks cancelled: prompt did not pass review[/red]")
+            return [{"status": "error", "error": "prompt did not pass review"} for _ in tasks]
+        items = []
+        for task in tasks:
+            item = dict(task) if isinstance(task, dict) else task
+            if isinstance(item, dict):
+                item.setdefault("description", "no description")
+                item["status_id"] = item.pop("status", None) or item.get("status_id") or "TODO"
+            items.append(item)
+        console.print(f"[green]Create batch payload: {items}[/green]")
+        results = self._create_tasks(items)
+        self._remember([result["task"] for result in results if result.get("status") == "created"])
+        return results
+
+    def update_tasks(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply many updates in one transaction. Each item names its task by
+        task_id or current_title (titles are resolved together) and carries
+        any of title, description and status. Returns one result per item.
+        """
+        if not review_passed():
+            console.print(f"[red]Update of {len(updates)} tasks cancelled: prompt did not pass review[/red]")
+            return [{"status": "error", "error": "prompt did not pass review"} for _ in updates]
+        found = self._find_titles([item["current_title"] for item in updates
+                                   if isinstance(item, dict) and item.get("task_id") is None
+                                   and isinstance(item.get("current_title"), str)])
+        results = [None] * len(updates)
+        items = []
+        indexes = []
+        for index, update in enumerate(updates):
+            if not isinstance(update, dict):
+                results[index] = {"status": "error", "error": "Update must be an object"}
+                continue
+            task_id = as_task_id(update.get("task_id"))
+            if update.get("task_id") is not None and task_id is None:
+                results[index] = {"status": "error", "error": f"Invalid task_id {update.get('task_id')!r}"}
+                continue
+            if task_id is None:
+                task = found.get(str(update.get("current_title", "")).lower())
+                if not task:
+                    results[index] = {"status": "error", "error": f"Task '{update.get('current_title')}' not found"}
+                    continue
+                task_id = task["task_id"]
+            item = {"task_id": task_id}
+            for field in ("title", "description"):
+                if update.get(field) is not None:
+                    item[field] = update[field]
+            status_id = update.get("status") or update.get("status_id")
+            if status_id is not None:
+                item["status_id"] = status_id
+            items.append(item)
+            indexes.append(index)
+        console.print(f"[yellow]Update batch payload: {items}[/yellow]")
+        if items:
+            for index, result in zip(indexes, self._update_tasks(items)):
+                results[index] = result
+            self._remember([result["task"] for result in results
+                            if result and result.get("status") == "updated"])
+        return results
+
+    def delete_tasks(self, task_ids: Optional[List[int]] = None, titles: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Delete many tasks, by id and/or title, in one statement. Returns one
+        result per id, then one per title.
+        """
+        task_ids = list(task_ids or [])
+        titles = list(titles or [])
+        if not review_passed():
+            console.print(f"[red]Delete of {len(task_ids) + len(titles)} tasks cancelled: prompt did not pass review[/red]")
+            return [{"status": "error", "error": "prompt did not pass review"} for _ in task_ids + titles]
+        found = self._find_titles([title for title in titles if isinstance(title, str)])
+        results = [None] * (len(task_ids) + len(titles))
+        ids = []
+        indexes = []
+        for index, ref in enumerate(task_ids + titles):
+            task_id = as_task_id(ref) if index < len(task_ids) else (found.get(str(ref).lower()) or {}).get("task_id")
+            if task_id is None:
+                results[index] = {"status": "error", "error": f"Task '{ref}' not found"}
+                continue
+            ids.append(task_id)
+            indexes.append(index)
+        if ids:
+            for index, result in zip(indexes, self._delete_tasks(ids)):
+                results[index] = result
+            self._forget([task_id for task_id, index in zip(ids, indexes)
+                          if results[index].get("status") == "deleted"])
+        return results
+
+    # Read hooks return None when nothing matches and raise on failure
+
+    @abstractmethod
+    def _fetch_all_tasks(self) -> List[Dict[str, Any]]:
+        """Every task, with status labels"""
+        ...
+
+    @abstractmethod
+    def _get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _find_task_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _search_tasks(self, query: str, mode: str, limit: int) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _find_by_titles(self, titles: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Tasks keyed by lower-cased title"""
+        ...
+
+    # Write hooks report failures in their return value
+
+    @abstractmethod
+    def _create_task(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _update_task(self, task_id: int, current_title: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _delete_task(self, task_id: int, title: str) -> bool:
+        ...
+
+    @abstractmethod
+    def _create_tasks(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _update_tasks(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def _delete_tasks(self, task_ids: List[int]) -> List[Dict[str, Any]]:
+        ...
+
+class LocalTaskTools(TaskToolsBase):
+    """
+    In-process backend: calls the task repository directly, sharing the
+    connection pool and task cache with the API. The agent route already
+    authenticated the user, so there is no token to send or verify.
+    """
+    def _fetch_all_tasks(self):
+        return status_cache.attach(task_repository.list_all())
+
+    def _get_task_by_id(self, task_id):
+        return status_cache.attach(task_repository.get(task_id))
+
+    def _search_tasks(self, query, mode, limit):
+        # The agent reads back what it just wrote, so never serve it from a lagging replica
+        with db.use_primary():
+            return status_cache.attach(task_repository.search(query, mode, limit))
+
+    def _find_task_by_title(self, title):
+        # The agent reads back what it just wrote, so never serve it from a lagging replica
+        with db.use_primary():
+            tasks = task_repository.search(title, "exact", 1)
+        return status_cache.attach(tasks[0]) if tasks else None
+
+    def _create_task(self, data):
+        try:
+            task = task_repository.create(data["title"], data["description"], data["status_id"])
+            console.print(f"[green]Successfully created task: {task['title']}[/green]")
+            return status_cache.attach(task)
+        except Exception as e:
+            console.print(f"[red]Error creating task: {e}[/red]")
+            return None
+
+    def _update_task(self, task_id, current_title, data):
+        try:
+            task = task_repository.update(task_id, data)
+        except Exception as e:
+            console.print(f"[red]Error updating task '{current_title}': {e}[/red]")
+            return None
+        if not task:
+            console.print(f"[red]Error updating task '{current_title}': not found[/red]")
+            return None
+        console.print(f"[green]Successfully updated task '{current_title}'[/green]")
+        return status_cache.attach(task)
+
+    def _delete_task(self, task_id, title):
+        try:
+            task = task_repository.delete(task_id)
+        except Exception as e:
+            console.print(f"[red]Error deleting task '{title}': {e}[/red]")
+            return False
+        if not task:
+            console.print(f"[red]Error deleting task '{title}': not found[/red]")
+            return False
+        console.print(f"[green]Successfully deleted task '{title}'[/green]")
+        return True
+
+    def _find_by_titles(self, titles):
+        if not titles:
+            return {}
+        with db.use_primary():
+            found = task_repository.find_by_titles(titles)
+        return dict(zip(found, status_cache.attach(list(found.values()))))
+
+    def _create_tasks(self, items):
+        results = [None] * len(items)
+        rows = []
+        indexes = []
+        for index, item in enumerate(items):
+            error = validate_new_task(item)
+            if error:
+                results[index] = {"status": "error", "error": error}
+                continue
+            rows.append((item["title"], item["description"], item["status_id"]))
+            indexes.append(index)
+        try:
+            created = status_cache.attach(task_repository.create_many(rows))
+        except Exception as e:
+            console.print(f"[red]Error creating tasks: {e}[/red]")
+            created = []
+            for index in indexes:
+                results[index] = {"status": "error", "error": str(e)}
+        for index, task in zip(indexes, created):
+            results[index] = {"status": "created", "task": task}
+        console.print(f"[green]Successfully created {len(created)} of {len(items)} tasks[/green]")
+        return results
+
+    def _update_tasks(self, items):
+        results = [None] * len(items)
+        valid = []
+        indexes = {}
+        for index, item in enumerate(items):
+            error = validate_task_update(item, indexes)
+            if error:
+                results[index] = {"status": "error", "error": error}
+                continue
+            valid.append(item)
+            indexes[item["task_id"]] = index
+        try:
+            updated = {task["task_id"]: task for task in status_cache.attach(task_repository.update_many(valid))}
+        except Exception as e:
+            console.print(f"[red]Error updating tasks: {e}[/red]")
+            updated, failure = {}, str(e)
+        else:
+            failure = "Task not found"
+        for task_id, index in indexes.items():
+            if task_id in updated:
+                results[index] = {"status": "updated", "task": updated[task_id]}
+            else:
+                results[index] = {"status": "error", "error": failure}
+        console.print(f"[green]Successfully updated {len(updated)} of {len(items)} tasks[/green]")
+        return results
+
+    def _delete_tasks(self, task_ids):
+        unique_ids = list(dict.fromkeys(task_ids))
+        try:
+            deleted = {task["task_id"]: task for task in task_repository.delete_many(unique_ids)}
+        except Exception as e:
+            console.print(f"[red]Error deleting tasks: {e}[/red]")
+            return [{"status": "error", "error": str(e)} for _ in task_ids]
+        console.print(f"[green]Successfully deleted {len(deleted)} of {len(unique_ids)} tasks[/green]")
+        return [{"status": "deleted", "task": deleted[task_id]} if task_id in deleted
+                else {"status": "error", "error": "Task not found"} for task_id in task_ids]
+
+_http = threading.local()
+
+def http_session() -> requests.Session:
+    """Per-thread keep-alive session, so tool calls reuse connections to the API"""
+    session = getattr(_http, 'session', None)
+    if session is None:
+        session = _http.session = requests.Session()
+    return session
+
+class HttpTaskTools(TaskToolsBase):
+    """Remote backend: calls the Flask API at BASE_URL with the caller's token"""
+    def __init__(self):
+        self.base_url = os.getenv('BASE_URL')
+        self.session = http_session()
+        token = request_token.get()
+        if not token:
+            # Acting as anyone but the caller (e.g. a fixed login) would bypass the caller's permissions
+            raise PermissionError("The http task tools need the caller's token")
+        # The agent reads back what it just wrote, so never serve it from a lagging replica
+        self.headers = {"Authorization": f"Bearer {token}", "X-Read-Your-Writes": "1"}
+    
+    def _fetch_all_tasks(self):
+        response = self.session.get(f"{self.base_url}/api/tasks", headers=self.headers)
+        response.raise_for_status()
+        return response.json()
+    
+    def _get_task_by_id(self, task_id):
+        response = self.session.get(f"{self.base_url}/api/tasks/{task_id}", headers=self.headers)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+    
+    def _search_tasks(self, query, mode, limit):
+        response = self.session.get(f"{self.base_url}/api/tasks/search",
+                                    headers=self.headers,
+                                    params={"q": query, "mode": mode, "limit": limit})
+        response.raise_for_status()
+        return response.json()
+
+    def _find_task_by_title(self, title):
+        response = self.session.get(f"{self.base_url}/api/tasks/search",
+                                    headers=self.headers,
+                                    params={"title": title, "limit": 1})
+        response.raise_for_status()
+        tasks = response.json()
+        return tasks[0] if tasks else None
+
+    def _create_task(self, data):
+        try:
+            response = self.session.post(f"{self.base_url}/api/tasks", 
+                                         headers=self.headers, 
+                                         json=data)
             response.raise_for_status()
             task = response.json()
             console.print(f"[green]Successfully created task: {task['title']}[/green]")
@@ -79,38 +513,12 @@ class TaskTools:
         except requests.exceptions.RequestException as e:
             console.print(f"[red]Error creating task: {e}[/red]")
             return None
-    
-    def find_task_by_title(self, title: str) -> Optional[Dict[str, Any]]:
-        """Find a task by its title"""
-        all_tasks = self.get_all_tasks()
-        for task in all_tasks:
-            if task.get('title', '').lower() == title.lower():
-                return task
-        console.print(f"[yellow]Task with title '{title}' not found[/yellow]")
-        return None
 
-    def update_task(self, task_id: int, current_title:str, title: str,  status_id: str,
-                   description: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Update an existing task"""
+    def _update_task(self, task_id, current_title, data):
         try:
-            data = {}
-
-            if title is not None:
-                data["title"] = title
-            if description is not None:
-                data["description"] = description
-            if status_id is not None:
-                data["status_id"] = status_id
-            
-            console.print(f"[yellow]Update payload: {data}[/yellow]")
-                
-            if not data:
-                console.print("[yellow]No fields provided for update[/yellow]")
-                return None
-            
-            response = requests.put(f"{self.base_url}/api/tasks/{task_id}", 
-                                  headers=self.headers, 
-                                  json=data)
+            response = self.session.put(f"{self.base_url}/api/tasks/{task_id}", 
+                                        headers=self.headers, 
+                                        json=data)
             response.raise_for_status()
             task = response.json()
             console.print(f"[green]Successfully updated task '{current_title}'[/green]")
@@ -119,10 +527,9 @@ class TaskTools:
             console.print(f"[red]Error updating task '{current_title}': {e}[/red]")
             return None
     
-    def delete_task(self, task_id: int, title:str) -> bool:
-        """Delete a task"""
+    def _delete_task(self, task_id, title):
         try:
-            response = requests.delete(f"{self.base_url}/api/tasks/{task_id}", headers=self.headers)
+            response = self.session.delete(f"{self.base_url}/api/tasks/{task_id}", headers=self.headers)
             response.raise_for_status()
             console.print(f"[green]Successfully deleted task '{title}'[/green]")
             return True
@@ -130,6 +537,54 @@ class TaskTools:
             console.print(f"[red]Error deleting task '{title}': {e}[/red]")
             return False
 
+    def _find_by_titles(self, titles):
+        # The search endpoint takes one title; still one agent turn, just one request per title
+        found = {}
+        for title in dict.fromkeys(titles):
+            task = self._find_task_by_title(title)
+            if task:
+                found[title.lower()] = task
+        return found
+
+    def _batch(self, method, json, count):
+        """Call a /api/tasks/batch endpoint and return its per-item results"""
+        try:
+            response = self.session.request(method, f"{self.base_url}/api/tasks/batch",
+                                            headers=self.headers, json=json)
+            body = response.json() if response.content else {}
+            if "results" not in body:
+                response.raise_for_status()
+                raise requests.exceptions.RequestException(body.get("error", f"HTTP {response.status_code}"))
+            # 207 / 400 still carry per-item results
+            return [{key: value for key, value in result.items() if key != "index"} for result in body["results"]]
+        except (requests.exceptions.RequestException, ValueError) as e:
+            console.print(f"[red]Error in batch {method}: {e}[/red]")
+            return [{"status": "error", "error": str(e)} for _ in range(count)]
+
+    def _create_tasks(self, items):
+        return self._batch("POST", items, len(items))
+
+    def _update_tasks(self, items):
+        return self._batch("PATCH", items, len(items))
+
+    def _delete_tasks(self, task_ids):
+        # The endpoint refuses duplicate ids; send each once and fan the result back out
+        unique_ids = list(dict.fromkeys(task_ids))
+        by_id = dict(zip(unique_ids, self._batch("DELETE", unique_ids, len(unique_ids))))
+        return [by_id[task_id] for task_id in task_ids]
+
+TASK_TOOLS_BACKENDS = {
+    'local': LocalTaskTools,
+    'http': HttpTaskTools
+}
+
+def TaskTools(backend: str = None) -> TaskToolsBase:
+    """Task tools for the configured backend (TASK_TOOLS_BACKEND: local | http)"""
+    name = backend or TASK_TOOLS_BACKEND
+    if name not in TASK_TOOLS_BACKENDS:
+        raise ValueError(f"Unknown TASK_TOOLS_BACKEND '{name}', expected one of: {', '.join(TASK_TOOLS_BACKENDS)}")
+    return TASK_TOOLS_BACKENDS[name]()
+
 # Tool functions that can be used by the AI agent
 def get_all_tasks_tool() -> str:
     """Tool function to get all tasks. Returns a formatted string with task information."""
@@ -169,6 +624,11 @@ def find_task_tool(title: str) -> str:
     task = task_tools.find_task_by_title(title)
     
     if not task:
+        # Offer close matches so the agent can retry with the right title
+        suggestions = task_tools.search_tasks(title, mode="fuzzy", limit=3)
+        if suggestions:
+            names = ", ".join(f"'{s.get('title')}' (ID: {s.get('task_id')})" for s in suggestions)
+            return f"Task with title '{title}' not found. Similar tasks: {names}"
         return f"Task with title '{title}' not found."
     
     return f"Found Task:\nID: {task.get('task_id')}"
@@ -255,4 +715,68 @@ def delete_task_tool(task_id: int = None, title: str = None) -> str:
     if success:
         return f"Successfully deleted task {task_id}."
     else:
-        return f"Failed to delete task {task_id}."
\ No newline at end of file
+        return f"Failed to delete task {task_id}."
+
+def format_batch_results(action: str, labels: List[str], results: List[Dict[str, Any]]) -> str:
+    """One line per item, so the agent can report exactly what happened in a single turn"""
+    done = sum(1 for result in results if result.get("status") != "error")
+    lines = [f"{action} {done} of {len(results)} tasks:"]
+    for label, result in zip(labels, results):
+        task = result.get("task") or {}
+        if result.get("status") == "error":
+            lines.append(f"- {label}: failed ({result.get('error')})")
+        else:
+            lines.append(f"- {label}: {result.get('status')} '{task.get('title')}' (ID: {task.get('task_id')})")
+    return "\n".join(lines)
+
+@tool
+def create_tasks_tool(tasks: List[Dict[str, Any]]) -> str:
+    """
+    Tool: create_tasks_tool
+    Description: Tool function to create many tasks at once, in a single transaction. Prefer it over repeated create_task_tool calls whenever a prompt asks for more than one task.
+    Args:
+        tasks (list): one object per task with keys title (str, required), description (str) and status_id (TODO | INPROGRESS | DONE, default TODO)
+    Return:
+        Returns one line per task with its new ID or the reason it failed.
+    """
+    if not tasks:
+        return "Error: provide at least one task."
+    results = TaskTools().create_tasks(tasks)
+    labels = [f"item {index + 1}" for index in range(len(tasks))]
+    return format_batch_results("Created", labels, results)
+
+@tool
+def update_tasks_tool(updates: List[Dict[str, Any]]) -> str:
+    """
+    Tool: update_tasks_tool
+    Description: Tool function to update many tasks at once, in a single transaction. Prefer it over repeated update_task_tool calls whenever a prompt changes more than one task. Tasks named by title are looked up together, so find_task_tool is not needed first.
+    Args:
+        updates (list): one object per task with task_id (int) or current_title (str) to identify it, plus any of title (str), description (str) and status (TODO | INPROGRESS | DONE)
+    Return:
+        Returns one line per task with the result.
+    """
+    if not updates:
+        return "Error: provide at least one update."
+    results = TaskTools().update_tasks(updates)
+    labels = [f"task {update.get('task_id') or repr(update.get('current_title'))}" if isinstance(update, dict)
+              else f"item {index + 1}" for index, update in enumerate(updates)]
+    return format_batch_results("Updated", labels, results)
+
+@tool
+def delete_tasks_tool(task_ids: List[int] = None, titles: List[str] = None) -> str:
+    """
+    Tool: delete_tasks_tool
+    Description: Tool function to delete many tasks at once, in a single statement. Prefer it over repeated delete_task_tool calls whenever a prompt removes more than one task. Tasks named by title are looked up together, so find_task_tool is not needed first.
+    Args:
+        task_ids (list): ids of the tasks to delete
+        titles (list): titles of the tasks to delete
+    Return:
+        Returns one line per task with the result.
+    """
+    task_ids = task_ids or []
+    titles = titles or []
+    if not task_ids and not titles:
+        return "Error: provide task_ids and/or titles of the tasks to delete."
+    results = TaskTools().delete_tasks(task_ids, titles)
+    labels = [f"task {task_id}" for task_id in task_ids] + [f"task '{title}'" for title in titles]
+    return format_batch_results("Deleted", labels, results)
@@ -0,0 +1,170 @@
+"""
+Cache of prompt reviewer verdicts, keyed by the normalized prompt.
+
+Users repeat the same short commands ("show my tasks", "mark X done"), and
+each one used to cost a reviewer round trip to the model. Prompts are
+normalized (case, whitespace, trailing punctuation and, optionally, a quoted
+task title or a task id replaced by a slot) so that these repeats share a
+verdict. Slots are off by default and never cover most of a prompt.
+Both SAFE verdicts and rejections are cached, with a TTL and an LRU bound.
+Review errors are never cached. The whole cache is flushed when the reviewer
+system prompt file changes, because its verdicts may no longer hold.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s.!?]+$')
+# A quoted title right after a word that names or targets a task. A straight
+# apostrophe only counts as a quote at word boundaries, so "don't" is left alone.
+_SLOT_CONTEXT = r'(?:task|called|named|titled|title|rename|to|as|delete|remove|complete|finish|mark|update|create|add)'
+_QUOTED_TITLE = re.compile(
+    r'\b(' + _SLOT_CONTEXT + r')\s+'
+    r'(?:"[^"\n]{1,80}"|“[^”\n]{1,80}”|‘[^’\n]{1,80}’|(?<!\w)\'[^\'\n]{1,80}\'(?!\w))',
+    re.IGNORECASE
+)
+# A task id: "task 4", "id 4", "#4"
+_TASK_NUMBER = re.compile(r'\b(task|id)\s+#?\d+\b|#\d+\b', re.IGNORECASE)
+# Slots may replace at most this share of the prompt, or prompts lose what makes them different
+MAX_SLOT_SHARE = 0.5
+
+def _slot(text: str) -> str:
+    slotted = 0
+
+    def title(match):
+        nonlocal slotted
+        slotted += len(match.group(0)) - len(match.group(1))
+        return f'{match.group(1)} <text>'
+
+    def number(match):
+        nonlocal slotted
+        slotted += len(match.group(0)) - len(match.group(1) or '')
+        return f'{match.group(1)} <n>' if match.group(1) else '#<n>'
+
+    result = _TASK_NUMBER.sub(number, _QUOTED_TITLE.sub(title, text))
+    if slotted > len(text) * MAX_SLOT_SHARE:
+        return text
+    return result
+
+def normalize_prompt(prompt: str, slots: bool = False) -> str:
+    """Canonical form of a prompt; prompts with the same form share a verdict"""
+    text = str(prompt).strip()
+    if slots:
+        # A task title or id after a task verb doesn't change whether a command is about tasks
+        text = _slot(text)
+    text = _WHITESPACE.sub(' ', text).casefold()
+    return _TRAILING_PUNCTUATION.sub('', text)
+
+class VerdictCache:
+    def __init__(self, prompt_path: str, max_entries: int = 1024, ttl: float = 3600.0,
+                 slots: bool = False, check_interval: float = 1.0):
+        self.prompt_path = prompt_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.slots = slots
+        self.check_interval = check_interval
+
+        self._entries = OrderedDict()   # normalized prompt -> (expires_at, is_relevant, message)
+        self._lock = threading.Lock()
+        self._prompt_version = self._read_prompt_version()
+        self._checked_at = time.monotonic()
+
+        # Monitoring counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.flushes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _read_prompt_version(self):
+        try:
+            stat = os.stat(self.prompt_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def prompt_version(self):
+        """
+        Current version of the reviewer prompt file. Checked at most every
+        `check_interval` seconds; a change flushes the cache.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return self._prompt_version
+            self._checked_at = now
+            version = self._read_prompt_version()
+            if version != self._prompt_version:
+                self._prompt_version = version
+                self._entries.clear()
+                self.flushes += 1
+            return self._prompt_version
+
+    def get(self, prompt: str) -> Optional[Tuple[bool, Optional[str]]]:
+        """Cached (is_relevant, message) for the prompt, or None on a miss"""
+        if not self.enabled:
+            return None
+        self.prompt_version()
+        key = normalize_prompt(prompt, self.slots)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, is_relevant, message = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return is_relevant, message
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, prompt: str, is_relevant: bool, message: Optional[str] = None):
+        if not self.enabled:
+            return
+        key = normalize_prompt(prompt, self.slots)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, is_relevant, message)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def flush(self):
+        with self._lock:
+            self._entries.clear()
+            self.flushes += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'flushes': self.flushes
+            }
+
+REVIEWER_PROMPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "system_prompts", "ai-agent-reviewer.txt")
+
+# Global verdict cache shared by every pooled reviewer
+verdict_cache = VerdictCache(
+    REVIEWER_PROMPT_PATH,
+    max_entries=int(os.getenv('AGENT_VERDICT_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('AGENT_VERDICT_CACHE_TTL', '3600')),
+    slots=os.getenv('AGENT_VERDICT_CACHE_SLOTS', 'false').lower() in ('1', 'true', 'yes')
+)
@@ -0,0 +1,66 @@
+"""
+Benchmark: per-request agent setup cost, fresh AgentGateway vs the warm pool.
+
+"before" builds and closes an AgentGateway per request, as the agent route
+used to; "after" borrows a warm gateway from AgentGatewayPool and resets its
+conversation. No prompts are sent, so no model quota is used. Run from the
+backend directory:
+
+    python -m benchmarks.bench_agent_setup --requests 20
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Clients are only constructed, never called, so any key will do
+os.environ.setdefault('GEMINI_API_KEY', 'benchmark-placeholder-key')
+
+from rich.console import Console
+from rich.table import Table
+from agents.gateway import AgentGateway
+from agents.gateway_pool import AgentGatewayPool
+
+console = Console()
+
+def run_fresh(requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        gateway = AgentGateway()
+        gateway.reset()
+        gateway.close()
+    return time.perf_counter() - start
+
+def run_pooled(pool, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        with pool.gateway() as gateway:
+            gateway.reset()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=20)
+    args = parser.parse_args()
+
+    pool = AgentGatewayPool(max_size=1)
+    pool.warm(1)
+
+    fresh = run_fresh(args.requests)
+    pooled = run_pooled(pool, args.requests)
+
+    table = Table(title=f"Agent setup for {args.requests} sequential requests")
+    table.add_column("Path")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("ms / request", justify="right")
+    table.add_row("before: AgentGateway() per request", f"{fresh:.3f}", f"{fresh / args.requests * 1000:.2f}")
+    table.add_row("after: warm AgentGatewayPool", f"{pooled:.3f}", f"{pooled / args.requests * 1000:.2f}")
+    console.print(table)
+    console.print(f"Saved per request: [bold green]{(fresh - pooled) / args.requests * 1000:.2f}ms[/bold green]")
+    console.print(f"Pool: {pool.stats()}")
+    pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: task list encoding time and payload size.
+
+Encodes a synthetic task list (no database needed) with Flask's default
+JSON provider ("before") and with FastJSONProvider ("after"), in row and
+columnar form, and reports the compressed sizes. Run from the backend directory:
+
+    python -m benchmarks.bench_json --tasks 5000 --repeat 20
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from rich.console import Console
+from rich.table import Table
+from utils.json_provider import FastJSONProvider, orjson
+from utils.compression import brotli
+
+console = Console()
+
+STATUSES = [('TODO', 'To Do'), ('INPROGRESS', 'In Progress'), ('DONE', 'Done')]
+
+def make_tasks(count):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    tasks = []
+    for i in range(count):
+        status_id, status = STATUSES[i % len(STATUSES)]
+        tasks.append({
+            'task_id': i + 1,
+            'created_at': start + timedelta(minutes=i, microseconds=i),
+            'title': f'Task number {i + 1}',
+            'description': f'Description of task {i + 1}, long enough to look like a real one.',
+            'status_id': status_id,
+            'status': status
+        })
+    return tasks
+
+def to_columnar(tasks):
+    columns = list(tasks[0].keys())
+    return {'columns': columns, 'rows': [[task[column] for column in columns] for task in tasks]}
+
+def time_encode(provider, payload, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = provider.dumps(payload).encode()
+    return (time.perf_counter() - start) / repeat, body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    tasks = make_tasks(args.tasks)
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    table = Table(title=f"{args.tasks} tasks, mean of {args.repeat} encodes (orjson {'on' if orjson else 'off'})")
+    table.add_column("Encoding")
+    table.add_column("Encode (ms)", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("gzip", justify="right")
+    table.add_column("br", justify="right")
+
+    cases = [
+        ("before: default, rows", default, tasks),
+        ("after: fast, rows", fast, tasks),
+        ("after: fast, columnar", fast, to_columnar(tasks)),
+    ]
+    for name, provider, payload in cases:
+        seconds, body = time_encode(provider, payload, args.repeat)
+        table.add_row(
+            name,
+            f"{seconds * 1000:.2f}",
+            f"{len(body):,}",
+            f"{len(gzip.compress(body, compresslevel=6)):,}",
+            f"{len(brotli.compress(body, quality=4)):,}" if brotli else "-"
+        )
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: per-request overhead of the jwt_required decorator.
+
+Calls a trivial view wrapped in `jwt_required` inside a Flask request
+context with the same bearer token, as the agent's tool calls do, with the
+verified-token cache disabled ("before") and enabled ("after"). No database
+or server needed; run from the backend directory:
+
+    python -m benchmarks.bench_jwt --calls 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Defaults so the benchmark runs without a configured .env
+os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-with-enough-bytes-for-hs256')
+os.environ.setdefault('JWT_ALGORITHM', 'HS256')
+os.environ.setdefault('JWT_EXPIRATION_HOURS', '1')
+
+from flask import Flask
+from rich.console import Console
+from rich.table import Table
+from utils.jwt_utils import generate_jwt_token, jwt_required, token_cache
+
+console = Console()
+
+@jwt_required
+def view():
+    return 'ok'
+
+def run(app, token, calls):
+    with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+        start = time.perf_counter()
+        for _ in range(calls):
+            view()
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    token = generate_jwt_token({'id': 1, 'username': 'admin', 'role': 'admin'})
+    cache_size = token_cache.max_size
+
+    token_cache.max_size = 0
+    uncached = run(app, token, args.calls)
+    token_cache.max_size = cache_size or 1024
+    cached = run(app, token, args.calls)
+
+    table = Table(title=f"jwt_required, {args.calls} calls with one token")
+    table.add_column("Path")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("µs / call", justify="right")
+    table.add_row("before: verify every call", f"{uncached:.3f}", f"{uncached / args.calls * 1e6:.1f}")
+    table.add_row("after: verified-token cache", f"{cached:.3f}", f"{cached / args.calls * 1e6:.1f}")
+    console.print(table)
+    console.print(f"Speed-up: [bold green]{uncached / cached:.2f}x[/bold green]")
+    console.print(f"Cache: {token_cache.stats()}")
+
+if __name__ == "__main__":
+    main()
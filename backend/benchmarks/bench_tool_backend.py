@@ -0,0 +1,87 @@
+"""
+Benchmark: per-call latency of the agent task tools, HTTP loopback vs in-process.
+
+"before" is the HTTP backend as it used to be: a new connection per call
+(`requests.get` without a Session), a JWT check and a database query inside
+the API. "after: http" is the same backend with its keep-alive session, and
+"after: local" calls the task repository directly. Needs a configured .env,
+and the API running at BASE_URL plus a JWT (--token, from /api/users/login)
+for the HTTP rows. Run from the backend directory:
+
+    python -m benchmarks.bench_tool_backend --calls 200 --title "Write report" --token <jwt>
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from rich.console import Console
+from rich.table import Table
+from agents.tools import task_tools
+from agents.tools.task_tools import HttpTaskTools, LocalTaskTools
+from utils.context import request_token
+
+console = Console()
+
+class UnpooledHttpTaskTools(HttpTaskTools):
+    """HTTP backend without keep-alive: module-level requests calls open a connection each time"""
+    def __init__(self):
+        super().__init__()
+        self.session = requests
+
+def time_calls(call, calls):
+    """Per-call latencies in milliseconds, after one warm-up call"""
+    call()
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--title', required=True, help='Title of an existing task to look up')
+    parser.add_argument('--skip-http', action='store_true', help='Only measure the local backend')
+    parser.add_argument('--token', help='JWT the HTTP backend sends as the caller')
+    args = parser.parse_args()
+    if not args.skip_http and not args.token:
+        parser.error('--token is required unless --skip-http is given')
+    if args.token:
+        request_token.set(args.token)
+
+    # Tool methods print every call; keep the output to the result table
+    task_tools.console.quiet = True
+    backends = [("after: local", LocalTaskTools())]
+    if not args.skip_http:
+        backends = [("before: http, no keep-alive", UnpooledHttpTaskTools()),
+                    ("after: http, keep-alive", HttpTaskTools())] + backends
+
+    task = backends[-1][1].find_task_by_title(args.title)
+    if not task:
+        console.print(f"[red]No task titled '{args.title}'[/red]")
+        return
+
+    table = Table(title=f"{args.calls} calls per tool")
+    table.add_column("Backend")
+    table.add_column("Tool call")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    for name, tools in backends:
+        cases = [
+            ("find_task_by_title", lambda: tools.find_task_by_title(args.title)),
+            ("get_task_by_id", lambda: tools.get_task_by_id(task['task_id']))
+        ]
+        for case, call in cases:
+            samples = time_calls(call, args.calls)
+            p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+            table.add_row(name, case, f"{statistics.median(samples):.2f}", f"{p95:.2f}")
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
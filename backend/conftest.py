@@ -0,0 +1,7 @@
+import os
+
+# test_endpoints.py is a script run against a live server (python test_endpoints.py), not a pytest module
+collect_ignore = ["test_endpoints.py"]
+
+# utils.db_connection reads its settings at import; the unit tests never open a connection
+os.environ.setdefault('DB_PORT', '5432')
@@ -1,6 +1,17 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from utils.db_connection import db
+from utils.status_cache import status_cache
+from utils.task_cache import task_cache
+from utils.task_events import task_events
+from utils.json_provider import FastJSONProvider
+from utils.compression import init_compression
+from utils.jwt_utils import token_cache
+from utils import thread_budget
+from agents.agent_executor import agent_executor
+from agents.agent_jobs import agent_jobs
+from agents.gateway_pool import agent_pool
+from agents.verdict_cache import verdict_cache
 import os
 import logging
 from rich.logging import RichHandler
@@ -17,18 +28,44 @@ logging.basicConfig(
 
 def create_app():
     app = Flask(__name__)
+    # orjson-backed (when installed) JSON encoding, and Accept-Encoding negotiated compression
+    app.json = FastJSONProvider(app)
+    init_compression(app)
     
-    # Enable CORS
-    CORS(app)
+    # Enable CORS; expose the validators so the frontend can send them back
+    CORS(app, expose_headers=['ETag', 'Last-Modified'])
     
     # Register blueprints
     from routes.tasks import tasks_bp
     from routes.users import users_bp
     from routes.agent import agent_bp
+    from routes.statuses import statuses_bp
     
     app.register_blueprint(tasks_bp)
     app.register_blueprint(users_bp)
     app.register_blueprint(agent_bp)
+    app.register_blueprint(statuses_bp)
+
+    # Build agent gateways now so the first prompts don't pay for model and agent setup
+    try:
+        agent_pool.warm(int(os.getenv('AGENT_POOL_WARM', '1')))
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not warm agent pool: {e}")
+
+    # Background agent jobs; every process claims from the same agent_jobs table
+    agent_jobs.start()
+
+    # Warm the status lookup cache; task reads retry the load if the database is not up yet
+    try:
+        status_cache.refresh()
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not preload status cache: {e}")
+
+    @app.before_request
+    def route_database_reads():
+        # Reads go to replicas unless this request has written, or the client
+        # needs to read its own earlier writes (X-Read-Your-Writes header)
+        db.reset_routing(pinned=bool(request.headers.get('X-Read-Your-Writes')))
     
     @app.route('/health')
     async def health_check():
@@ -57,7 +94,16 @@ def create_app():
         return jsonify({
             'status': 'healthy',
             'api_version': '1.0.0',
-            'database': db_status
+            'database': db_status,
+            'pool': db.pool_stats(),
+            'task_cache': task_cache.stats(),
+            'task_events': task_events.stats(),
+            'jwt_cache': token_cache.stats(),
+            'thread_budget': thread_budget.stats(),
+            'agent_executor': agent_executor.stats(),
+            'agent_pool': agent_pool.stats(),
+            'verdict_cache': verdict_cache.stats(),
+            'agent_jobs': agent_jobs.stats()
         })
     
     return app
@@ -0,0 +1,248 @@
+"""
+Task data access shared by the task routes and the agent tools.
+
+Owns the task SQL (prepared statements and bulk statements) and keeps the
+in-process task cache consistent with every write. Callers validate their
+input first (`validate_new_task`, `validate_task_update`) and attach status
+labels to the rows they return.
+"""
+from typing import Dict, Iterable, List, Optional
+from utils.db_connection import db
+from utils.status_cache import status_cache
+from utils.task_cache import task_cache, task_key, list_key
+
+SEARCH_MODES = ('exact', 'prefix', 'fuzzy')
+UPDATABLE_FIELDS = ('title', 'description', 'status_id')
+
+# Status labels come from the in-process status cache instead of a join
+TASKS_LIST_QUERY = """
+SELECT t.*
+FROM tasks t
+ORDER BY t.task_id
+"""
+
+# Hot queries, prepared once per pooled connection and executed by name
+db.prepare_statement('tasks_list', TASKS_LIST_QUERY)
+db.prepare_statement('tasks_get', "SELECT t.* FROM tasks t WHERE t.task_id = %s")
+# Bumped by a statement-level trigger on every write to tasks (see the schema in the README)
+db.prepare_statement('tasks_version', "SELECT version, updated_at FROM table_versions WHERE table_name = 'tasks'")
+db.prepare_statement('tasks_insert', """
+INSERT INTO tasks (title, description, status_id)
+VALUES (%s, %s, %s)
+RETURNING *
+""")
+db.prepare_statement('tasks_delete', "DELETE FROM tasks WHERE task_id = %s RETURNING *")
+# Title search, each served by an index: lower(title) text_pattern_ops for
+# exact and prefix, the pg_trgm GIN index for fuzzy (see the schema in the README)
+db.prepare_statement('tasks_search_exact', """
+SELECT t.*, 1.0::real AS score
+FROM tasks t
+WHERE lower(t.title) = lower(%s)
+ORDER BY t.task_id
+LIMIT %s
+""")
+# Not prepared: a generic plan cannot turn LIKE with a parameter into an index
+# range, while psycopg2 sends the pattern inline
+TASKS_SEARCH_QUERIES = {
+    'prefix': """
+    SELECT t.*, similarity(t.title, %s) AS score
+    FROM tasks t
+    WHERE lower(t.title) LIKE %s
+    ORDER BY score DESC, length(t.title), t.task_id
+    LIMIT %s
+    """,
+    'fuzzy': """
+    SELECT t.*, similarity(t.title, %s) AS score
+    FROM tasks t
+    WHERE t.title %% %s OR t.title ILIKE %s
+    ORDER BY score DESC, t.task_id
+    LIMIT %s
+    """
+}
+
+CREATE_MANY_QUERY = """
+INSERT INTO tasks (title, description, status_id)
+SELECT v.title, v.description, v.status_id
+FROM (VALUES %s) AS v(ord, title, description, status_id)
+ORDER BY v.ord
+RETURNING *
+"""
+
+UPDATE_MANY_QUERY = """
+UPDATE tasks AS t SET
+    title = CASE WHEN v.set_title THEN v.title ELSE t.title END,
+    description = CASE WHEN v.set_description THEN v.description ELSE t.description END,
+    status_id = CASE WHEN v.set_status THEN v.status_id ELSE t.status_id END
+FROM (VALUES %s) AS v(task_id, set_title, title, set_description, description, set_status, status_id)
+WHERE t.task_id = v.task_id
+RETURNING t.*
+"""
+UPDATE_MANY_TEMPLATE = '(%s::bigint, %s::boolean, %s::text, %s::boolean, %s::text, %s::boolean, %s::text)'
+
+DELETE_MANY_QUERY = "DELETE FROM tasks WHERE task_id = ANY(%s::bigint[]) RETURNING *"
+
+# One lookup for many titles, served by the lower(title) index; the oldest task wins a duplicate title
+FIND_BY_TITLES_QUERY = """
+SELECT DISTINCT ON (lower(t.title)) t.*
+FROM tasks t
+WHERE lower(t.title) = ANY(%s::text[])
+ORDER BY lower(t.title), t.task_id
+"""
+
+def like_escape(text):
+    """Escape LIKE wildcards so user input only matches literally"""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def validate_new_task(item):
+    """Return an error message for an invalid task payload, or None if it can be inserted"""
+    if not isinstance(item, dict):
+        return 'Task must be an object'
+    if not isinstance(item.get('title'), str) or not item['title'].strip():
+        return 'Title is required'
+    if not item.get('status_id'):
+        return 'Status is required'
+    if not status_cache.is_valid(item['status_id']):
+        return f"Unknown status_id '{item['status_id']}'"
+    if 'description' in item and not isinstance(item['description'], str):
+        return 'Description must be a string'
+    return None
+
+def validate_task_update(item, seen_ids):
+    """Return an error message for an invalid batch update item, or None"""
+    if not isinstance(item, dict):
+        return 'Task must be an object'
+    task_id = item.get('task_id')
+    if not isinstance(task_id, int) or isinstance(task_id, bool):
+        return 'task_id must be an integer'
+    if task_id in seen_ids:
+        return f'Duplicate task_id {task_id}'
+    if not any(field in item for field in ('title', 'description', 'status_id')):
+        return 'No valid fields to update'
+    if 'title' in item and (not isinstance(item['title'], str) or not item['title'].strip()):
+        return 'Title must be a non-empty string'
+    if 'description' in item and item['description'] is not None and not isinstance(item['description'], str):
+        return 'Description must be a string'
+    if 'status_id' in item and not status_cache.is_valid(item['status_id']):
+        return f"Unknown status_id '{item['status_id']}'"
+    return None
+
+def search_params(text, mode, limit):
+    if mode == 'exact':
+        return (text, limit)
+    if mode == 'prefix':
+        return (text, like_escape(text.lower()) + '%', limit)
+    return (text, text, '%' + like_escape(text) + '%', limit)
+
+def cached_read(key, fetch):
+    """
+    Serve `key` from the task cache, running `fetch()` on a miss. Fills use
+    the normal read routing (a replica unless the request is pinned to the
+    primary); the tasks version is read first on the same server, so the
+    cache can refuse a fill from a replica behind a version it has seen.
+    """
+    def fill():
+        with db.consistent_reads():
+            version = db.execute_prepared('tasks_version', fetch_one=True)
+            return fetch(), version['version'] if version else None
+    return task_cache.get_or_fill(key, fill)
+
+class TaskRepository:
+    # Reads
+
+    def get(self, task_id: int) -> Optional[dict]:
+        """One task, through the task cache"""
+        return cached_read(task_key(task_id), lambda: db.execute_prepared('tasks_get', (task_id,), fetch_one=True))
+
+    def list_all(self) -> List[dict]:
+        return cached_read(list_key(TASKS_LIST_QUERY), lambda: db.execute_prepared('tasks_list', fetch_all=True))
+
+    def search(self, text: str, mode: str = 'fuzzy', limit: int = 10) -> List[dict]:
+        """Tasks whose title matches `text` (exact | prefix | fuzzy), best match first, each with a `score`"""
+        params = search_params(text, mode, limit)
+        if mode == 'exact':
+            return db.execute_prepared('tasks_search_exact', params, fetch_all=True)
+        return db.execute_query(TASKS_SEARCH_QUERIES[mode], params, fetch_all=True)
+
+    def find_by_titles(self, titles: Iterable[str]) -> Dict[str, dict]:
+        """Tasks for many titles in one query, keyed by lower-cased title; unknown titles are left out"""
+        wanted = sorted({title.lower() for title in titles})
+        if not wanted:
+            return {}
+        tasks = db.execute_query(FIND_BY_TITLES_QUERY, (wanted,), fetch_all=True)
+        return {task['title'].lower(): task for task in tasks}
+
+    # Writes
+
+    def create(self, title: str, description: str, status_id: str) -> dict:
+        task = db.execute_prepared('tasks_insert', (title, description, status_id), fetch_one=True)
+        task_cache.write_through([task])
+        return task
+
+    def create_many(self, rows: List[tuple]) -> List[dict]:
+        """
+        Insert (title, description, status_id) rows with one multi-row INSERT in
+        one transaction. Returns the created tasks in input order.
+        """
+        if not rows:
+            return []
+        values = [(index, title, description, status_id) for index, (title, description, status_id) in enumerate(rows)]
+        created = db.execute_values(CREATE_MANY_QUERY, values, fetch=True)
+        # Identity values follow insertion order, which follows input order
+        created.sort(key=lambda task: task['task_id'])
+        task_cache.write_through(created)
+        return created
+
+    def update(self, task_id: int, fields: dict) -> Optional[dict]:
+        """Set the given fields (any of title, description, status_id); None when the task does not exist"""
+        columns = [column for column in UPDATABLE_FIELDS if column in fields]
+        if not columns:
+            raise ValueError('No valid fields to update')
+        query = f"""
+        UPDATE tasks
+        SET {', '.join(f'{column} = %s' for column in columns)}
+        WHERE task_id = %s
+        RETURNING *
+        """
+        params = tuple(fields[column] for column in columns) + (task_id,)
+        task = db.execute_query(query, params, fetch_one=True)
+        if task:
+            task_cache.write_through([task])
+        else:
+            task_cache.evict([task_id])
+        return task
+
+    def update_many(self, items: List[dict]) -> List[dict]:
+        """
+        Apply id-keyed partial updates (dicts with task_id plus any of title,
+        description, status_id; ids must be unique) in one UPDATE statement
+        and one commit. Returns the updated tasks; unknown ids are left out.
+        """
+        if not items:
+            return []
+        rows = [(
+            item['task_id'],
+            'title' in item, item.get('title'),
+            'description' in item, item.get('description'),
+            'status_id' in item, item.get('status_id')
+        ) for item in items]
+        updated = db.execute_values(UPDATE_MANY_QUERY, rows, template=UPDATE_MANY_TEMPLATE, fetch=True)
+        task_cache.write_through(updated)
+        return updated
+
+    def delete(self, task_id: int) -> Optional[dict]:
+        """Delete a task and return it, or None when it did not exist"""
+        task = db.execute_prepared('tasks_delete', (task_id,), fetch_one=True)
+        task_cache.evict([task_id])
+        return task
+
+    def delete_many(self, task_ids: Iterable[int]) -> List[dict]:
+        """Delete many tasks by id in one statement and one commit; returns the deleted tasks"""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        deleted = db.execute_query(DELETE_MANY_QUERY, (task_ids,), fetch_all=True)
+        task_cache.evict(task_ids)
+        return deleted
+
+# Global repository instance
+task_repository = TaskRepository()
@@ -1,9 +1,25 @@
-from flask import Blueprint, request, jsonify
-from agents.gateway import AgentGateway
-from utils.jwt_utils import jwt_required
+import json
+import os
+from contextlib import ExitStack
+from flask import Blueprint, Response, request, jsonify
+from agents.agent_executor import agent_executor, AgentBusyError
+from agents.agent_jobs import agent_jobs
+from agents.gateway_pool import agent_pool, AgentPoolTimeoutError
+from agents.verdict_cache import verdict_cache
+from utils.jwt_utils import jwt_required, admin_required
 
 agent_bp = Blueprint('agent', __name__)
 
+# Review and CRUD agents start together; writes wait for the review (see agents/review_gate.py)
+SPECULATIVE_DEFAULT = os.getenv('AGENT_SPECULATIVE', 'false').lower() in ('1', 'true', 'yes')
+STREAM_HEARTBEAT = 15
+JOB_FINISHED_STATUSES = ('succeeded', 'rejected', 'failed')
+# Seconds between polls suggested to clients of GET /api/agent/jobs/<id>
+JOB_POLL_HINT = max(int(float(os.getenv('AGENT_JOBS_POLL_INTERVAL', '2'))), 1)
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
 @agent_bp.route('/api/agent/process', methods=['POST'])
 @jwt_required
 async def process_prompt():
@@ -12,14 +28,18 @@ async def process_prompt():
         return jsonify({'error': 'No prompt provided'}), 400
     
     prompt = data['prompt']
+    speculative = bool(data.get('speculative', SPECULATIVE_DEFAULT))
     
     # Get token from header
     auth_header = request.headers.get('Authorization')
     token = auth_header.split(" ")[1] if auth_header else None
     
     try:
-        gateway = AgentGateway()
-        result = await gateway.call_agents(prompt, token)
+        # Refuse straight away when the agent queue is full instead of holding a server thread
+        with agent_executor.admission():
+            # Warm gateway from the pool instead of building models and agents per request
+            with agent_pool.gateway() as gateway:
+                result = await gateway.call_agents(prompt, token, speculative=speculative)
         
         if isinstance(result, dict):
             if result.get('status') == 'rejected':
@@ -27,10 +47,152 @@ async def process_prompt():
                     'status': 'rejected',
                     'response': result['message']
                 }), 400
+            if result.get('status') == 'timeout':
+                return jsonify({
+                    'status': 'timeout',
+                    'error': result['message']
+                }), 504
         
         return jsonify({
             'status': 'success',
             'response': str(result)
         })
+    except AgentBusyError as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(e.retry_after)}
+    except AgentPoolTimeoutError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(agent_executor.retry_after())}
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@agent_bp.route('/api/agent/process/stream', methods=['POST'])
+@jwt_required
+def process_prompt_stream():
+    """
+    Same as /api/agent/process, answered as Server-Sent Events while the
+    agents run: `status` right away, `review` with the reviewer's verdict,
+    `text` deltas, `tool_start` / `tool_end` per tool call, then `done` with
+    the final response (or `error`).
+    """
+    data = request.get_json(silent=True)
+    if not data or 'prompt' not in data:
+        return jsonify({'error': 'No prompt provided'}), 400
+
+    prompt = data['prompt']
+    auth_header = request.headers.get('Authorization')
+    token = auth_header.split(" ")[1] if auth_header else None
+
+    # Admission slot and gateway are held until the response is closed and the agent run is over
+    resources = ExitStack()
+    try:
+        resources.enter_context(agent_executor.admission())
+        gateway = resources.enter_context(agent_pool.gateway())
+    except AgentBusyError as e:
+        resources.close()
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(e.retry_after)}
+    except AgentPoolTimeoutError as e:
+        resources.close()
+        return jsonify({'error': str(e)}), 503, {'Retry-After': str(agent_executor.retry_after())}
+    except Exception as e:
+        resources.close()
+        return jsonify({'error': str(e)}), 500
+
+    def generate():
+        for event in gateway.stream_agents(prompt, token, heartbeat=STREAM_HEARTBEAT):
+            if event is None:
+                # Comment line: keeps proxies from timing out and detects closed clients
+                yield ': keep-alive\n\n'
+                continue
+            yield format_event(event)
+
+    def release():
+        # A client that disconnects mid-run leaves the CRUD run going on an agent worker
+        # (gateway.pending); the slot and gateway stay taken until that run completes
+        pending = gateway.pending
+        if pending is not None and not pending.done():
+            pending.add_done_callback(lambda _: resources.close())
+        else:
+            resources.close()
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(release)
+    return response
+
+def job_view(job):
+    """Public fields of an agent_jobs row"""
+    return {
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'prompt': job['prompt'],
+        'response': job['response'],
+        'error': job['error'],
+        'attempts': job['attempts'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at']
+    }
+
+def find_own_job(job_id):
+    """The job if it exists and belongs to the current user (admins see every job), else None"""
+    job = agent_jobs.get(job_id)
+    user = request.current_user
+    if job and (job['user_id'] == user.get('user_id') or user.get('role') == 'admin'):
+        return job
+    return None
+
+@agent_bp.route('/api/agent/jobs', methods=['POST'])
+@jwt_required
+def create_agent_job():
+    """
+    Queue a prompt and answer 202 with the job id at once. A background
+    worker in any API process runs it as the submitting user; poll
+    GET /api/agent/jobs/<id> (Retry-After gives the interval) for the outcome.
+    """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('prompt'), str) or not data['prompt'].strip():
+        return jsonify({'error': 'No prompt provided'}), 400
+
+    speculative = bool(data.get('speculative', SPECULATIVE_DEFAULT))
+    try:
+        job = agent_jobs.enqueue(data['prompt'], request.current_user, speculative=speculative)
+        location = f"/api/agent/jobs/{job['job_id']}"
+        return jsonify(job_view(job)), 202, {'Location': location}
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@agent_bp.route('/api/agent/jobs/<int:job_id>', methods=['GET'])
+@jwt_required
+def get_agent_job(job_id):
+    """Status and, once finished, response or error of a queued prompt"""
+    try:
+        job = find_own_job(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        headers = {}
+        if job['status'] not in JOB_FINISHED_STATUSES:
+            # Polling hint while the job is still queued or running
+            headers['Retry-After'] = str(JOB_POLL_HINT)
+        return jsonify(job_view(job)), 200, headers
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@agent_bp.route('/api/agent/stats', methods=['GET'])
+@jwt_required
+def agent_stats():
+    """Agent executor, gateway pool and reviewer verdict cache metrics"""
+    return jsonify({
+        'agent_executor': agent_executor.stats(),
+        'agent_pool': agent_pool.stats(),
+        'verdict_cache': verdict_cache.stats(),
+        'agent_jobs': agent_jobs.stats()
+    })
+
+@agent_bp.route('/api/agent/verdict-cache', methods=['DELETE'])
+@jwt_required
+@admin_required
+def flush_verdict_cache():
+    """Drop every cached reviewer verdict (the cache also flushes itself when the reviewer prompt changes)"""
+    verdict_cache.flush()
+    return jsonify({'message': 'Verdict cache flushed'})
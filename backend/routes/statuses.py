@@ -0,0 +1,17 @@
+"""
+Status lookup routes served from the in-process status cache
+"""
+from flask import Blueprint, jsonify
+from utils.jwt_utils import jwt_required
+from utils.status_cache import status_cache
+
+statuses_bp = Blueprint('statuses', __name__, url_prefix='/api/statuses')
+
+@statuses_bp.route('', methods=['GET'])
+@jwt_required
+async def get_statuses():
+    """Get all task statuses - requires authentication"""
+    try:
+        return jsonify(status_cache.all())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
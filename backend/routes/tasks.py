@@ -1,43 +1,472 @@
 """
 Task CRUD routes using psycopg2 with JWT authentication
 """
-from flask import Blueprint, request, jsonify
+import base64
+import hashlib
+import json
+import logging
+import os
+import queue
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+from flask import Blueprint, Response, current_app, request, jsonify
 from utils.db_connection import db
 from utils.jwt_utils import jwt_required
+from utils.status_cache import status_cache
+from utils.task_cache import task_cache, list_key
+from utils.task_events import task_events
+from repositories.task_repository import (
+    task_repository, cached_read, validate_new_task, validate_task_update, TASKS_LIST_QUERY, SEARCH_MODES
+)
+
+logger = logging.getLogger(__name__)
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+MAX_STREAM_ITERSIZE = 10000
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 500
+LIST_ORDERS = ('asc', 'desc')
+LIST_FORMATS = ('json', 'columnar')
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 100
+MAX_SYNC_CHANGES = 1000
+TASK_CHANGES_RETENTION = float(os.getenv('TASK_CHANGES_RETENTION_HOURS', '168')) * 3600
+TASK_CHANGES_PRUNE_INTERVAL = 3600
+EVENTS_HEARTBEAT = 15
+EVENTS_MAX_SECONDS = float(os.getenv('TASK_EVENTS_MAX_SECONDS', '300'))
+# Suggested wait before a refused client tries for a stream slot again
+EVENTS_RETRY_AFTER = 30
+
+def encode_cursor(task, order):
+    """Opaque keyset cursor pointing just after `task` in the given order"""
+    payload = {'o': order, 'i': task['task_id']}
+    if order in LIST_ORDERS:
+        created_at = task['created_at']
+        payload['c'] = created_at.isoformat() if isinstance(created_at, datetime) else str(created_at)
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        order = payload['o']
+        task_id = int(payload['i'])
+        created_at = payload.get('c')
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError('Invalid cursor') from e
+    if order in LIST_ORDERS and not created_at:
+        raise ValueError('Invalid cursor')
+    return order, task_id, created_at
+
+def build_list_query(args, lookahead=True):
+    """
+    Translate GET /api/tasks query parameters into SQL.
+    Filtering, ordering and keyset pagination (`after`) all run in the
+    database, so no page ever needs an OFFSET scan.
+    With `lookahead`, one row more than `limit` is fetched to detect a next page.
+    Returns (query, params, limit, order) and raises ValueError on bad input.
+    """
+    conditions = []
+    params = []
+
+    status = args.get('status')
+    if status:
+        conditions.append('t.status_id = %s')
+        params.append(status)
+
+    order = args.get('order')
+    if order is not None and order not in LIST_ORDERS:
+        raise ValueError("order must be 'asc' or 'desc'")
+
+    limit = None
+    if args.get('limit') is not None:
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    after = args.get('after')
+    if after:
+        cursor_order, task_id, created_at = decode_cursor(after)
+        if order is None and cursor_order in LIST_ORDERS:
+            order = cursor_order
+        if cursor_order != (order or 'id'):
+            raise ValueError('Cursor does not match the requested order')
+        if order is None:
+            conditions.append('t.task_id > %s')
+            params.append(task_id)
+        else:
+            operator = '<' if order == 'desc' else '>'
+            conditions.append(f'(t.created_at, t.task_id) {operator} (%s::timestamptz, %s)')
+            params.extend([created_at, task_id])
+
+    if order is None:
+        order_by = 't.task_id'
+    else:
+        direction = order.upper()
+        order_by = f't.created_at {direction}, t.task_id {direction}'
+
+    query = """
+    SELECT t.*
+    FROM tasks t
+    """
+    if conditions:
+        query += 'WHERE ' + ' AND '.join(conditions) + '\n'
+    query += f'ORDER BY {order_by}\n'
+    if limit is not None:
+        query += 'LIMIT %s\n'
+        params.append(limit + 1 if lookahead else limit)
+
+    return query, tuple(params), limit, order
+
+def tasks_version():
+    """
+    Current {version, updated_at} of the tasks table, or None if its row is missing.
+    Read before any task data, so the data served is never older than the
+    validators sent with it.
+    """
+    version = db.execute_prepared('tasks_version', fetch_one=True)
+    if version:
+        task_cache.observe_version(version['version'])
+    return version
+
+def list_etag(version):
+    """ETag for a task list: the table version plus the query parameters that shape the response"""
+    args = urlencode(sorted(request.args.items(multi=True)))
+    return f"tasks-{version['version']}-{hashlib.sha1(args.encode()).hexdigest()[:12]}"
+
+def not_modified(etag, last_modified):
+    """True when the client's If-None-Match (or, failing that, If-Modified-Since) still matches"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def with_validators(response, etag, last_modified):
+    """Attach ETag / Last-Modified and make clients revalidate before reusing the response"""
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def conditional(etag_for, build):
+    """
+    Answer with 304 when the client's validators match the current tasks
+    table version and status labels, without running `build()`; otherwise
+    return `build()`'s response with the validators attached.
+    """
+    version = tasks_version()
+    if not version:
+        return build()
+    # Responses carry status labels, so a renamed label must change the validators too
+    etag = f"{etag_for(version)}-{status_cache.version}"
+    last_modified = max(filter(None, (version['updated_at'], status_cache.changed_at)), default=None)
+    if not_modified(etag, last_modified):
+        return with_validators(Response(status=304), etag, last_modified)
+    response = current_app.make_response(build())
+    if response.status_code == 200:
+        with_validators(response, etag, last_modified)
+    return response
+
+def list_body(tasks, paged=False, next_cursor=None):
+    """
+    Response body for a task list. With ?format=columnar the keys are sent
+    once as `columns` and every task as a `rows` array in that order.
+    """
+    if request.args.get('format') == 'columnar':
+        columns = list(tasks[0].keys()) if tasks else []
+        body = {'columns': columns, 'rows': [[task.get(column) for column in columns] for task in tasks]}
+    elif paged:
+        body = {'tasks': tasks}
+    else:
+        return tasks
+    if paged:
+        body['next_cursor'] = next_cursor
+    return body
+
+def wants_stream():
+    """True when the client asked for NDJSON streaming via ?stream=1 or the Accept header"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def stream_tasks(query, params=None):
+    """
+    Stream rows as newline-delimited JSON from a server-side cursor.
+    The first row is fetched before the response starts so connection and
+    query errors still surface as a normal 500. The cursor (and its pooled
+    connection) is closed when the response is, even if the body is never
+    iterated.
+    """
+    itersize = request.args.get('itersize', type=int) or db.stream_itersize
+    itersize = max(1, min(itersize, MAX_STREAM_ITERSIZE))
+    dumps = current_app.json.dumps
+
+    rows = db.stream_query(query, params, itersize=itersize)
+    first = next(rows, None)
+
+    def generate():
+        try:
+            if first is not None:
+                yield dumps(status_cache.attach(first)) + '\n'
+            for row in rows:
+                yield dumps(status_cache.attach(row)) + '\n'
+        finally:
+            rows.close()
+
+    response = Response(generate(), mimetype=NDJSON_MIMETYPE)
+    response.call_on_close(rows.close)
+    return response
+
 @tasks_bp.route('', methods=['GET'])
 @jwt_required
 async def get_tasks():
-    """Get all tasks - requires authentication"""
+    """
+    Get all tasks - requires authentication.
+    Optional query parameters: status, order (asc|desc by created time),
+    limit and after (cursor from a previous page's next_cursor). When limit
+    or after is given the response is {"tasks": [...], "next_cursor": ...}.
+    Streams NDJSON with ?stream=1 or Accept: application/x-ndjson.
+    JSON responses carry ETag / Last-Modified; a matching If-None-Match or
+    If-Modified-Since gets 304 without running the list query.
+    ?format=columnar returns {"columns": [...], "rows": [[...], ...]} instead
+    of repeating every key per task.
+    """
     try:
-        query = """
-        SELECT t.*, s.status 
-        FROM tasks t 
-        LEFT JOIN status s ON t.status_id = s.status_id
-        ORDER BY t.task_id
-        """
-        tasks = db.execute_query(query, fetch_all=True)
-        return jsonify(tasks)
+        if request.args.get('format', 'json') not in LIST_FORMATS:
+            return jsonify({'error': "format must be 'json' or 'columnar'"}), 400
+
+        filtered = any(request.args.get(key) for key in ('status', 'order', 'limit', 'after'))
+        if not filtered:
+            if wants_stream():
+                return stream_tasks(TASKS_LIST_QUERY)
+
+            def build_all():
+                tasks = task_repository.list_all()
+                return jsonify(list_body(status_cache.attach(tasks)))
+            return conditional(list_etag, build_all)
+
+        streaming = wants_stream()
+        try:
+            query, params, limit, order = build_list_query(request.args, lookahead=not streaming)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if streaming:
+            return stream_tasks(query, params)
+
+        def build_page():
+            tasks = cached_read(list_key(query, params), lambda: db.execute_query(query, params, fetch_all=True))
+            tasks = status_cache.attach(tasks)
+            if limit is None and not request.args.get('after'):
+                return jsonify(list_body(tasks))
+
+            next_cursor = None
+            if limit is not None and len(tasks) > limit:
+                tasks = tasks[:limit]
+                next_cursor = encode_cursor(tasks[-1], order or 'id')
+            return jsonify(list_body(tasks, paged=True, next_cursor=next_cursor))
+        return conditional(list_etag, build_page)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @tasks_bp.route('/<int:task_id>', methods=['GET'])
 @jwt_required
 async def get_task(task_id):
-    """Get a specific task - requires authentication"""
+    """Get a specific task - requires authentication. Supports ETag / Last-Modified like the list"""
     try:
-        query = """
-        SELECT t.*, s.status 
-        FROM tasks t 
-        LEFT JOIN status s ON t.status_id = s.status_id
-        WHERE t.task_id = %s
-        """
-        task = db.execute_query(query, (task_id,), fetch_one=True)
-        if not task:
-            return jsonify({'error': 'Task not found'}), 404
-        return jsonify(task)
+        def build_task():
+            task = task_repository.get(task_id)
+            if not task:
+                return jsonify({'error': 'Task not found'}), 404
+            return jsonify(status_cache.attach(task))
+        return conditional(lambda version: f"task-{task_id}-{version['version']}", build_task)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tasks_bp.route('/search', methods=['GET'])
+@jwt_required
+async def search_tasks():
+    """
+    Search tasks by title - requires authentication.
+    `title=...` is a case-insensitive exact match; `q=...` searches with
+    mode=exact|prefix|fuzzy (default fuzzy: trigram similarity or substring).
+    Returns at most `limit` tasks (default 10), best match first, each with a
+    `score` between 0 and 1.
+    """
+    try:
+        title = request.args.get('title')
+        text = title if title is not None else request.args.get('q')
+        if not text or not text.strip():
+            return jsonify({'error': 'title or q is required'}), 400
+
+        mode = request.args.get('mode', 'exact' if title is not None else 'fuzzy')
+        if mode not in SEARCH_MODES:
+            return jsonify({'error': "mode must be 'exact', 'prefix' or 'fuzzy'"}), 400
+
+        limit = request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int)
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            return jsonify({'error': f'limit must be between 1 and {MAX_SEARCH_LIMIT}'}), 400
+
+        tasks = task_repository.search(text, mode, limit)
+        return jsonify(status_cache.attach(tasks))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# A sync token is the xmin of the snapshot that produced it: every transaction
+# below it had finished, so changes with tx >= xmin cover everything the client
+# has not seen yet (already-seen ones may repeat, which is harmless).
+SYNC_XMIN_QUERY = "SELECT txid_snapshot_xmin(txid_current_snapshot()) AS sync_xmin"
+
+# One statement, so the changes and the next token come from the same snapshot
+TASK_CHANGES_QUERY = """
+WITH snap AS (
+    SELECT txid_snapshot_xmin(txid_current_snapshot()) AS sync_xmin
+), changed AS (
+    SELECT task_id AS changed_task_id, max(change_id) AS change_id
+    FROM task_changes
+    WHERE tx >= %s
+    GROUP BY task_id
+)
+SELECT snap.sync_xmin, c.changed_task_id, t.*
+FROM snap
+LEFT JOIN changed c ON true
+LEFT JOIN tasks t ON t.task_id = c.changed_task_id
+ORDER BY c.change_id
+LIMIT %s
+"""
+
+_last_changes_prune = 0.0
+
+def encode_sync_token(xmin):
+    raw = json.dumps({'x': xmin, 't': int(time.time())}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_sync_token(token):
+    """Return (xmin, issued_at) from a token made by encode_sync_token; raises ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        return int(payload['x']), int(payload['t'])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError('Invalid sync token') from e
+
+def prune_task_changes():
+    """Drop change log rows older than the retention window, at most once per prune interval"""
+    global _last_changes_prune
+    now = time.monotonic()
+    if now - _last_changes_prune < TASK_CHANGES_PRUNE_INTERVAL:
+        return
+    _last_changes_prune = now
+    db.execute_update(
+        "DELETE FROM task_changes WHERE changed_at < now() - %s * interval '1 second'",
+        (TASK_CHANGES_RETENTION,)
+    )
+
+@tasks_bp.route('/changes', methods=['GET'])
+@jwt_required
+async def get_task_changes():
+    """
+    Delta sync - requires authentication.
+    Without `since`, returns just a token for the current state. With
+    `since=<token>`, returns the current row of every task created or updated
+    since then, the ids of deleted tasks, and the next token. When the token
+    is older than the change log retention, or too much changed, the
+    response has "reset": true and the client should reload the full list.
+    """
+    try:
+        since = request.args.get('since')
+        if not since:
+            row = db.execute_query(SYNC_XMIN_QUERY, fetch_one=True)
+            return jsonify({'tasks': [], 'deleted': [], 'next_token': encode_sync_token(row['sync_xmin']), 'reset': False})
+
+        try:
+            since_xmin, issued_at = decode_sync_token(since)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        try:
+            prune_task_changes()
+        except Exception as e:
+            logger.warning(f"Could not prune task_changes: {e}")
+
+        if time.time() - issued_at > TASK_CHANGES_RETENTION:
+            row = db.execute_query(SYNC_XMIN_QUERY, fetch_one=True)
+            return jsonify({'tasks': [], 'deleted': [], 'next_token': encode_sync_token(row['sync_xmin']), 'reset': True})
+
+        rows = db.execute_query(TASK_CHANGES_QUERY, (since_xmin, MAX_SYNC_CHANGES + 1), fetch_all=True)
+        next_token = encode_sync_token(rows[0]['sync_xmin'])
+        if len(rows) > MAX_SYNC_CHANGES:
+            return jsonify({'tasks': [], 'deleted': [], 'next_token': next_token, 'reset': True})
+
+        tasks = []
+        deleted = []
+        for row in rows:
+            changed_task_id = row.pop('changed_task_id')
+            row.pop('sync_xmin')
+            if changed_task_id is None:
+                continue
+            if row['task_id'] is None:
+                deleted.append(changed_task_id)
+            else:
+                tasks.append(row)
+
+        return jsonify({
+            'tasks': status_cache.attach(tasks),
+            'deleted': deleted,
+            'next_token': next_token,
+            'reset': False
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@tasks_bp.route('/events', methods=['GET'])
+@jwt_required
+def stream_task_events():
+    """
+    Server-Sent Events feed of task changes - requires authentication.
+    Emits `task` events ({"op": "INSERT"|"UPDATE"|"DELETE", "task_id": ...})
+    for writes from any process, and `reset` when events may have been
+    missed. Clients pull the rows through /api/tasks/changes. Each stream is
+    closed after TASK_EVENTS_MAX_SECONDS so the client reconnects and resyncs.
+    """
+    try:
+        subscription = task_events.subscribe()
+        if subscription is None:
+            retry_after = int(min(EVENTS_RETRY_AFTER, EVENTS_MAX_SECONDS))
+            return jsonify({'error': 'Too many event subscribers, try again later'}), 503, {'Retry-After': str(retry_after)}
+
+        def generate():
+            try:
+                yield "retry: 3000\n\n"
+                deadline = time.monotonic() + EVENTS_MAX_SECONDS
+                while time.monotonic() < deadline:
+                    try:
+                        event = subscription.get(timeout=EVENTS_HEARTBEAT)
+                    except queue.Empty:
+                        # Comment line: keeps proxies from timing out and detects closed clients
+                        yield ': keep-alive\n\n'
+                        continue
+                    yield format_event(event)
+            finally:
+                task_events.unsubscribe(subscription)
+
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -53,22 +482,153 @@ def create_task():
         if not data or not data.get('status_id'):
             return jsonify({'error': 'Status is required'}), 400
 
-        query = """
-        INSERT INTO tasks (title, description, status_id)
-        VALUES (%s, %s, %s)
-        RETURNING *
-        """
-        params = (
+        task = task_repository.create(
             data['title'],
             data.get('description', 'no description'),
             data['status_id']
         )
-        
-        task = db.execute_query(query, params, fetch_one=True)
         return jsonify(task), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def get_batch_items(data, key='tasks'):
+    """Accept either a bare JSON array or an object wrapping it under `key`"""
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list) or not data:
+        return None, (jsonify({'error': f'A non-empty array of {key} is required'}), 400)
+    if len(data) > MAX_BATCH_SIZE:
+        return None, (jsonify({'error': f'At most {MAX_BATCH_SIZE} items per batch'}), 400)
+    return data, None
+
+def batch_status_code(succeeded, failed, ok=200):
+    """`ok` when every item succeeded, 207 on partial success, 400 when nothing did"""
+    if not succeeded:
+        return 400
+    return 207 if failed else ok
+
+@tasks_bp.route('/batch', methods=['POST'])
+@jwt_required
+def create_tasks_batch():
+    """
+    Create many tasks in one transaction with a multi-row insert - requires authentication.
+    Invalid items are reported per index and skipped; valid ones are inserted
+    and returned in request order.
+    """
+    try:
+        items, error_response = get_batch_items(request.get_json(silent=True))
+        if error_response:
+            return error_response
+
+        results = [None] * len(items)
+        rows = []
+        row_indexes = []
+
+        for index, item in enumerate(items):
+            error = validate_new_task(item)
+            if error:
+                results[index] = {'index': index, 'status': 'error', 'error': error}
+                continue
+            rows.append((item['title'], item.get('description', 'no description'), item['status_id']))
+            row_indexes.append(index)
+
+        # Returned in request order
+        created = task_repository.create_many(rows)
+        for index, task in zip(row_indexes, created):
+            results[index] = {'index': index, 'status': 'created', 'task': task}
+
+        failed = len(items) - len(rows)
+        return jsonify({
+            'created': len(rows),
+            'failed': failed,
+            'results': results
+        }), batch_status_code(len(rows), failed, ok=201)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tasks_bp.route('/batch', methods=['PATCH'])
+@jwt_required
+def update_tasks_batch():
+    """
+    Apply many id-keyed partial updates in one UPDATE statement and one commit -
+    requires authentication. Each item carries task_id plus any of title,
+    description and status_id; results are reported per index.
+    """
+    try:
+        items, error_response = get_batch_items(request.get_json(silent=True))
+        if error_response:
+            return error_response
+
+        results = [None] * len(items)
+        valid = []
+        row_indexes = {}
+
+        for index, item in enumerate(items):
+            error = validate_task_update(item, row_indexes)
+            if error:
+                results[index] = {'index': index, 'status': 'error', 'error': error}
+                continue
+            valid.append(item)
+            row_indexes[item['task_id']] = index
+
+        updated = task_repository.update_many(valid)
+
+        updated_by_id = {task['task_id']: task for task in updated}
+        for task_id, index in row_indexes.items():
+            if task_id in updated_by_id:
+                results[index] = {'index': index, 'status': 'updated', 'task': updated_by_id[task_id]}
+            else:
+                results[index] = {'index': index, 'status': 'error', 'error': 'Task not found'}
+
+        failed = len(items) - len(updated)
+        return jsonify({
+            'updated': len(updated),
+            'failed': failed,
+            'results': results
+        }), batch_status_code(len(updated), failed)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@tasks_bp.route('/batch', methods=['DELETE'])
+@jwt_required
+def delete_tasks_batch():
+    """
+    Delete many tasks by id in one statement and one commit - requires authentication.
+    The body is an array of ids or {"task_ids": [...]}; results are reported per index.
+    """
+    try:
+        task_ids, error_response = get_batch_items(request.get_json(silent=True), key='task_ids')
+        if error_response:
+            return error_response
+
+        results = [None] * len(task_ids)
+        id_indexes = {}
+        for index, task_id in enumerate(task_ids):
+            if not isinstance(task_id, int) or isinstance(task_id, bool):
+                results[index] = {'index': index, 'status': 'error', 'error': 'task_id must be an integer'}
+            elif task_id in id_indexes:
+                results[index] = {'index': index, 'status': 'error', 'error': f'Duplicate task_id {task_id}'}
+            else:
+                id_indexes[task_id] = index
+
+        deleted = task_repository.delete_many(id_indexes)
+
+        deleted_by_id = {task['task_id']: task for task in deleted}
+        for task_id, index in id_indexes.items():
+            if task_id in deleted_by_id:
+                results[index] = {'index': index, 'status': 'deleted', 'task': deleted_by_id[task_id]}
+            else:
+                results[index] = {'index': index, 'status': 'error', 'error': 'Task not found'}
+
+        failed = len(task_ids) - len(deleted)
+        return jsonify({
+            'deleted': len(deleted),
+            'failed': failed,
+            'results': results
+        }), batch_status_code(len(deleted), failed)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @tasks_bp.route('/<int:task_id>', methods=['PUT'])
 @jwt_required
 def update_task(task_id):
@@ -78,33 +638,10 @@ def update_task(task_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Build dynamic update query based on provided fields
-        update_fields = []
-        params = []
-        
-        if 'title' in data:
-            update_fields.append('title = %s')
-            params.append(data['title'])
-        if 'description' in data:
-            update_fields.append('description = %s')
-            params.append(data['description'])
-        if 'status_id' in data:
-            update_fields.append('status_id = %s')
-            params.append(data['status_id'])
-        
-        if not update_fields:
+        if not any(field in data for field in ('title', 'description', 'status_id')):
             return jsonify({'error': 'No valid fields to update'}), 400
         
-        params.append(task_id)  # Add task_id for WHERE clause
-        
-        query = f"""
-        UPDATE tasks 
-        SET {', '.join(update_fields)}
-        WHERE task_id = %s
-        RETURNING *
-        """
-        
-        task = db.execute_query(query, tuple(params), fetch_one=True)
+        task = task_repository.update(task_id, data)
         if not task:
             return jsonify({'error': 'Task not found'}), 404
         
@@ -117,8 +654,7 @@ def update_task(task_id):
 async def delete_task(task_id):
     """Delete a task - requires authentication"""
     try:
-        query = "DELETE FROM tasks WHERE task_id = %s RETURNING *"
-        task = db.execute_query(query, (task_id,), fetch_one=True)
+        task = task_repository.delete(task_id)
         if not task:
             return jsonify({'error': 'Task not found'}), 404
         
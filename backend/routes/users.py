@@ -2,7 +2,7 @@
 User routes with hardcoded dummy admin account and JWT authentication
 """
 from flask import Blueprint, request, jsonify
-from utils.jwt_utils import generate_jwt_token, jwt_required, admin_required
+from utils.jwt_utils import generate_jwt_token, revoke_jwt_token, jwt_required, admin_required
 
 users_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
@@ -65,6 +65,17 @@ async def login():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@users_bp.route('/logout', methods=['POST'])
+@jwt_required
+async def logout():
+    """Logout endpoint - revokes the bearer token until it expires"""
+    try:
+        token = request.headers['Authorization'].split(' ')[1]
+        revoke_jwt_token(token)
+        return jsonify({'message': 'Logout successful'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @users_bp.route('', methods=['POST'])
 @jwt_required
 @admin_required
@@ -0,0 +1,29 @@
+"""
+Unit tests for agent admission and the server thread budget (no server or database needed)
+Run with: python -m pytest test_agent_executor.py
+"""
+import pytest
+from agents.agent_executor import AgentExecutor, AgentBusyError, agent_executor
+from utils import thread_budget
+
+def test_admission_refuses_beyond_capacity():
+    executor = AgentExecutor(workers=1, max_active=2, queue_size=1)
+    try:
+        with executor.admission(), executor.admission(), executor.admission():
+            with pytest.raises(AgentBusyError) as busy:
+                with executor.admission():
+                    pass
+            assert busy.value.retry_after >= 1
+        # Slots are released when the blocks exit
+        with executor.admission():
+            pass
+        assert executor.stats()['rejected'] == 1
+    finally:
+        executor.close()
+
+def test_long_lived_requests_leave_reserved_threads():
+    # The same limit utils/task_events.py gives its broker (importing it needs a database)
+    event_streams = thread_budget.capped('TASK_EVENTS_MAX_SUBSCRIBERS', thread_budget.EVENT_STREAM_THREADS)
+    long_lived = agent_executor.capacity + event_streams
+    assert long_lived <= thread_budget.SERVER_THREADS - thread_budget.RESERVED_THREADS
+    assert thread_budget.RESERVED_THREADS >= 1
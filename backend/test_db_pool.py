@@ -0,0 +1,166 @@
+"""
+Unit tests for the database connection pool (no server or database needed)
+Run with: python -m pytest test_db_pool.py
+"""
+import os
+
+os.environ.setdefault('DB_PORT', '5432')
+
+import threading
+import time
+import psycopg2
+import psycopg2.extensions
+import pytest
+from utils.db_connection import ConnectionPool, PoolTimeoutError
+
+class StubCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+
+class StubInfo:
+    transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+class StubConnection:
+    """Stands in for PooledConnection: the same bookkeeping, no server"""
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.use_count = 0
+        self.prepared = set()
+        self.info = StubInfo()
+        self.rollbacks = 0
+
+    def cursor(self):
+        return StubCursor(self)
+
+    def rollback(self):
+        if self.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+        self.rollbacks += 1
+        self.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+class StubPool(ConnectionPool):
+    """ConnectionPool whose connect factory hands out stub connections"""
+    def __init__(self, **kwargs):
+        self.connected = []
+        self.refuse = False
+        super().__init__({}, **kwargs)
+
+    def _connect(self):
+        if self.refuse:
+            raise psycopg2.OperationalError('could not connect to server')
+        conn = StubConnection()
+        self.connected.append(conn)
+        return conn
+
+def test_getconn_times_out_when_the_pool_is_exhausted():
+    pool = StubPool(min_size=0, max_size=1, timeout=0.05)
+    conn = pool.getconn()
+    start = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert time.monotonic() - start >= 0.05
+    assert pool.stats()['timeouts'] == 1
+    assert pool.stats()['waiting'] == 0
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+
+def test_waiter_gets_the_connection_released_by_another_thread():
+    pool = StubPool(min_size=0, max_size=1, timeout=5)
+    conn = pool.getconn()
+    threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+    assert pool.getconn() is conn
+    assert pool.stats()['timeouts'] == 0
+
+def test_closed_connection_is_replaced_on_checkout():
+    pool = StubPool(min_size=1, max_size=1)
+    dead = pool.connected[0]
+    dead.close()
+    conn = pool.getconn()
+    assert conn is not dead
+    assert pool.stats()['recycled'] == 1
+    assert pool.stats()['size'] == 1
+
+def test_idle_connection_failing_its_ping_is_replaced():
+    # check_idle=0 pings on every checkout
+    pool = StubPool(min_size=1, max_size=1, check_idle=0)
+    first = pool.connected[0]
+    assert pool.getconn() is first
+    first.broken = True
+    pool.putconn(first)
+    conn = pool.getconn()
+    assert conn is not first and not conn.broken
+    assert first.closed
+
+def test_connection_is_recycled_after_max_uses():
+    pool = StubPool(min_size=0, max_size=1, max_uses=2)
+    first = pool.getconn()
+    pool.putconn(first)
+    assert pool.getconn() is first
+    # Second use reached max_uses: closed on return
+    pool.putconn(first)
+    assert first.closed
+    assert pool.getconn() is not first
+
+def test_open_transaction_is_rolled_back_on_return():
+    pool = StubPool(min_size=0, max_size=1)
+    conn = pool.getconn()
+    conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INERROR
+    pool.putconn(conn)
+    assert conn.rollbacks == 1
+    assert pool.getconn() is conn
+
+    # A rollback that fails means the session is unusable
+    conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    conn.broken = True
+    pool.putconn(conn)
+    assert conn.closed
+    assert pool.stats()['size'] == 0
+
+def test_failed_connect_frees_the_slot():
+    pool = StubPool(min_size=0, max_size=1, timeout=0.05)
+    pool.refuse = True
+    with pytest.raises(psycopg2.OperationalError):
+        pool.getconn()
+    assert (pool.stats()['size'], pool.stats()['in_use']) == (0, 0)
+    pool.refuse = False
+    pool.getconn()
+
+def test_closeall_with_connections_checked_out():
+    pool = StubPool(min_size=2, max_size=3)
+    checked_out = pool.getconn()
+    idle = [conn for conn in pool.connected if conn is not checked_out]
+
+    pool.closeall()
+    assert all(conn.closed for conn in idle)
+    # The connection in use is left to its borrower
+    assert not checked_out.closed
+    assert (pool.stats()['size'], pool.stats()['in_use']) == (1, 1)
+    with pytest.raises(psycopg2.InterfaceError):
+        pool.getconn()
+
+    # Returning it after the pool closed closes it instead of pooling it
+    pool.putconn(checked_out)
+    assert checked_out.closed
+    assert (pool.stats()['size'], pool.stats()['in_use'], pool.stats()['idle']) == (0, 0, 0)
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
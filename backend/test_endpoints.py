@@ -198,6 +198,296 @@ async def test_ai_agent(session):
     except Exception as e:
         console.print(f"[bold red]Error testing agent: {e}[/bold red]")
 
+async def test_paging(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Keyset Paging[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    task_ids = []
+    for i in range(3):
+        task = {"title": f"Paging Task {i + 1}", "description": "Listed in pages", "status_id": "TODO"}
+        async with session.post(f"{BASE_URL}/api/tasks", json=task, headers=headers) as resp:
+            if resp.status == 201:
+                task_ids.append((await resp.json())['task_id'])
+    console.print(f"Create Paging Tasks: [{ 'green' if len(task_ids) == 3 else 'red' }]{len(task_ids)} created[/]")
+
+    # Keyset paging: two pages of two, no task on both
+    async with session.get(f"{BASE_URL}/api/tasks", params={"limit": 2, "order": "desc"}, headers=headers) as resp:
+        first_page = await resp.json()
+        cursor = first_page.get('next_cursor')
+        console.print(f"List Page 1 (limit=2): [{ 'green' if resp.status == 200 and cursor else 'red' }]{resp.status}[/] - {[t['task_id'] for t in first_page.get('tasks', [])]}, next_cursor={cursor}")
+    if cursor:
+        async with session.get(f"{BASE_URL}/api/tasks", params={"limit": 2, "order": "desc", "after": cursor}, headers=headers) as resp:
+            second_page = await resp.json()
+            first_ids = {t['task_id'] for t in first_page['tasks']}
+            second_ids = [t['task_id'] for t in second_page.get('tasks', [])]
+            ok = resp.status == 200 and not first_ids & set(second_ids)
+            console.print(f"List Page 2 (after cursor): [{ 'green' if ok else 'red' }]{resp.status}[/] - {second_ids}")
+
+    async with session.get(f"{BASE_URL}/api/tasks", params={"after": "not-a-cursor"}, headers=headers) as resp:
+        console.print(f"List (Bad Cursor): [{ 'green' if resp.status == 400 else 'red' }]{resp.status}[/] - {await resp.json()}")
+
+    for task_id in task_ids:
+        async with session.delete(f"{BASE_URL}/api/tasks/{task_id}", headers=headers) as resp:
+            await resp.read()
+
+async def test_batch_create(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Batch Create[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # The invalid item is reported at its index, the others are created
+    batch = [
+        {"title": "Batch Task 1", "description": "Created in a batch", "status_id": "TODO"},
+        {"title": "Batch Task 2", "description": "Created in a batch", "status_id": "NOT_A_STATUS"},
+        {"title": "Batch Task 3", "description": "Created in a batch", "status_id": "DONE"}
+    ]
+    async with session.post(f"{BASE_URL}/api/tasks/batch", json=batch, headers=headers) as resp:
+        data = await resp.json()
+        results = data.get('results', [])
+        statuses = [result['status'] for result in results]
+        ok = resp.status == 207 and statuses == ['created', 'error', 'created']
+        console.print(f"Batch Create (Per-item Results): [{ 'green' if ok else 'red' }]{resp.status}[/] - {statuses}")
+
+    for result in results:
+        if result['status'] == 'created':
+            async with session.delete(f"{BASE_URL}/api/tasks/{result['task']['task_id']}", headers=headers) as resp:
+                await resp.read()
+
+async def test_batch_update_delete(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Batch Update and Delete[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    batch = [{"title": f"Batch Edit Task {i + 1}", "description": "Edited in a batch", "status_id": "TODO"} for i in range(2)]
+    async with session.post(f"{BASE_URL}/api/tasks/batch", json=batch, headers=headers) as resp:
+        task_ids = [result['task']['task_id'] for result in (await resp.json()).get('results', []) if result['status'] == 'created']
+    if len(task_ids) != 2:
+        console.print(f"[bold red]Failed to create batch tasks: {resp.status}[/bold red]")
+        return
+
+    # A missing id is reported, the rest is applied
+    updates = [{"task_id": task_ids[0], "status_id": "INPROGRESS"}, {"task_id": 0, "status_id": "DONE"}]
+    async with session.patch(f"{BASE_URL}/api/tasks/batch", json=updates, headers=headers) as resp:
+        data = await resp.json()
+        statuses = [result['status'] for result in data.get('results', [])]
+        ok = resp.status == 207 and statuses == ['updated', 'error']
+        console.print(f"Batch Update (Per-item Results): [{ 'green' if ok else 'red' }]{resp.status}[/] - {statuses}")
+
+    async with session.delete(f"{BASE_URL}/api/tasks/batch", json=[task_ids[0], "x"], headers=headers) as resp:
+        data = await resp.json()
+        statuses = [result['status'] for result in data.get('results', [])]
+        ok = resp.status == 207 and statuses == ['deleted', 'error']
+        console.print(f"Batch Delete (Per-item Results): [{ 'green' if ok else 'red' }]{resp.status}[/] - {statuses}")
+
+    async with session.delete(f"{BASE_URL}/api/tasks/batch", json={"task_ids": task_ids[1:]}, headers=headers) as resp:
+        console.print(f"Batch Delete (All Valid): [{ 'green' if resp.status == 200 else 'red' }]{resp.status}[/]")
+
+async def test_conditional_get(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing ETags and Conditional GET[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    task = {"title": "ETag Task", "description": "Revalidated by ETag", "status_id": "TODO"}
+    async with session.post(f"{BASE_URL}/api/tasks", json=task, headers=headers) as resp:
+        task_id = (await resp.json()).get('task_id')
+    if not task_id:
+        console.print(f"[bold red]Failed to create task: {resp.status}[/bold red]")
+        return
+
+    # Unchanged list is 304, a write makes it 200 again
+    async with session.get(f"{BASE_URL}/api/tasks", params={"limit": 2, "order": "desc"}, headers=headers) as resp:
+        etag = resp.headers.get('ETag')
+        console.print(f"List (ETag): [{ 'green' if resp.status == 200 and etag else 'red' }]{resp.status}[/] - {etag}")
+    if etag:
+        conditional = {**headers, "If-None-Match": etag}
+        async with session.get(f"{BASE_URL}/api/tasks", params={"limit": 2, "order": "desc"}, headers=conditional) as resp:
+            console.print(f"List (If-None-Match, Unchanged): [{ 'green' if resp.status == 304 else 'red' }]{resp.status}[/]")
+
+    async with session.get(f"{BASE_URL}/api/tasks/{task_id}", headers=headers) as resp:
+        task_etag = resp.headers.get('ETag')
+        console.print(f"Get Task (ETag): [{ 'green' if resp.status == 200 and task_etag else 'red' }]{resp.status}[/] - {task_etag}")
+    if task_etag:
+        async with session.get(f"{BASE_URL}/api/tasks/{task_id}", headers={**headers, "If-None-Match": task_etag}) as resp:
+            console.print(f"Get Task (If-None-Match): [{ 'green' if resp.status == 304 else 'red' }]{resp.status}[/]")
+
+    async with session.put(f"{BASE_URL}/api/tasks/{task_id}", json={"status_id": "DONE"}, headers=headers) as resp:
+        await resp.read()
+    if etag:
+        async with session.get(f"{BASE_URL}/api/tasks", params={"limit": 2, "order": "desc"}, headers=conditional) as resp:
+            console.print(f"List (If-None-Match, After Write): [{ 'green' if resp.status == 200 else 'red' }]{resp.status}[/]")
+
+    async with session.delete(f"{BASE_URL}/api/tasks/{task_id}", headers=headers) as resp:
+        await resp.read()
+
+async def test_delta_sync(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Delta Sync[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Sync token taken before the writes below
+    async with session.get(f"{BASE_URL}/api/tasks/changes", headers=headers) as resp:
+        data = await resp.json()
+        sync_token = data.get('next_token')
+        console.print(f"Changes (Initial Token): [{ 'green' if resp.status == 200 and sync_token else 'red' }]{resp.status}[/] - {data}")
+    if not sync_token:
+        return
+
+    task_ids = []
+    for i in range(3):
+        task = {"title": f"Sync Task {i + 1}", "description": "Reported by delta sync", "status_id": "TODO"}
+        async with session.post(f"{BASE_URL}/api/tasks", json=task, headers=headers) as resp:
+            if resp.status == 201:
+                task_ids.append((await resp.json())['task_id'])
+    if len(task_ids) != 3:
+        console.print("[bold red]Failed to create sync tasks[/bold red]")
+        return
+    async with session.put(f"{BASE_URL}/api/tasks/{task_ids[0]}", json={"status_id": "DONE"}, headers=headers) as resp:
+        await resp.read()
+    deleted_id = task_ids[-1]
+    async with session.delete(f"{BASE_URL}/api/tasks/{deleted_id}", headers=headers) as resp:
+        await resp.read()
+
+    # Created and updated tasks come back as rows, the deleted one as a tombstone
+    async with session.get(f"{BASE_URL}/api/tasks/changes", params={"since": sync_token}, headers=headers) as resp:
+        data = await resp.json()
+        changed = {t['task_id'] for t in data.get('tasks', [])}
+        ok = (resp.status == 200 and not data.get('reset') and set(task_ids[:-1]) <= changed
+              and deleted_id in data.get('deleted', []) and deleted_id not in changed)
+        console.print(f"Changes (Since Token): [{ 'green' if ok else 'red' }]{resp.status}[/] - changed={sorted(changed)}, deleted={data.get('deleted')}")
+
+    async with session.get(f"{BASE_URL}/api/tasks/changes", params={"since": "not-a-token"}, headers=headers) as resp:
+        console.print(f"Changes (Bad Token): [{ 'green' if resp.status == 400 else 'red' }]{resp.status}[/] - {await resp.json()}")
+
+    for task_id in task_ids[:-1]:
+        async with session.delete(f"{BASE_URL}/api/tasks/{task_id}", headers=headers) as resp:
+            await resp.read()
+
+async def test_token_revocation(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing JWT Revocation[/bold blue]")
+
+    # Separate logins: revoking one token must not affect the other
+    token = await get_auth_token(session)
+    other = await get_auth_token(session)
+    if not token or not other:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with session.post(f"{BASE_URL}/api/users/logout", headers=headers) as resp:
+        console.print(f"Logout: [{ 'green' if resp.status == 200 else 'red' }]{resp.status}[/] - {await resp.json()}")
+    async with session.get(f"{BASE_URL}/api/tasks", headers=headers) as resp:
+        console.print(f"Get Tasks (Revoked Token): [{ 'green' if resp.status == 401 else 'red' }]{resp.status}[/]")
+    async with session.get(f"{BASE_URL}/api/tasks", headers={"Authorization": f"Bearer {other}"}) as resp:
+        console.print(f"Get Tasks (Other Login): [{ 'green' if resp.status == 200 else 'red' }]{resp.status}[/]")
+
+async def test_thread_budget(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Thread Budget[/bold blue]")
+
+    async with session.get(f"{BASE_URL}/api/health") as resp:
+        data = await resp.json()
+    budget = data.get('thread_budget', {})
+    ok = budget.get('reserved_threads', 0) + budget.get('agent_threads', 0) + budget.get('event_stream_threads', 0) <= budget.get('server_threads', 0)
+    console.print(f"Thread Budget: [{ 'green' if ok else 'red' }]{resp.status}[/] - {budget}")
+    console.print(f"Agent Executor: {data.get('agent_executor')}")
+
+async def test_agent_admission(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Agent Admission Control[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with session.get(f"{BASE_URL}/api/agent/stats", headers=headers) as resp:
+        executor = (await resp.json())['agent_executor']
+    capacity = executor['max_active'] + executor['queue_size']
+
+    # Two more prompts than the queue takes: the extra ones are refused with 429 and Retry-After
+    async def send():
+        async with session.post(f"{BASE_URL}/api/agent/process", json={"prompt": "Tell me a joke"}, headers=headers) as resp:
+            await resp.read()
+            return resp.status, resp.headers.get('Retry-After')
+    outcomes = await asyncio.gather(*(send() for _ in range(capacity + 2)))
+    refused = [retry_after for status, retry_after in outcomes if status == 429]
+    ok = refused and all(refused)
+    console.print(f"Burst of {capacity + 2} Prompts (capacity {capacity}): [{ 'green' if ok else 'red' }]{len(refused)} refused[/] - {[status for status, _ in outcomes]}")
+
+async def test_agent_jobs(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Background Agent Jobs[/bold blue]")
+
+    token = await get_auth_token(session)
+    if not token:
+        console.print("[bold red]Failed to get authentication token[/bold red]")
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async with session.post(f"{BASE_URL}/api/agent/jobs", json={"prompt": ""}, headers=headers) as resp:
+        console.print(f"Queue Job (No Prompt): [{ 'green' if resp.status == 400 else 'red' }]{resp.status}[/] - {await resp.json()}")
+
+    async with session.post(f"{BASE_URL}/api/agent/jobs", json={"prompt": "Tell me a joke"}, headers=headers) as resp:
+        job = await resp.json()
+        location = resp.headers.get('Location')
+        ok = resp.status == 202 and job.get('status') == 'queued' and location
+        console.print(f"Queue Job: [{ 'green' if ok else 'red' }]{resp.status}[/] - {job}, Location={location}")
+    if resp.status != 202:
+        return
+
+    async with session.get(f"{BASE_URL}/api/agent/jobs/0", headers=headers) as resp:
+        console.print(f"Get Job (Unknown): [{ 'green' if resp.status == 404 else 'red' }]{resp.status}[/]")
+
+    # Poll as a client would, following Retry-After, for up to two minutes
+    deadline = asyncio.get_running_loop().time() + 120
+    while True:
+        async with session.get(f"{BASE_URL}{location}", headers=headers) as resp:
+            job = await resp.json()
+            retry_after = resp.headers.get('Retry-After')
+        if job.get('status') in ('succeeded', 'rejected', 'failed') or asyncio.get_running_loop().time() > deadline:
+            break
+        await asyncio.sleep(float(retry_after or 2))
+    finished = job.get('status') in ('succeeded', 'rejected', 'failed')
+    console.print(f"Job Outcome: [{ 'green' if finished else 'red' }]{job.get('status')}[/] - {job.get('response') or job.get('error')}")
+
+async def test_pool_stats(session):
+    console.print("\n")
+    console.rule("[bold blue]Testing Connection Pool[/bold blue]")
+
+    async with session.get(f"{BASE_URL}/api/health") as resp:
+        data = await resp.json()
+    pool = data.get('pool', {})
+    ok = pool.get('initialized') and pool.get('in_use', 0) <= pool.get('max_size', 0) and not pool.get('waiting')
+    console.print(f"Connection Pool: [{ 'green' if ok else 'red' }]{resp.status}[/] - {pool}")
+
 async def main():
     try:
         async with aiohttp.ClientSession() as session:
@@ -212,9 +502,19 @@ async def main():
             # Test CRUD operations with JWT
             await test_users(session)
             await test_tasks(session)
+            await test_paging(session)
+            await test_batch_create(session)
+            await test_batch_update_delete(session)
+            await test_conditional_get(session)
+            await test_delta_sync(session)
+            await test_token_revocation(session)
+            await test_thread_budget(session)
+            await test_pool_stats(session)
             
             # Test AI Agent
             await test_ai_agent(session)
+            await test_agent_admission(session)
+            await test_agent_jobs(session)
             
     except Exception as e:
         console.print(f"[bold red]Error: {e}[/bold red]")
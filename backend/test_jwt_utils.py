@@ -0,0 +1,35 @@
+"""
+Unit tests for JWT issuing and revocation (no server or database needed)
+Run with: python -m pytest test_jwt_utils.py
+"""
+import os
+
+os.environ.setdefault('JWT_SECRET_KEY', 'test-secret-key-with-enough-bytes-for-hs256')
+os.environ.setdefault('JWT_ALGORITHM', 'HS256')
+os.environ.setdefault('JWT_EXPIRATION_HOURS', '1')
+
+from utils.jwt_utils import generate_jwt_token, decode_jwt_token, revoke_jwt_token
+
+USER = {'id': 1, 'username': 'admin', 'role': 'admin'}
+
+def test_revoked_token_is_refused():
+    token = generate_jwt_token(USER)
+    assert decode_jwt_token(token)['user_id'] == 1
+    assert revoke_jwt_token(token)
+    assert decode_jwt_token(token) is None
+
+def test_revoking_one_login_keeps_the_other():
+    first = generate_jwt_token(USER)
+    second = generate_jwt_token(USER)
+    assert first != second
+    revoke_jwt_token(first)
+    assert decode_jwt_token(second)['username'] == 'admin'
+
+def test_invalid_token_cannot_be_revoked():
+    assert not revoke_jwt_token('not-a-token')
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
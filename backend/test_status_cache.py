@@ -0,0 +1,68 @@
+"""
+Unit tests for the status label cache (no server or database needed)
+Run with: python -m pytest test_status_cache.py
+"""
+import time
+from utils.db_connection import db
+from utils.status_cache import StatusCache
+from utils.task_cache import TaskCache, task_key
+
+def loaded_cache():
+    cache = StatusCache()
+    cache._statuses = {
+        'TODO': {'status_id': 'TODO', 'status': 'To Do'},
+        'DONE': {'status_id': 'DONE', 'status': 'Done'}
+    }
+    cache._loaded_at = time.monotonic()
+    return cache
+
+def test_attach_fills_in_the_label():
+    cache = loaded_cache()
+    assert cache.attach({'task_id': 1, 'status_id': 'DONE'})['status'] == 'Done'
+    assert [task['status'] for task in cache.attach([{'status_id': 'TODO'}, {'status_id': None}])] == ['To Do', None]
+    assert cache.attach(None) is None
+
+def test_attach_leaves_cached_rows_untouched():
+    statuses = loaded_cache()
+    tasks = TaskCache()
+    row = {'task_id': 1, 'title': 'Report', 'status_id': 'TODO'}
+    tasks.get_or_load(task_key(1), lambda: row)
+
+    labelled = statuses.attach(tasks.get_or_load(task_key(1), lambda: None))
+    labelled['status'] = 'Changed by a request'
+    labelled['title'] = 'Changed too'
+
+    cached = tasks.get_or_load(task_key(1), lambda: None)
+    assert cached == {'task_id': 1, 'title': 'Report', 'status_id': 'TODO'}
+    assert 'status' not in cached
+
+def test_attach_copies_every_row_of_a_list():
+    statuses = loaded_cache()
+    rows = [{'task_id': 1, 'status_id': 'TODO'}, {'task_id': 2, 'status_id': 'DONE'}]
+    labelled = statuses.attach(rows)
+    assert labelled is not rows
+    assert all(copy is not row for copy, row in zip(labelled, rows))
+    assert all('status' not in row for row in rows)
+
+def test_renamed_label_changes_the_version():
+    rows = [{'status_id': 'TODO', 'status': 'To Do', 'created_at': None}]
+    cache = StatusCache()
+    # Stands in for the status table
+    db.execute_query = lambda *args, **kwargs: [dict(row) for row in rows]
+    try:
+        cache.refresh()
+        version, changed_at = cache.version, cache.changed_at
+        cache.refresh()
+        assert (cache.version, cache.changed_at) == (version, changed_at)
+        rows[0]['status'] = 'Backlog'
+        cache.refresh()
+        assert cache.version != version
+        assert cache.changed_at >= changed_at
+    finally:
+        del db.execute_query
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
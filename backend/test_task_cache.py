@@ -0,0 +1,121 @@
+"""
+Unit tests for the in-process task cache (no server or database needed)
+Run with: python -m pytest test_task_cache.py
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.task_cache import TaskCache, task_key, list_key
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TaskCache(max_entries=2)
+    cache.get_or_load(task_key(1), lambda: {'task_id': 1})
+    cache.get_or_load(task_key(2), lambda: {'task_id': 2})
+    # Touching task 1 leaves task 2 as the least recently used
+    cache.get_or_load(task_key(1), lambda: None)
+    cache.get_or_load(task_key(3), lambda: {'task_id': 3})
+    assert cache.stats()['evictions'] == 1
+    assert cache.get_or_load(task_key(1), lambda: None) == {'task_id': 1}
+    assert cache.get_or_load(task_key(2), lambda: 'reloaded') == 'reloaded'
+
+def test_entries_expire_after_ttl():
+    cache = TaskCache(ttl=0.05)
+    cache.get_or_load(task_key(1), lambda: 'first')
+    assert cache.get_or_load(task_key(1), lambda: 'second') == 'first'
+    time.sleep(0.06)
+    assert cache.get_or_load(task_key(1), lambda: 'second') == 'second'
+    assert cache.stats()['expirations'] == 1
+
+def test_zero_ttl_turns_the_cache_off():
+    cache = TaskCache(ttl=0)
+    assert cache.get_or_load(task_key(1), lambda: 'first') == 'first'
+    assert cache.get_or_load(task_key(1), lambda: 'second') == 'second'
+
+def test_concurrent_misses_share_one_load():
+    cache = TaskCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ['row']
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        first = pool.submit(cache.get_or_load, list_key('SELECT 1'), load)
+        assert started.wait(5)
+        others = [pool.submit(cache.get_or_load, list_key('SELECT 1'), load) for _ in range(3)]
+        # Wait until every other caller joined the load in flight before finishing it
+        deadline = time.monotonic() + 5
+        while cache.stats()['coalesced'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        results = [first.result(5)] + [future.result(5) for future in others]
+
+    assert results == [['row']] * 4
+    assert len(calls) == 1
+    assert (cache.stats()['misses'], cache.stats()['coalesced']) == (1, 3)
+
+def test_failed_load_is_not_cached():
+    cache = TaskCache()
+    def fail():
+        raise RuntimeError('database down')
+    with pytest.raises(RuntimeError):
+        cache.get_or_load(task_key(1), fail)
+    assert cache.get_or_load(task_key(1), lambda: 'loaded') == 'loaded'
+
+def test_load_started_before_a_write_is_not_stored():
+    cache = TaskCache()
+    def load():
+        # Another request writes while this list is being read
+        cache.write_through([{'task_id': 1, 'title': 'New'}])
+        return [{'task_id': 1, 'title': 'Old'}]
+
+    assert cache.get_or_load(list_key('SELECT 1'), load) == [{'task_id': 1, 'title': 'Old'}]
+    assert cache.get_or_load(list_key('SELECT 1'), lambda: 'reloaded') == 'reloaded'
+    # The written row itself was stored
+    assert cache.get_or_load(task_key(1), lambda: None) == {'task_id': 1, 'title': 'New'}
+
+def test_writes_drop_lists_and_evicted_tasks():
+    cache = TaskCache()
+    cache.get_or_load(list_key('SELECT 1'), lambda: ['cached'])
+    cache.get_or_load(task_key(1), lambda: {'task_id': 1})
+    cache.evict([1])
+    assert cache.get_or_load(list_key('SELECT 1'), lambda: 'reloaded') == 'reloaded'
+    assert cache.get_or_load(task_key(1), lambda: 'reloaded') == 'reloaded'
+
+def test_newer_table_version_drops_everything():
+    cache = TaskCache()
+    cache.observe_version(1)
+    cache.get_or_load(task_key(1), lambda: 'cached')
+    # A lagging replica reporting an older version changes nothing
+    cache.observe_version(0)
+    assert cache.get_or_load(task_key(1), lambda: 'reloaded') == 'cached'
+    cache.observe_version(2)
+    assert cache.get_or_load(task_key(1), lambda: 'reloaded') == 'reloaded'
+
+def test_fill_behind_the_seen_version_is_not_kept():
+    cache = TaskCache()
+    cache.observe_version(5)
+    # A lagging replica answered at version 4: serve it, but read again next time
+    assert cache.get_or_fill(task_key(1), lambda: ({'task_id': 1, 'title': 'Old'}, 4))['title'] == 'Old'
+    assert cache.get_or_fill(task_key(1), lambda: ({'task_id': 1, 'title': 'New'}, 5))['title'] == 'New'
+    assert cache.get_or_fill(task_key(1), lambda: ({'task_id': 1, 'title': 'Unused'}, 5))['title'] == 'New'
+
+def test_fill_ahead_of_the_seen_version_drops_older_entries():
+    cache = TaskCache()
+    cache.observe_version(5)
+    cache.get_or_fill(task_key(1), lambda: ({'task_id': 1}, 5))
+    cache.get_or_fill(task_key(2), lambda: ({'task_id': 2}, 6))
+    assert cache.stats()['version'] == 6
+    assert cache.get_or_fill(task_key(1), lambda: ({'task_id': 1, 'reloaded': True}, 6))['reloaded']
+    assert cache.get_or_fill(task_key(2), lambda: ({'task_id': 2, 'reloaded': True}, 6)).get('reloaded') is None
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
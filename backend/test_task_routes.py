@@ -0,0 +1,145 @@
+"""
+Unit tests for the task route helpers (no server or database needed)
+Run with: python -m pytest test_task_routes.py
+"""
+import os
+
+os.environ.setdefault('DB_PORT', '5432')
+os.environ.setdefault('JWT_SECRET_KEY', 'test-secret-key-with-enough-bytes-for-hs256')
+os.environ.setdefault('JWT_ALGORITHM', 'HS256')
+os.environ.setdefault('JWT_EXPIRATION_HOURS', '1')
+
+import base64
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import pytest
+from flask import Flask, jsonify
+import routes.tasks as task_routes
+from routes.tasks import (
+    encode_cursor, decode_cursor, build_list_query, conditional, not_modified,
+    encode_sync_token, decode_sync_token, MAX_PAGE_SIZE
+)
+from utils.status_cache import status_cache
+
+CREATED_AT = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+app = Flask(__name__)
+
+def test_cursor_round_trip():
+    task = {'task_id': 7, 'created_at': CREATED_AT}
+    assert decode_cursor(encode_cursor(task, 'desc')) == ('desc', 7, CREATED_AT.isoformat())
+    # Id order needs no timestamp
+    assert decode_cursor(encode_cursor({'task_id': 7}, 'id')) == ('id', 7, None)
+
+def test_malformed_cursor_is_refused():
+    for cursor in ('not-a-cursor', '', encode_cursor({'task_id': 'x'}, 'id')):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    # A created_at order cursor without its timestamp
+    missing_created_at = base64.urlsafe_b64encode(json.dumps({'o': 'desc', 'i': 7}).encode()).decode()
+    with pytest.raises(ValueError):
+        decode_cursor(missing_created_at)
+
+def test_filter_and_limit_run_in_sql():
+    query, params, limit, order = build_list_query({'status': 'TODO', 'limit': '2'})
+    assert 't.status_id = %s' in query
+    assert 'ORDER BY t.task_id' in query
+    # One extra row tells whether there is a next page
+    assert (params, limit, order) == (('TODO', 3), 2, None)
+    assert build_list_query({'limit': '2'}, lookahead=False)[1] == (2,)
+
+def test_cursor_continues_after_the_last_task():
+    cursor = encode_cursor({'task_id': 7, 'created_at': CREATED_AT}, 'desc')
+    query, params, limit, order = build_list_query({'after': cursor, 'limit': '2'})
+    # The order comes from the cursor when the request leaves it out
+    assert order == 'desc'
+    assert '(t.created_at, t.task_id) < (%s::timestamptz, %s)' in query
+    assert 'ORDER BY t.created_at DESC, t.task_id DESC' in query
+    assert params == (CREATED_AT.isoformat(), 7, 3)
+
+    query, params, _, _ = build_list_query({'after': encode_cursor({'task_id': 7}, 'id')})
+    assert 't.task_id > %s' in query and params == (7,)
+
+def test_bad_list_parameters_are_refused():
+    desc_cursor = encode_cursor({'task_id': 7, 'created_at': CREATED_AT}, 'desc')
+    for args in ({'order': 'sideways'}, {'limit': 'ten'}, {'limit': '0'}, {'limit': str(MAX_PAGE_SIZE + 1)},
+                 {'after': 'not-a-cursor'}, {'order': 'asc', 'after': desc_cursor}):
+        with pytest.raises(ValueError):
+            build_list_query(args)
+
+@contextmanager
+def current_state(version, labels='labels-1'):
+    """Stand in for the table_versions row and the loaded status labels"""
+    saved = task_routes.tasks_version, dict(vars(status_cache))
+    task_routes.tasks_version = lambda: {'version': version, 'updated_at': CREATED_AT}
+    status_cache._statuses = {'TODO': {'status_id': 'TODO', 'status': 'To Do'}}
+    status_cache._loaded_at = time.monotonic()
+    status_cache._version = labels
+    status_cache._changed_at = CREATED_AT - timedelta(days=1)
+    try:
+        yield
+    finally:
+        task_routes.tasks_version = saved[0]
+        vars(status_cache).update(saved[1])
+
+def get(etag_for, headers, version, labels='labels-1'):
+    """Run conditional() for a request with `headers`; returns (response, whether the body was built)"""
+    built = []
+    def build():
+        built.append(True)
+        return jsonify({'tasks': []})
+    with app.test_request_context('/api/tasks', headers=headers), current_state(version, labels):
+        return conditional(etag_for, build), bool(built)
+
+def test_if_none_match_wins_over_if_modified_since():
+    with app.test_request_context('/', headers={'If-None-Match': 'W/"tasks-1"', 'If-Modified-Since': 'Tue, 02 Jan 2024 03:04:05 GMT'}):
+        assert not_modified('tasks-1', None)
+        assert not not_modified('tasks-2', CREATED_AT)
+    with app.test_request_context('/', headers={'If-Modified-Since': 'Tue, 02 Jan 2024 03:04:05 GMT'}):
+        assert not_modified('tasks-1', CREATED_AT.replace(microsecond=500))
+        assert not not_modified('tasks-1', CREATED_AT + timedelta(seconds=1))
+    with app.test_request_context('/'):
+        assert not not_modified('tasks-1', CREATED_AT)
+
+def test_unchanged_tasks_get_304_without_building_the_body():
+    etag_for = lambda version: f"task-7-{version['version']}"
+    response, built = get(etag_for, {}, version=3)
+    assert response.status_code == 200 and built
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    etag = response.headers['ETag']
+
+    response, built = get(etag_for, {'If-None-Match': etag}, version=3)
+    assert response.status_code == 304 and not built
+    assert response.headers['ETag'] == etag
+
+    # A write bumps the table version
+    response, built = get(etag_for, {'If-None-Match': etag}, version=4)
+    assert response.status_code == 200 and built
+
+def test_renamed_status_label_gets_a_new_body():
+    etag_for = lambda version: f"task-7-{version['version']}"
+    response, _ = get(etag_for, {}, version=3)
+    last_modified = response.headers['Last-Modified']
+
+    response, built = get(etag_for, {'If-None-Match': response.headers['ETag']}, version=3, labels='labels-2')
+    assert response.status_code == 200 and built
+    # Last-Modified follows the tasks table until the labels are newer
+    assert response.headers['Last-Modified'] == last_modified
+
+def test_sync_token_round_trip():
+    xmin, issued_at = decode_sync_token(encode_sync_token(123456))
+    assert xmin == 123456
+    assert abs(issued_at - time.time()) < 5
+
+def test_malformed_sync_token_is_refused():
+    tokens = ['not-a-token', '', base64.urlsafe_b64encode(b'{"x": 1}').decode(), base64.urlsafe_b64encode(b'{"x": "a", "t": 1}').decode()]
+    for token in tokens:
+        with pytest.raises(ValueError, match='Invalid sync token'):
+            decode_sync_token(token)
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
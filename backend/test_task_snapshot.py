@@ -0,0 +1,72 @@
+"""
+Unit tests for the per-run task snapshot used by the agent tools (no server or database needed)
+Run with: python -m pytest test_task_snapshot.py
+"""
+from utils.task_snapshot import TaskSnapshot, UNKNOWN
+
+def task(task_id, title):
+    return {'task_id': task_id, 'title': title}
+
+def test_empty_snapshot_answers_nothing():
+    snapshot = TaskSnapshot()
+    assert snapshot.find('Report') is UNKNOWN
+    assert snapshot.get(1) is UNKNOWN
+    assert snapshot.tasks() is None
+
+def test_lookups_are_recorded_misses_included():
+    snapshot = TaskSnapshot()
+    snapshot.found('Report', task(3, 'Report'))
+    snapshot.found('Slides', None)
+    assert snapshot.find('REPORT')['task_id'] == 3
+    assert snapshot.get(3)['task_id'] == 3
+    assert snapshot.find('slides') is None
+
+def test_own_writes_update_the_index():
+    snapshot = TaskSnapshot()
+    snapshot.found('Slides', None)
+    snapshot.found('Report', task(3, 'Report'))
+    snapshot.put([task(9, 'Slides')])
+    assert snapshot.find('slides')['task_id'] == 9
+    # Renamed: the old title is no longer answered from memory
+    snapshot.put([task(3, 'Final report')])
+    assert snapshot.find('report') is UNKNOWN
+    snapshot.remove([9])
+    assert snapshot.find('slides') is UNKNOWN
+    assert snapshot.get(9) is UNKNOWN
+
+def test_created_task_does_not_shadow_an_older_duplicate():
+    snapshot = TaskSnapshot()
+    snapshot.found('Report', task(3, 'Report'))
+    snapshot.put([task(10, 'report')])
+    assert snapshot.find('Report')['task_id'] == 3
+
+def test_full_list_answers_every_lookup():
+    snapshot = TaskSnapshot()
+    snapshot.loaded([task(1, 'A'), task(2, 'a'), task(3, 'B')])
+    assert snapshot.find('a')['task_id'] == 1
+    assert snapshot.find('missing') is None
+    assert snapshot.get(99) is None
+    snapshot.remove([1])
+    # task 2 still has the title, so the snapshot defers to the database
+    assert snapshot.find('A') is UNKNOWN
+    assert [t['task_id'] for t in snapshot.tasks()] == [2, 3]
+
+def test_tasks_without_a_title_are_kept_but_not_indexed():
+    snapshot = TaskSnapshot()
+    snapshot.loaded([task(1, None), task(2, 'B')])
+    assert snapshot.get(1)['title'] is None
+    assert snapshot.find('b')['task_id'] == 2
+    assert snapshot.find(None) is UNKNOWN
+    # Renamed to and from a null title after an update
+    snapshot.put([task(2, None)])
+    assert snapshot.find('b') is UNKNOWN
+    snapshot.put([task(1, 'A')])
+    assert snapshot.find('a')['task_id'] == 1
+    snapshot.remove([1, 2])
+    assert [t['task_id'] for t in snapshot.tasks()] == []
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,56 @@
+"""
+Response compression negotiated through Accept-Encoding.
+
+Buffered JSON and text responses above a size threshold are compressed with
+brotli (when the optional `brotli` package is installed) or gzip, whichever
+the client prefers. Streamed responses (NDJSON, Server-Sent Events) are
+passed through untouched so rows and events still reach the client as soon
+as they are written.
+"""
+import gzip
+import os
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/html', 'text/css', 'application/javascript')
+
+def _encoders(gzip_level: int, brotli_quality: int) -> dict:
+    encoders = {'gzip': lambda data: gzip.compress(data, compresslevel=gzip_level)}
+    if brotli is not None:
+        encoders['br'] = lambda data: brotli.compress(data, quality=brotli_quality)
+    return encoders
+
+def init_compression(app):
+    """Register the after_request hook that compresses eligible responses"""
+    if os.getenv('COMPRESSION_ENABLED', 'true').lower() not in ('1', 'true', 'yes'):
+        return
+    min_size = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+    encoders = _encoders(int(os.getenv('COMPRESSION_GZIP_LEVEL', '6')),
+                         int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4')))
+    # Preferred first when the client weights them equally
+    offered = [name for name in ('br', 'gzip') if name in encoders]
+
+    @app.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 206, 304)
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(offered)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        response.set_data(encoders[encoding](data))
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -1,3 +1,9 @@
 from contextvars import ContextVar
 
 request_token = ContextVar('request_token', default=None)
+
+# Set for speculative agent runs: mutating task tools wait for the reviewer's verdict
+review_gate = ContextVar('review_gate', default=None)
+
+# TaskSnapshot of the current agent run: task tools resolve titles and ids from it
+task_snapshot = ContextVar('task_snapshot', default=None)
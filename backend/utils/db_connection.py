@@ -1,9 +1,18 @@
 import psycopg2
 import psycopg2.extras
+import psycopg2.extensions
+import psycopg2.errors
 from contextlib import contextmanager
-from typing import Optional, Any
+from collections import deque
+from typing import Optional, Any, Iterator
+import itertools
 import logging
 import os
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,6 +20,275 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the acquire timeout"""
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that keeps track of its age and usage for the pool"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.use_count = 0
+        # Names of statements already PREPAREd on this session
+        self.prepared = set()
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of psycopg2 connections.
+    Connections are checked for liveness on checkout and recycled
+    after `max_uses` checkouts or `max_age` seconds.
+    """
+    def __init__(self, connection_params: dict, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 10.0, max_uses: int = 0, max_age: float = 0,
+                 check_idle: float = 5.0):
+        self.connection_params = connection_params
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.timeout = timeout
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.check_idle = check_idle
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        # Monitoring counters
+        self._checkouts = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+
+        for _ in range(self.min_size):
+            self._idle.append(self._connect())
+            self._size += 1
+
+    def _connect(self):
+        return psycopg2.connect(connection_factory=PooledConnection, **self.connection_params)
+
+    def _is_expired(self, conn) -> bool:
+        now = time.monotonic()
+        if self.max_age and now - conn.created_at >= self.max_age:
+            return True
+        if self.max_uses and conn.use_count >= self.max_uses:
+            return True
+        return False
+
+    def _is_alive(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - conn.last_used < self.check_idle:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def getconn(self):
+        """Check out a connection, waiting up to `timeout` seconds for one to be free"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        conn = None
+
+        with self._cond:
+            if self._closed:
+                raise psycopg2.InterfaceError('connection pool is closed')
+            self._waiting += 1
+            try:
+                while True:
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f'Timed out after {self.timeout}s waiting for a database connection'
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._in_use += 1
+
+        try:
+            if conn is not None and (self._is_expired(conn) or not self._is_alive(conn)):
+                self._close(conn)
+                conn = None
+                with self._cond:
+                    self._recycled += 1
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        conn.use_count += 1
+        elapsed = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+        return conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool, closing it if it is broken or expired"""
+        if not discard and not conn.closed:
+            if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+            if self._is_expired(conn):
+                discard = True
+                with self._cond:
+                    self._recycled += 1
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or conn.closed or self._closed:
+                self._size -= 1
+            else:
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._close(conn)
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._close(conn)
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage for monitoring"""
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiting': self._waiting,
+                'checkouts': checkouts,
+                'timeouts': self._timeouts,
+                'recycled': self._recycled,
+                'avg_checkout_ms': round(self._checkout_time_total / checkouts * 1000, 3) if checkouts else 0.0,
+                'max_checkout_ms': round(self._checkout_time_max * 1000, 3)
+            }
+
+def to_positional(query: str) -> str:
+    """Rewrite %s placeholders as $1, $2, ... for use in a PREPARE statement"""
+    counter = itertools.count(1)
+    return re.sub(r'%(s|%)', lambda m: f'${next(counter)}' if m.group(1) == 's' else '%', query)
+
+def execute_statement_sql(name: str, param_count: int) -> str:
+    """EXECUTE command for a prepared statement with the given number of parameters"""
+    if not param_count:
+        return f'EXECUTE {name}'
+    return f"EXECUTE {name} ({', '.join(['%s'] * param_count)})"
+
+READ_ONLY_START = re.compile(r'^\s*(SELECT|WITH|VALUES|SHOW|EXPLAIN)\b', re.IGNORECASE)
+WRITE_KEYWORDS = re.compile(
+    r'\b(INSERT|UPDATE|DELETE|MERGE|CREATE|ALTER|DROP|TRUNCATE|GRANT|REVOKE|LOCK|COPY|CALL|'
+    r'NOTIFY|LISTEN|nextval|setval|pg_notify|set_config)\b|\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b',
+    re.IGNORECASE
+)
+
+def is_read_only(query: str) -> bool:
+    """Conservative check that a statement only reads data and may run on a replica"""
+    return bool(READ_ONLY_START.match(query)) and not WRITE_KEYWORDS.search(query)
+
+# Set once the current request has written, so its later reads see its own writes
+_primary_pinned = ContextVar('db_primary_pinned', default=False)
+# Server that every read in a `consistent_reads()` block goes to
+_read_target = ContextVar('db_read_target', default=None)
+
+REPLICA_LAG_QUERY = """
+SELECT COALESCE(
+    CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+         ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END, 0) AS lag
+"""
+
+class DatabaseTarget:
+    """One Postgres server (the primary or a replica) with its pool and health state"""
+    def __init__(self, name: str, connection_params: dict, pool_settings: dict):
+        self.name = name
+        self.connection_params = connection_params
+        self.pool_settings = pool_settings
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+        self.healthy = True
+        self.lag = 0.0
+        self.failures = 0
+        self.last_error = None
+        self.last_check = None
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool, created on first use so importing this module never touches the network"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(self.connection_params, **self.pool_settings)
+        return self._pool
+
+    @property
+    def pool_initialized(self) -> bool:
+        return self._pool is not None
+
+    def mark_failed(self, error):
+        self.healthy = False
+        self.failures += 1
+        self.last_error = str(error)
+        logger.warning(f"Database target '{self.name}' marked unhealthy: {error}")
+
+    def stats(self) -> dict:
+        stats = {
+            'name': self.name,
+            'host': self.connection_params.get('host'),
+            'port': self.connection_params.get('port'),
+            'healthy': self.healthy,
+            'lag_seconds': round(self.lag, 3),
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'initialized': self.pool_initialized
+        }
+        if self._pool is not None:
+            stats.update(self._pool.stats())
+        return stats
+
 class DatabaseConnection:
     def __init__(self):
         self.connection_params = {
@@ -21,27 +299,164 @@ class DatabaseConnection:
             'password': os.getenv('DB_PASSWORD'),
             'options': f'-c search_path={os.getenv("DB_SCHEMA")}'
         }
-    
+        self.pool_settings = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'max_uses': int(os.getenv('DB_POOL_MAX_USES', '1000')),
+            'max_age': float(os.getenv('DB_POOL_MAX_AGE', '1800')),
+            'check_idle': float(os.getenv('DB_POOL_CHECK_IDLE', '5'))
+        }
+        self.replica_settings = {
+            'max_lag': float(os.getenv('DB_REPLICA_MAX_LAG', '10')),
+            'check_interval': float(os.getenv('DB_REPLICA_CHECK_INTERVAL', '5'))
+        }
+
+        self.primary = DatabaseTarget('primary', self.connection_params, self.pool_settings)
+        self.replicas = [
+            DatabaseTarget(f'replica-{index}', self._replica_params(dsn), self.pool_settings)
+            for index, dsn in enumerate(filter(None, map(str.strip, os.getenv('DB_REPLICA_DSNS', '').split(','))), 1)
+        ]
+        self._replica_counter = itertools.count()
+        self._monitor = None
+        self._monitor_lock = threading.Lock()
+
+        # Named statements prepared lazily on each pooled connection
+        self.statements = {}
+        self.stream_itersize = int(os.getenv('DB_STREAM_ITERSIZE', '500'))
+
+    def _replica_params(self, dsn: str) -> dict:
+        """Connection parameters for a replica DSN, inheriting anything it leaves out from the primary"""
+        return {**self.connection_params, **psycopg2.extensions.parse_dsn(dsn)}
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """Primary connection pool"""
+        return self.primary.pool
+
+    # Read routing
+
+    def reset_routing(self, pinned: bool = False):
+        """
+        Reset read-your-writes pinning at the start of every request.
+        Requests that must see writes from earlier requests start `pinned`.
+        """
+        _primary_pinned.set(pinned)
+
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
+    def use_primary(self):
+        """Route every query in this block (and context) to the primary"""
+        token = _primary_pinned.set(True)
+        try:
+            yield
+        finally:
+            _primary_pinned.reset(token)
+
+    @contextmanager
+    def consistent_reads(self):
+        """
+        Send every read in this block to one server, chosen by the normal read
+        routing (the primary when the request is pinned). A replica only moves
+        forward, so rows read after a version number are at least that new.
+        """
+        token = _read_target.set(self.choose_target(readonly=True))
+        try:
+            yield
+        finally:
+            _read_target.reset(token)
+
+    def mark_write(self):
+        """Pin the rest of the current request to the primary after a write"""
+        if self.replicas:
+            _primary_pinned.set(True)
+
+    def choose_target(self, readonly: bool = False) -> DatabaseTarget:
+        """Primary for writes and pinned requests, otherwise a healthy replica (round robin)"""
+        if not readonly or not self.replicas or _primary_pinned.get():
+            return self.primary
+        target = _read_target.get()
+        if target is not None and target.healthy:
+            return target
+        self._ensure_monitor()
+        candidates = [replica for replica in self.replicas if replica.healthy]
+        if not candidates:
+            return self.primary
+        return candidates[next(self._replica_counter) % len(candidates)]
+
+    def _ensure_monitor(self):
+        if self._monitor is None:
+            with self._monitor_lock:
+                if self._monitor is None:
+                    self._monitor = threading.Thread(target=self._monitor_replicas,
+                                                     name='db-replica-monitor', daemon=True)
+                    self._monitor.start()
+
+    def _monitor_replicas(self):
+        """Background loop: measure replica lag and take lagging or dead replicas out of rotation"""
+        while True:
+            for replica in self.replicas:
+                self.check_replica(replica)
+            time.sleep(self.replica_settings['check_interval'])
+
+    def check_replica(self, replica: DatabaseTarget):
+        """Measure replication lag on one replica and update its health"""
+        conn = None
+        discard = False
+        try:
+            conn = replica.pool.getconn()
+            with conn.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_QUERY)
+                replica.lag = float(cursor.fetchone()[0])
+            conn.rollback()
+            replica.last_check = time.time()
+            if replica.lag > self.replica_settings['max_lag']:
+                replica.mark_failed(f'replication lag {replica.lag:.1f}s exceeds {self.replica_settings["max_lag"]}s')
+            elif not replica.healthy:
+                logger.info(f"Database target '{replica.name}' is healthy again")
+                replica.healthy = True
+        except Exception as e:
+            discard = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            replica.mark_failed(e)
+        finally:
+            if conn is not None:
+                replica.pool.putconn(conn, discard=discard)
+
+    @contextmanager
+    def get_connection(self, readonly: bool = False):
+        """Context manager for pooled database connections, routed by `readonly`"""
+        target = self.choose_target(readonly)
         conn = None
+        discard = False
         try:
-            conn = psycopg2.connect(**self.connection_params)
+            try:
+                conn = target.pool.getconn()
+            except (psycopg2.OperationalError, PoolTimeoutError) as e:
+                if target is self.primary:
+                    raise
+                target.mark_failed(e)
+                target = self.primary
+                conn = target.pool.getconn()
             yield conn
         except Exception as e:
             logger.error(f"Database connection error: {e}")
-            if conn:
-                conn.rollback()
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                discard = True
+                if target is not self.primary:
+                    target.mark_failed(e)
+            elif conn and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
             raise
         finally:
             if conn:
-                conn.close()
-    
+                target.pool.putconn(conn, discard=discard)
+
     @contextmanager
-    def get_cursor(self, cursor_factory=None):
+    def get_cursor(self, cursor_factory=None, readonly: bool = False):
         """Context manager for database cursors"""
-        with self.get_connection() as conn:
+        with self.get_connection(readonly=readonly) as conn:
             cursor = conn.cursor(cursor_factory=cursor_factory)
             try:
                 yield cursor
@@ -52,24 +467,47 @@ class DatabaseConnection:
                 raise
             finally:
                 cursor.close()
-    
-    def execute_query(self, query: str, params: Optional[tuple] = None, 
-                     fetch_one: bool = False, fetch_all: bool = False) -> Optional[Any]:
-        """Execute a SQL query and return results"""
+
+    def retry_on_primary(self, readonly: bool, error: Exception) -> bool:
+        """A read that failed on a replica because the server went away is retried on the primary"""
+        return (readonly and bool(self.replicas) and not _primary_pinned.get()
+                and isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError)))
+
+    def _execute_query(self, query, params, fetch_one, fetch_all, readonly):
+        with self.get_cursor(cursor_factory=psycopg2.extras.RealDictCursor, readonly=readonly) as cursor:
+            cursor.execute(query, params)
+
+            if fetch_one:
+                return cursor.fetchone()
+            elif fetch_all:
+                return cursor.fetchall()
+            else:
+                return None
+
+    def execute_query(self, query: str, params: Optional[tuple] = None,
+                     fetch_one: bool = False, fetch_all: bool = False,
+                     readonly: Optional[bool] = None) -> Optional[Any]:
+        """
+        Execute a SQL query and return results.
+        Read-only queries (detected, or forced with `readonly`) may be served by a replica.
+        """
+        if readonly is None:
+            readonly = is_read_only(query)
         try:
-            with self.get_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                
-                if fetch_one:
-                    return cursor.fetchone()
-                elif fetch_all:
-                    return cursor.fetchall()
-                else:
-                    return None
+            try:
+                return self._execute_query(query, params, fetch_one, fetch_all, readonly)
+            except Exception as e:
+                if not self.retry_on_primary(readonly, e):
+                    raise
+                with self.use_primary():
+                    return self._execute_query(query, params, fetch_one, fetch_all, readonly)
         except Exception as e:
             logger.error(f"Query execution error: {e}")
             raise
-    
+        finally:
+            if not readonly:
+                self.mark_write()
+
     def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
         """Execute an UPDATE/INSERT/DELETE query and return affected rows"""
         try:
@@ -79,6 +517,132 @@ class DatabaseConnection:
         except Exception as e:
             logger.error(f"Update execution error: {e}")
             raise
+        finally:
+            self.mark_write()
+
+    def execute_values(self, query: str, argslist: list, template: Optional[str] = None,
+                       fetch: bool = False) -> Any:
+        """
+        Execute a multi-row statement (`VALUES %s`) for every tuple in `argslist`
+        as a single statement in one transaction. Returns the rows when `fetch`
+        is set, otherwise the number of affected rows.
+        """
+        try:
+            with self.get_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                rows = psycopg2.extras.execute_values(
+                    cursor, query, argslist, template=template,
+                    page_size=max(len(argslist), 1), fetch=fetch
+                )
+                return rows if fetch else cursor.rowcount
+        except Exception as e:
+            logger.error(f"Batch execution error: {e}")
+            raise
+        finally:
+            self.mark_write()
+
+    def prepare_statement(self, name: str, query: str):
+        """
+        Register a named statement (written with %s placeholders).
+        It is PREPAREd the first time each pooled connection executes it.
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Invalid prepared statement name: {name}")
+        self.statements[name] = to_positional(query)
+
+    def stream_query(self, query: str, params: Optional[tuple] = None,
+                     itersize: Optional[int] = None) -> Iterator[Any]:
+        """
+        Yield rows from a named server-side cursor, fetching `itersize` rows per
+        round trip, so memory use does not grow with the size of the result.
+        The pooled connection is held until the generator is exhausted or closed.
+        """
+        with self.get_connection(readonly=is_read_only(query)) as conn:
+            cursor = conn.cursor(name=f'stream_{uuid.uuid4().hex}',
+                                 cursor_factory=psycopg2.extras.RealDictCursor)
+            cursor.itersize = itersize or self.stream_itersize
+            try:
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield row
+            finally:
+                # Closing the connection's transaction is left to the pool on release
+                try:
+                    cursor.close()
+                except psycopg2.Error:
+                    pass
+
+    @staticmethod
+    def _deallocate(conn, name: str):
+        conn.prepared.discard(name)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f'DEALLOCATE {name}')
+            conn.commit()
+        except psycopg2.errors.InvalidSqlStatementName:
+            conn.rollback()
+
+    def _run_prepared(self, conn, name: str, params: tuple, fetch_one: bool, fetch_all: bool) -> Optional[Any]:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            if name not in conn.prepared:
+                cursor.execute(f'PREPARE {name} AS {self.statements[name]}')
+                conn.prepared.add(name)
+            cursor.execute(execute_statement_sql(name, len(params)), params)
+
+            result = None
+            if fetch_one:
+                result = cursor.fetchone()
+            elif fetch_all:
+                result = cursor.fetchall()
+        conn.commit()
+        return result
+
+    def _execute_prepared(self, name, params, fetch_one, fetch_all, readonly):
+        with self.get_connection(readonly=readonly) as conn:
+            try:
+                return self._run_prepared(conn, name, params, fetch_one, fetch_all)
+            except (psycopg2.errors.InvalidSqlStatementName, psycopg2.errors.FeatureNotSupported):
+                # The session lost the statement (e.g. DISCARD ALL) or its cached
+                # plan no longer matches the table definition; prepare it again
+                conn.rollback()
+                self._deallocate(conn, name)
+                return self._run_prepared(conn, name, params, fetch_one, fetch_all)
+
+    def execute_prepared(self, name: str, params: Optional[tuple] = None,
+                         fetch_one: bool = False, fetch_all: bool = False) -> Optional[Any]:
+        """Execute a registered statement by name and return results"""
+        if name not in self.statements:
+            raise KeyError(f"Unknown prepared statement: {name}")
+        params = tuple(params or ())
+        readonly = is_read_only(self.statements[name])
+        try:
+            try:
+                return self._execute_prepared(name, params, fetch_one, fetch_all, readonly)
+            except Exception as e:
+                if not self.retry_on_primary(readonly, e):
+                    raise
+                with self.use_primary():
+                    return self._execute_prepared(name, params, fetch_one, fetch_all, readonly)
+        except Exception as e:
+            logger.error(f"Prepared statement '{name}' execution error: {e}")
+            raise
+        finally:
+            if not readonly:
+                self.mark_write()
+
+    def pool_stats(self) -> dict:
+        """Connection pool statistics (in-use, waiting, checkout latency) for the primary and replicas"""
+        stats = {'initialized': self.primary.pool_initialized}
+        if self.primary.pool_initialized:
+            stats.update(self.primary.pool.stats())
+        if self.replicas:
+            stats['replicas'] = [replica.stats() for replica in self.replicas]
+        return stats
+
+    def close(self):
+        """Close all pooled connections"""
+        for target in [self.primary, *self.replicas]:
+            if target.pool_initialized:
+                target.pool.closeall()
 
 # Global database instance
-db = DatabaseConnection()
\ No newline at end of file
+db = DatabaseConnection()
@@ -0,0 +1,62 @@
+"""
+Fast JSON provider for Flask.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths produce the same output: datetimes and dates as
+ISO 8601, decimals and UUIDs as strings, compact separators, keys in row
+order (no sorting).
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, time
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+
+    @staticmethod
+    def default(o):
+        """Types neither encoder handles natively"""
+        if isinstance(o, (date, time)):
+            return o.isoformat()
+        if isinstance(o, (decimal.Decimal, uuid.UUID)):
+            return str(o)
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            return dataclasses.asdict(o)
+        if hasattr(o, '__html__'):
+            return str(o.__html__())
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    def dumps_bytes(self, obj) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        return json.dumps(obj, default=self.default, ensure_ascii=self.ensure_ascii,
+                          sort_keys=self.sort_keys, separators=(',', ':')).encode()
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # Caller asked for stdlib options (indent, ...): honour them
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): encode straight to bytes, skipping the str round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
@@ -2,6 +2,11 @@
 JWT utility functions for authentication
 """
 import jwt
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify
@@ -15,6 +20,83 @@ JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM')
 JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS'))
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens whose signature has already been verified, keyed by
+    the token's SHA-256 digest. Entries expire at the token's `exp`.
+    Revoked digests are remembered until their `exp` (whether or not the
+    token is still cached) and are rejected before any verification.
+    Revocations are held in this process only.
+    """
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()   # digest -> (exp, payload)
+        self._revoked = {}              # digest -> exp
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revocations = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, digest: str):
+        """Cached payload for a digest, or None when it is unknown or expired"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            exp, payload = entry
+            if exp <= time.time():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload
+
+    def put(self, digest: str, payload: dict):
+        exp = payload.get('exp')
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (exp, payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._revoked
+
+    def revoke(self, digest: str, exp: float):
+        with self._lock:
+            now = time.time()
+            # Drop revocations of tokens that have expired anyway
+            for expired in [d for d, e in self._revoked.items() if e <= now]:
+                del self._revoked[expired]
+            self._revoked[digest] = exp
+            self._entries.pop(digest, None)
+            self.revocations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'revoked': len(self._revoked),
+                'hits': self.hits,
+                'misses': self.misses,
+                'revocations': self.revocations,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None
+            }
+
+# JWT_CACHE_SIZE=0 verifies every token on every request
+token_cache = VerifiedTokenCache(max_size=int(os.getenv('JWT_CACHE_SIZE', '1024')))
+
 def generate_jwt_token(user_data):
     """
     Generate JWT token for authenticated user
@@ -24,7 +106,9 @@ def generate_jwt_token(user_data):
         'username': user_data['username'],
         'role': user_data['role'],
         'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-        'iat': datetime.utcnow()
+        'iat': datetime.utcnow(),
+        # Unique per token, so revoking one login does not revoke another issued in the same second
+        'jti': uuid.uuid4().hex
     }
     
     token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
@@ -33,15 +117,34 @@ def generate_jwt_token(user_data):
 def decode_jwt_token(token):
     """
     Decode and validate JWT token
+    Tokens verified before are served from the verified-token cache
     """
+    digest = token_cache.digest(token)
+    if token_cache.is_revoked(digest):
+        return None
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return dict(payload)
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        token_cache.put(digest, dict(payload))
         return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
 
+def revoke_jwt_token(token):
+    """
+    Revoke a token until it expires
+    Returns False if the token was not valid to begin with
+    """
+    payload = decode_jwt_token(token)
+    if payload is None:
+        return False
+    token_cache.revoke(token_cache.digest(token), payload.get('exp', time.time()))
+    return True
+
 def verify_jwt_token():
     """
     Helper function to verify JWT token from request
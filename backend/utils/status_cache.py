@@ -0,0 +1,137 @@
+"""
+In-process cache of the status lookup table.
+
+The status table is tiny and almost never changes, so task queries read
+`tasks` alone and fill in the `status` label from this cache instead of
+joining on every request.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from utils.db_connection import db
+
+logger = logging.getLogger(__name__)
+
+class StatusCache:
+    def __init__(self, ttl: float = 300.0, min_refresh_interval: float = 5.0):
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._statuses = {}
+        self._loaded_at = None
+        # Fingerprint of the labels, and when this process first saw it
+        self._version = None
+        self._changed_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self):
+        """Reload the status table from the database"""
+        rows = db.execute_query(
+            "SELECT status_id, status, created_at FROM status ORDER BY created_at, status_id",
+            fetch_all=True
+        )
+        statuses = {row['status_id']: dict(row) for row in rows}
+        version = hashlib.sha1(repr(sorted((id, s['status']) for id, s in statuses.items())).encode()).hexdigest()[:12]
+        with self._lock:
+            self._statuses = statuses
+            self._loaded_at = time.monotonic()
+            if version != self._version:
+                self._version = version
+                self._changed_at = datetime.now(timezone.utc)
+        logger.info(f"Status cache loaded {len(rows)} statuses")
+
+    def invalidate(self):
+        """Force a reload on next access, e.g. after the status table changed"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _age(self) -> Optional[float]:
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def _ensure_fresh(self, missing: bool = False):
+        """
+        Reload when the TTL has passed, or when a caller saw an unknown status_id
+        (rate limited so a bad id cannot hammer the database).
+        """
+        def is_fresh():
+            age = self._age()
+            return age is not None and age < self.ttl and not (missing and age >= self.min_refresh_interval)
+
+        if is_fresh():
+            return
+        # Only one thread reloads; the others keep serving the current statuses if there are any
+        if not self._refresh_lock.acquire(blocking=not self._statuses):
+            return
+        try:
+            if is_fresh():
+                return
+            self.refresh()
+        except Exception as e:
+            if not self._statuses:
+                raise
+            # Keep serving the last known statuses rather than failing task reads
+            logger.error(f"Status cache refresh failed, serving stale statuses: {e}")
+            with self._lock:
+                self._loaded_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Fingerprint of the status labels. It is the same in every process, so
+        task validators can include it and a renamed label invalidates them.
+        """
+        self._ensure_fresh()
+        return self._version
+
+    @property
+    def changed_at(self) -> Optional[datetime]:
+        """When this process first loaded the current labels"""
+        self._ensure_fresh()
+        return self._changed_at
+
+    def all(self) -> list:
+        """All statuses, ordered by creation"""
+        self._ensure_fresh()
+        return list(self._statuses.values())
+
+    def ids(self) -> set:
+        """Set of valid status_id values"""
+        self._ensure_fresh()
+        return set(self._statuses)
+
+    def is_valid(self, status_id) -> bool:
+        self._ensure_fresh()
+        if status_id not in self._statuses:
+            self._ensure_fresh(missing=True)
+        return status_id in self._statuses
+
+    def label(self, status_id) -> Optional[str]:
+        """Display label for a status_id (None if unknown, like the old LEFT JOIN)"""
+        status = self._statuses.get(status_id)
+        return status['status'] if status else None
+
+    def attach(self, task):
+        """
+        Copies of a row or a list of rows with 'status' filled in from the cache.
+        The input is left untouched: the task cache hands the same dicts to
+        every request and thread.
+        """
+        if task is None:
+            return task
+        rows = task if isinstance(task, list) else [task]
+        self._ensure_fresh()
+        if any(row.get('status_id') is not None and row['status_id'] not in self._statuses for row in rows):
+            self._ensure_fresh(missing=True)
+        labelled = [{**row, 'status': self.label(row.get('status_id'))} for row in rows]
+        return labelled if isinstance(task, list) else labelled[0]
+
+# Global status cache instance
+status_cache = StatusCache(ttl=float(os.getenv('STATUS_CACHE_TTL', '300')))
@@ -0,0 +1,194 @@
+"""
+Bounded in-process read cache for tasks (LRU with TTL).
+
+Single tasks and list results are cached under separate keys. Writes made
+through the task routes update the affected task entries and drop every
+cached list, and concurrent misses for the same key share one database
+query. Each process has its own cache; the task routes feed it the tasks
+table version (see `observe_version`), so a change made by another instance
+drops the cache as soon as a read notices it, and within `ttl` at most.
+Fills may come from a replica: `get_or_fill` takes the version the fill was
+read at and never stores a result older than the newest version seen.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+_MISS = object()
+
+def task_key(task_id) -> tuple:
+    return ('task', task_id)
+
+def list_key(query: str, params: tuple = ()) -> tuple:
+    return ('list', query, tuple(params or ()))
+
+class TaskCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, value), least recently used first
+        self._loading = {}              # key -> Future of the load in flight
+        self._generation = 0            # bumped by every write
+        self._version = None            # tasks table version the entries are known to be current for
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _put(self, key, value):
+        """Store an entry; caller holds the lock"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _begin(self, key):
+        """
+        Look up `key`. Returns (value, future, generation): a cached value,
+        or a future to wait on when another caller is already loading it, or
+        a new future (with the generation it was started in) when the caller
+        has to load it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, None, None
+                del self._entries[key]
+                self.expirations += 1
+
+            future = self._loading.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return _MISS, future, None
+
+            self.misses += 1
+            future = Future()
+            self._loading[key] = future
+            return _MISS, future, self._generation
+
+    def _finish(self, key, future, generation, value=None, error=None, version=None):
+        with self._lock:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+            # A write landed while loading: hand the result to the waiters but don't keep it
+            keep = error is None and generation == self._generation
+            if keep and version is not None:
+                # Read from a replica behind the newest version seen: serve it, don't keep it
+                keep = self._version is None or version >= self._version
+                self._advance(version)
+            if keep:
+                self._put(key, value)
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def get_or_load(self, key, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, calling `loader()` at most once across concurrent misses"""
+        return self.get_or_fill(key, lambda: (loader(), None))
+
+    def get_or_fill(self, key, fill: Callable[[], Tuple[Any, Optional[int]]]) -> Any:
+        """
+        Like `get_or_load`, but `fill()` returns (value, version) where version
+        is the tasks table version the value was read at (None if unknown).
+        """
+        if not self.enabled:
+            return fill()[0]
+        value, future, generation = self._begin(key)
+        if value is not _MISS:
+            return value
+        if generation is None:
+            return future.result()
+        try:
+            value, version = fill()
+        except BaseException as e:
+            self._finish(key, future, generation, error=e)
+            raise
+        self._finish(key, future, generation, value, version=version)
+        return value
+
+    def _invalidate_lists(self):
+        """Drop every list entry and abandon loads in flight; caller holds the lock"""
+        self._generation += 1
+        self._loading.clear()
+        for key in [key for key in self._entries if key[0] == 'list']:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def write_through(self, tasks: Iterable[dict]):
+        """Store freshly written task rows and drop every cached list"""
+        with self._lock:
+            self._invalidate_lists()
+            if self.enabled:
+                for task in tasks:
+                    self._put(task_key(task['task_id']), task)
+
+    def evict(self, task_ids: Iterable[int]):
+        """Drop deleted (or unknown) tasks and every cached list"""
+        with self._lock:
+            self._invalidate_lists()
+            for task_id in task_ids:
+                self._entries.pop(task_key(task_id), None)
+
+    def observe_version(self, version: int):
+        """
+        Record the tasks table version seen by a request. When it moved past
+        the last one seen, some write (possibly from another process) landed
+        and every entry is dropped. Versions only move forward, so a lagging
+        replica reporting an older one is ignored.
+        """
+        with self._lock:
+            self._advance(version)
+
+    def _advance(self, version: int):
+        """Move to a newer table version, dropping every entry; caller holds the lock"""
+        if self._version is not None and version <= self._version:
+            return
+        if self._version is not None:
+            self._invalidate_lists()
+            self._entries.clear()
+        self._version = version
+
+    def clear(self):
+        with self._lock:
+            self._invalidate_lists()
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'enabled': self.enabled,
+                'version': self._version,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None
+            }
+
+# Global task cache instance; TASK_CACHE_TTL=0 turns caching off
+task_cache = TaskCache(
+    max_entries=int(os.getenv('TASK_CACHE_MAX_ENTRIES', '1024')),
+    ttl=float(os.getenv('TASK_CACHE_TTL', '30'))
+)
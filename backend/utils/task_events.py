@@ -0,0 +1,164 @@
+"""
+Task change feed: one LISTEN connection per process, fanned out to subscribers.
+
+The `task_changes` trigger (see the schema in the README) sends a
+`pg_notify('task_changes', ...)` for every write to `tasks`, from any
+process. A single background thread listens on a dedicated primary
+connection and copies each notification into the queue of every subscriber
+(one per open `GET /api/tasks/events` stream).
+"""
+import json
+import logging
+import queue
+import select
+import threading
+from typing import Optional
+import psycopg2
+import psycopg2.extensions
+from utils.db_connection import db
+from utils.thread_budget import EVENT_STREAM_THREADS, capped
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'task_changes'
+
+# Tells a subscriber it may have missed events and should resync
+RESET_EVENT = {'type': 'reset'}
+
+class TaskEventBroker:
+    def __init__(self, connection_params: dict, max_subscribers: int = 8, queue_size: int = 1000,
+                 poll_interval: float = 5.0, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.connection_params = connection_params
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._conn = None
+
+        # Monitoring counters
+        self.connected = False
+        self.notifications = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.last_error = None
+
+    def subscribe(self) -> Optional[queue.Queue]:
+        """Register a subscriber and return its event queue, or None when the subscriber limit is reached"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = queue.Queue(self.queue_size)
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name='task-event-listener', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event: dict):
+        """Copy an event into every subscriber's queue without blocking the listener"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                # Slow reader: replace its backlog with a single reset so it resyncs once
+                self.dropped += 1
+                with subscription.mutex:
+                    subscription.queue.clear()
+                    subscription.queue.append(RESET_EVENT)
+                    subscription.not_empty.notify()
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.connection_params)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL}')
+        return conn
+
+    def _listen(self):
+        """Background loop: hold the LISTEN connection, reconnecting with backoff when it drops"""
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                self._conn = self._connect()
+                if self.reconnects:
+                    # Anything sent while we were not listening is lost
+                    self.publish(RESET_EVENT)
+                self.connected = True
+                delay = self.reconnect_delay
+                logger.info(f"Listening for task changes on channel '{CHANNEL}'")
+                self._drain(self._conn)
+            except (psycopg2.Error, OSError, ValueError) as e:
+                self.last_error = str(e)
+                if self._stop.is_set():
+                    break
+                logger.error(f"Task change listener failed, reconnecting in {delay:.0f}s: {e}")
+            finally:
+                self.connected = False
+                if self._conn is not None:
+                    try:
+                        self._conn.close()
+                    except psycopg2.Error:
+                        pass
+                    self._conn = None
+            self.reconnects += 1
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _drain(self, conn):
+        while not self._stop.is_set():
+            if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                # Idle: a round trip makes sure a dead connection does not go unnoticed
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self.notifications += 1
+                try:
+                    payload = json.loads(notify.payload)
+                except ValueError:
+                    payload = {}
+                self.publish({'type': 'task', **payload})
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers = len(self._subscribers)
+        return {
+            'listening': self.connected,
+            'subscribers': subscribers,
+            'max_subscribers': self.max_subscribers,
+            'notifications': self.notifications,
+            'dropped': self.dropped,
+            'reconnects': self.reconnects,
+            'last_error': self.last_error
+        }
+
+    def close(self):
+        """Stop the listener thread and close its connection"""
+        self._stop.set()
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
+
+# Global broker instance; listens on the primary (NOTIFY is not delivered on replicas)
+task_events = TaskEventBroker(
+    db.connection_params,
+    # Each stream holds a server thread; see utils/thread_budget.py
+    max_subscribers=capped('TASK_EVENTS_MAX_SUBSCRIBERS', EVENT_STREAM_THREADS)
+)
@@ -0,0 +1,153 @@
+"""
+Per-run task snapshot shared by the agent task tools.
+
+Every tool call builds a new TaskTools, so without a shared view a prompt
+like "rename X and delete Y" repeats the same lookups once per call. The
+gateway puts one TaskSnapshot in the `task_snapshot` context var for each
+agent run. It is filled lazily from what the tools already fetch: indexed
+title lookups (including misses), tasks read by id, a full list if the
+agent asks for one, and the tools' own writes. Nothing is loaded up front,
+so a one-task prompt still costs one indexed query.
+
+Lookups answer a task, None when the task is known not to exist, or
+UNKNOWN when the snapshot cannot tell and the caller should query. Writes by
+other clients during the run are not seen.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+# Returned by lookups the snapshot cannot answer
+UNKNOWN = object()
+
+def title_key(title) -> Optional[str]:
+    """Index key for a title; None for tasks without one (title is nullable), which are not indexed"""
+    return title.lower() if isinstance(title, str) else None
+
+class TaskSnapshot:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, dict] = {}
+        # lower-cased title -> task, or None when no task has that title
+        self._by_title: Dict[str, Optional[dict]] = {}
+        # Titles whose owner was deleted or renamed; another task may still carry them
+        self._stale: Set[str] = set()
+        # True once a full task list was recorded: every task is then in _by_id
+        self.complete = False
+
+        # Monitoring counters
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, value):
+        if value is UNKNOWN:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _index_title(self, task: dict):
+        key = title_key(task['title'])
+        if key is None:
+            return
+        if key in self._by_title:
+            current = self._by_title[key]
+            # Same rule as the title queries: the oldest task wins a duplicate title
+            if current is None or current['task_id'] > task['task_id']:
+                self._by_title[key] = task
+        elif self.complete and key not in self._stale:
+            self._by_title[key] = task
+
+    def _drop_title(self, task: dict):
+        key = title_key(task['title'])
+        if key is not None and self._by_title.get(key) is task:
+            # Another task may share the title; the next lookup asks the database
+            del self._by_title[key]
+            self._stale.add(key)
+
+    # Reads
+
+    def tasks(self) -> Optional[List[dict]]:
+        """Every task, or None until a full list has been recorded"""
+        with self._lock:
+            if not self.complete:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return sorted(self._by_id.values(), key=lambda task: task['task_id'])
+
+    def get(self, task_id: int):
+        """Task by id, None if it is known not to exist, or UNKNOWN"""
+        with self._lock:
+            task = self._by_id.get(task_id)
+            if task is None and not self.complete:
+                return self._count(UNKNOWN)
+            return self._count(task)
+
+    def find(self, title: str):
+        """Task by case-insensitive title, None if no task has it, or UNKNOWN"""
+        key = title_key(title)
+        with self._lock:
+            if key is None:
+                return self._count(UNKNOWN)
+            if key in self._by_title:
+                return self._count(self._by_title[key])
+            if self.complete and key not in self._stale:
+                return self._count(None)
+            return self._count(UNKNOWN)
+
+    # Recording what the tools fetched
+
+    def found(self, title: str, task: Optional[dict]):
+        """Record the result of an indexed title lookup, a miss included"""
+        with self._lock:
+            key = title_key(title)
+            if key is not None:
+                self._by_title[key] = task
+                self._stale.discard(key)
+            if task is not None:
+                self._by_id[task['task_id']] = task
+
+    def seen(self, tasks: Iterable[dict]):
+        """Record tasks read by id"""
+        with self._lock:
+            for task in tasks:
+                old = self._by_id.get(task['task_id'])
+                if old is not None:
+                    self._drop_title(old)
+                self._by_id[task['task_id']] = task
+                self._index_title(task)
+
+    def loaded(self, tasks: List[dict]):
+        """Record a full task list; from then on every lookup is answered here"""
+        with self._lock:
+            self._by_id = {task['task_id']: task for task in tasks}
+            self._by_title = {}
+            self._stale.clear()
+            self.complete = True
+            for task in sorted(tasks, key=lambda task: task['task_id'], reverse=True):
+                key = title_key(task['title'])
+                if key is not None:
+                    self._by_title[key] = task
+
+    # Writes made by this run
+
+    def put(self, tasks: Iterable[dict]):
+        """Add or replace created / updated tasks"""
+        self.seen(tasks)
+
+    def remove(self, task_ids: Iterable[int]):
+        with self._lock:
+            for task_id in task_ids:
+                task = self._by_id.pop(task_id, None)
+                if task is not None:
+                    self._drop_title(task)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'complete': self.complete,
+                'tasks': len(self._by_id),
+                'titles': len(self._by_title),
+                'hits': self.hits,
+                'misses': self.misses
+            }
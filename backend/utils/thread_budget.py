@@ -0,0 +1,33 @@
+"""
+Server thread budget.
+
+Waitress serves each request on one of a fixed number of threads, and some
+requests hold their thread for a long time: every admitted agent prompt
+(streamed or not) and every open `GET /api/tasks/events` stream. The caps on
+those requests are derived here from the server's thread count, so that
+`SERVER_RESERVED_THREADS` threads are always left for plain requests such
+as task CRUD, whatever the env says about the individual caps.
+"""
+import os
+
+# Must match waitress-serve --threads (package.json prod:backend)
+SERVER_THREADS = max(int(os.getenv('SERVER_THREADS', '16')), 3)
+# Threads that long-lived requests can never take
+RESERVED_THREADS = min(max(int(os.getenv('SERVER_RESERVED_THREADS', str(SERVER_THREADS // 2))), 1), SERVER_THREADS - 2)
+LONG_LIVED_THREADS = SERVER_THREADS - RESERVED_THREADS
+
+# The long-lived share is split between agent prompts and task event streams
+AGENT_THREADS = LONG_LIVED_THREADS // 2
+EVENT_STREAM_THREADS = LONG_LIVED_THREADS - AGENT_THREADS
+
+def capped(name: str, share: int) -> int:
+    """Limit from env var `name` (default: the whole share), never above the share"""
+    return max(min(int(os.getenv(name, str(share))), share), 0)
+
+def stats() -> dict:
+    return {
+        'server_threads': SERVER_THREADS,
+        'reserved_threads': RESERVED_THREADS,
+        'agent_threads': AGENT_THREADS,
+        'event_stream_threads': EVENT_STREAM_THREADS
+    }
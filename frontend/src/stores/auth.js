@@ -42,6 +42,14 @@ export const useAuthStore = defineStore('auth', {
     },
 
     async logout() {
+      if (this.token && this.isAuthenticated) {
+        try {
+          // Revoke the token server-side so a copy of it stops working too
+          await axios.post(`${API_BASE_URL}/api/users/logout`)
+        } catch (error) {
+          console.error('Error revoking token:', error)
+        }
+      }
       this.token = null
       this.user = null
       this.isAuthenticated = false
@@ -2,22 +2,161 @@ import { defineStore } from 'pinia'
 import axios from 'axios'
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:5000'
+const PAGE_SIZE = 50
+const EVENTS_RECONNECT_MS = 3000
+const EVENTS_MAX_BACKOFF_MS = 5 * 60 * 1000
+const EVENTS_SYNC_DELAY_MS = 250
+const EVENTS_POLL_MS = 15000
+
+// Live change feed (not reactive state): the open stream's AbortController, a pending
+// sync, and the delta polling used while the server has no stream slot for us
+let eventsController = null
+let eventsSyncTimer = null
+let eventsPollTimer = null
+
+// Milliseconds asked for by a Retry-After header (seconds or an HTTP date), or 0
+function retryAfterMs(response) {
+  const value = response.headers.get('Retry-After')
+  if (!value) return 0
+  const seconds = Number(value)
+  const ms = Number.isNaN(seconds) ? Date.parse(value) - Date.now() : seconds * 1000
+  return Number.isNaN(ms) ? 0 : Math.max(ms, 0)
+}
+
+// Read a Server-Sent Events body, calling onEvent(type, data) for every event block
+async function readEventStream(response, onEvent) {
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += value
+    let boundary
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary)
+      buffer = buffer.slice(boundary + 2)
+      const lines = block.split('\n')
+      const type = lines.find(line => line.startsWith('event:'))?.slice(6).trim()
+      if (!type) continue // comments (keep-alive) and retry hints
+      const data = lines.filter(line => line.startsWith('data:')).map(line => line.slice(5).trim()).join('\n')
+      onEvent(type, data ? JSON.parse(data) : null)
+    }
+  }
+}
 
 export const useTasksStore = defineStore('tasks', {
   state: () => ({
     tasks: [],
+    // Loaded from GET /api/statuses, ordered by creation
+    statuses: [],
     loading: false,
-    error: null
+    loadingMore: false,
+    error: null,
+    nextCursor: null,
+    // Validator of the last first-page response, and the list params it belongs to
+    listETag: null,
+    listETagParams: null,
+    // Token for GET /api/tasks/changes, taken just before the list was loaded
+    syncToken: null,
+    // Filtering and ordering are evaluated by the API (status_id, 'asc' | 'desc' by created time)
+    filters: {
+      status: null,
+      order: 'desc'
+    }
   }),
 
+  getters: {
+    hasMore: (state) => !!state.nextCursor,
+    // Display label for a status_id; unknown ids fall back to the raw id
+    statusLabel: (state) => (statusId) => state.statuses.find(status => status.status_id === statusId)?.status || statusId,
+    listParams: (state) => {
+      const params = { order: state.filters.order, limit: PAGE_SIZE }
+      if (state.filters.status) {
+        params.status = state.filters.status
+      }
+      return params
+    }
+  },
+
   actions: {
-    async fetchTasks() {
+    matchesFilters(task) {
+      return !this.filters.status || task.status_id === this.filters.status
+    },
+
+    // Same order as the API: created time, then task_id
+    compareTasks(a, b) {
+      const diff = (new Date(a.created_at) - new Date(b.created_at)) || (a.task_id - b.task_id)
+      return this.filters.order === 'asc' ? diff : -diff
+    },
+
+    insertSorted(task) {
+      const index = this.tasks.findIndex(existing => this.compareTasks(task, existing) < 0)
+      if (index !== -1) {
+        this.tasks.splice(index, 0, task)
+      } else if (!this.nextCursor) {
+        this.tasks.push(task)
+      }
+      // Otherwise it sorts after the loaded pages and arrives with a later page
+    },
+
+    applyChanges({ tasks, deleted }) {
+      const gone = new Set(deleted)
+      for (const task of tasks) {
+        if (!this.matchesFilters(task)) {
+          gone.add(task.task_id)
+        }
+      }
+      if (gone.size) {
+        this.tasks = this.tasks.filter(task => !gone.has(task.task_id))
+      }
+      for (const task of tasks) {
+        if (!this.matchesFilters(task)) continue
+        const index = this.tasks.findIndex(existing => existing.task_id === task.task_id)
+        if (index !== -1) {
+          this.tasks[index] = task
+        } else {
+          this.insertSorted(task)
+        }
+      }
+    },
+
+    async fetchStatuses() {
+      try {
+        const response = await axios.get(`${API_BASE_URL}/api/statuses`)
+        this.statuses = response.data
+      } catch (error) {
+        console.error('Error fetching statuses:', error)
+      }
+    },
+
+    async fetchTasks({ readYourWrites = false } = {}) {
       this.loading = true
       this.error = null
       
       try {
-        const response = await axios.get(`${API_BASE_URL}/api/tasks`)
-        this.tasks = response.data
+        // Right after a write, ask the API to read from the primary instead of a replica
+        const headers = readYourWrites ? { 'X-Read-Your-Writes': '1' } : {}
+        // Take the sync token first so no change between it and the list can be missed
+        const changes = await axios.get(`${API_BASE_URL}/api/tasks/changes`, { headers })
+        this.syncToken = changes.data.next_token
+
+        // Revalidate instead of re-downloading: the API answers 304 when nothing changed
+        const paramsKey = JSON.stringify(this.listParams)
+        if (this.listETag && this.listETagParams === paramsKey) {
+          headers['If-None-Match'] = this.listETag
+        }
+        const response = await axios.get(`${API_BASE_URL}/api/tasks`, {
+          params: this.listParams,
+          headers,
+          validateStatus: status => (status >= 200 && status < 300) || status === 304
+        })
+        if (response.status === 304) {
+          return
+        }
+        this.tasks = response.data.tasks
+        this.nextCursor = response.data.next_cursor
+        this.listETag = response.headers.etag || null
+        this.listETagParams = this.listETag ? paramsKey : null
       } catch (error) {
         console.error('Error fetching tasks:', error)
         this.error = error.response?.data?.error || 'Failed to fetch tasks'
@@ -26,10 +165,135 @@ export const useTasksStore = defineStore('tasks', {
       }
     },
 
+    // Pull only what changed since the last load or sync; falls back to a full fetch
+    async syncTasks({ readYourWrites = false } = {}) {
+      if (!this.syncToken) {
+        return this.fetchTasks({ readYourWrites })
+      }
+
+      try {
+        const headers = readYourWrites ? { 'X-Read-Your-Writes': '1' } : {}
+        const response = await axios.get(`${API_BASE_URL}/api/tasks/changes`, {
+          params: { since: this.syncToken },
+          headers
+        })
+        if (response.data.reset) {
+          return this.fetchTasks({ readYourWrites })
+        }
+        this.applyChanges(response.data)
+        this.syncToken = response.data.next_token
+      } catch (error) {
+        console.error('Error syncing tasks:', error)
+        return this.fetchTasks({ readYourWrites })
+      }
+    },
+
+    // Coalesce bursts of change events into one delta sync
+    scheduleSync() {
+      clearTimeout(eventsSyncTimer)
+      eventsSyncTimer = setTimeout(() => this.syncTasks(), EVENTS_SYNC_DELAY_MS)
+    },
+
+    // Follow GET /api/tasks/events. fetch() instead of EventSource so the
+    // Authorization header can be sent; reconnects until unsubscribed.
+    // When the server is out of stream slots (503 / Retry-After) it backs off
+    // exponentially and polls syncTasks() until a slot frees up.
+    async subscribeToEvents() {
+      if (eventsController) return
+      const controller = new AbortController()
+      eventsController = controller
+      let backoff = EVENTS_RECONNECT_MS
+
+      while (eventsController === controller) {
+        let delay = EVENTS_RECONNECT_MS
+        try {
+          const response = await fetch(`${API_BASE_URL}/api/tasks/events`, {
+            headers: { Authorization: axios.defaults.headers.common['Authorization'] },
+            signal: controller.signal
+          })
+          if (response.status === 503 || (!response.ok && response.headers.has('Retry-After'))) {
+            backoff = Math.min(backoff * 2, EVENTS_MAX_BACKOFF_MS)
+            delay = Math.max(backoff, retryAfterMs(response))
+            this.startPolling()
+            throw new Error(`Event stream refused with status ${response.status}, retrying in ${Math.round(delay / 1000)}s`)
+          }
+          if (!response.ok) {
+            throw new Error(`Event stream failed with status ${response.status}`)
+          }
+          backoff = EVENTS_RECONNECT_MS
+          this.stopPolling()
+          // Catch up on anything missed while disconnected
+          this.scheduleSync()
+
+          await readEventStream(response, (type) => {
+            if (type === 'task' || type === 'reset') {
+              this.scheduleSync()
+            }
+          })
+        } catch (error) {
+          if (controller.signal.aborted) break
+          console.error('Task event stream error:', error)
+        }
+        if (eventsController !== controller) break
+        await new Promise(resolve => setTimeout(resolve, delay))
+      }
+    },
+
+    // Delta polling, used only while the event stream is unavailable
+    startPolling() {
+      if (!eventsPollTimer) {
+        eventsPollTimer = setInterval(() => this.syncTasks(), EVENTS_POLL_MS)
+      }
+    },
+
+    stopPolling() {
+      clearInterval(eventsPollTimer)
+      eventsPollTimer = null
+    },
+
+    unsubscribeFromEvents() {
+      if (eventsController) {
+        eventsController.abort()
+        eventsController = null
+      }
+      clearTimeout(eventsSyncTimer)
+      this.stopPolling()
+    },
+
+    async fetchMoreTasks() {
+      if (!this.nextCursor || this.loadingMore) return
+
+      this.loadingMore = true
+      try {
+        const response = await axios.get(`${API_BASE_URL}/api/tasks`, {
+          params: { ...this.listParams, after: this.nextCursor }
+        })
+        this.tasks.push(...response.data.tasks)
+        this.nextCursor = response.data.next_cursor
+      } catch (error) {
+        console.error('Error fetching more tasks:', error)
+        this.error = error.response?.data?.error || 'Failed to fetch tasks'
+      } finally {
+        this.loadingMore = false
+      }
+    },
+
+    async setFilters(filters) {
+      this.filters = { ...this.filters, ...filters }
+      await this.fetchTasks()
+    },
+
     async createTask(taskData) {
       try {
         const response = await axios.post(`${API_BASE_URL}/api/tasks`, taskData)
-        this.tasks.push(response.data)
+        if (this.matchesFilters(response.data)) {
+          if (this.filters.order === 'desc') {
+            this.tasks.unshift(response.data)
+          } else if (!this.nextCursor) {
+            // Otherwise it will arrive with the last page
+            this.tasks.push(response.data)
+          }
+        }
         return { success: true, task: response.data }
       } catch (error) {
         console.error('Error creating task:', error)
@@ -45,7 +309,11 @@ export const useTasksStore = defineStore('tasks', {
         const response = await axios.put(`${API_BASE_URL}/api/tasks/${taskId}`, taskData)
         const index = this.tasks.findIndex(task => task.task_id === taskId)
         if (index !== -1) {
-          this.tasks[index] = response.data
+          if (this.matchesFilters(response.data)) {
+            this.tasks[index] = response.data
+          } else {
+            this.tasks.splice(index, 1)
+          }
         }
         return { success: true, task: response.data }
       } catch (error) {
@@ -71,14 +339,54 @@ export const useTasksStore = defineStore('tasks', {
       }
     },
 
+    // Streamed variant: onEvent(event) sees status, review, text, tool_start, tool_end as they arrive
+    async streamAgentPrompt(prompt, onEvent) {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/agent/process/stream`, {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+            Authorization: axios.defaults.headers.common['Authorization']
+          },
+          body: JSON.stringify({ prompt })
+        })
+        if (!response.ok) {
+          const body = await response.json().catch(() => ({}))
+          return { success: false, message: body.error || 'Failed to process prompt' }
+        }
+
+        let outcome = { success: false, message: 'The agent stream ended unexpectedly' }
+        await readEventStream(response, (type, event) => {
+          if (type === 'done') {
+            outcome = event.status === 'success'
+              ? { success: true, response: event.response }
+              : { success: false, message: event.response }
+          } else if (type === 'error') {
+            outcome = { success: false, message: event.message }
+          } else {
+            onEvent?.(event)
+          }
+        })
+
+        if (outcome.success) {
+          // Pull in whatever the agent changed
+          await this.syncTasks({ readYourWrites: true })
+        }
+        return outcome
+      } catch (error) {
+        console.error('Error streaming agent prompt:', error)
+        return { success: false, message: 'Failed to process prompt' }
+      }
+    },
+
     async processAgentPrompt(prompt) {
       try {
         const response = await axios.post(`${API_BASE_URL}/api/agent/process`, {
           prompt
         })
         
-        // Refresh tasks as the agent might have modified them
-        await this.fetchTasks()
+        // Pull in whatever the agent changed
+        await this.syncTasks({ readYourWrites: true })
         
         return { 
           success: true, 
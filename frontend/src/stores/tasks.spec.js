@@ -0,0 +1,168 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest'
+import { createPinia, setActivePinia } from 'pinia'
+import axios from 'axios'
+import { useTasksStore } from './tasks'
+
+vi.mock('axios')
+
+describe('tasks store statuses', () => {
+  beforeEach(() => {
+    setActivePinia(createPinia())
+    vi.resetAllMocks()
+  })
+
+  it('starts without hardcoded statuses', () => {
+    const store = useTasksStore()
+    expect(store.statuses).toEqual([])
+  })
+
+  it('loads statuses from the API', async () => {
+    const statuses = [
+      { status_id: 'BACKLOG', status: 'Backlog' },
+      { status_id: 'DONE', status: 'Done' }
+    ]
+    axios.get.mockResolvedValue({ data: statuses })
+    const store = useTasksStore()
+
+    await store.fetchStatuses()
+
+    expect(axios.get).toHaveBeenCalledWith(expect.stringMatching(/\/api\/statuses$/))
+    expect(store.statuses).toEqual(statuses)
+    expect(store.statusLabel('BACKLOG')).toBe('Backlog')
+    expect(store.statusLabel('UNKNOWN')).toBe('UNKNOWN')
+  })
+})
+
+const task = (task_id, created_at, status_id = 'TODO') => ({ task_id, title: `Task ${task_id}`, status_id, created_at })
+
+describe('tasks store paging', () => {
+  beforeEach(() => {
+    setActivePinia(createPinia())
+    vi.resetAllMocks()
+  })
+
+  it('loads the next page with the cursor from the previous one', async () => {
+    const store = useTasksStore()
+    axios.get
+      .mockResolvedValueOnce({ data: { next_token: 'sync-1' } })
+      .mockResolvedValueOnce({ status: 200, headers: {}, data: { tasks: [task(3, '2024-01-03')], next_cursor: 'cursor-1' } })
+      .mockResolvedValueOnce({ data: { tasks: [task(2, '2024-01-02')], next_cursor: null } })
+
+    await store.fetchTasks()
+    expect(store.hasMore).toBe(true)
+    await store.fetchMoreTasks()
+
+    expect(axios.get.mock.calls[2][1].params.after).toBe('cursor-1')
+    expect(store.tasks.map(t => t.task_id)).toEqual([3, 2])
+    expect(store.hasMore).toBe(false)
+  })
+})
+
+describe('tasks store conditional requests', () => {
+  beforeEach(() => {
+    setActivePinia(createPinia())
+    vi.resetAllMocks()
+  })
+
+  it('revalidates with the ETag and keeps the list on 304', async () => {
+    const store = useTasksStore()
+    axios.get
+      .mockResolvedValueOnce({ data: { next_token: 'sync-1' } })
+      .mockResolvedValueOnce({ status: 200, headers: { etag: 'W/"tasks-7"' }, data: { tasks: [task(1, '2024-01-01')], next_cursor: null } })
+      .mockResolvedValueOnce({ data: { next_token: 'sync-2' } })
+      .mockResolvedValueOnce({ status: 304, headers: {}, data: '' })
+
+    await store.fetchTasks()
+    await store.fetchTasks()
+
+    expect(axios.get.mock.calls[3][1].headers['If-None-Match']).toBe('W/"tasks-7"')
+    expect(store.tasks.map(t => t.task_id)).toEqual([1])
+    expect(store.syncToken).toBe('sync-2')
+  })
+})
+
+describe('tasks store delta sync', () => {
+  beforeEach(() => {
+    setActivePinia(createPinia())
+    vi.resetAllMocks()
+  })
+
+  it('applies delta sync changes and deletions in list order', async () => {
+    const store = useTasksStore()
+    store.tasks = [task(2, '2024-01-02'), task(1, '2024-01-01')]
+    store.syncToken = 'sync-1'
+    axios.get.mockResolvedValueOnce({
+      data: { tasks: [task(3, '2024-01-03'), { ...task(2, '2024-01-02'), title: 'Renamed' }], deleted: [1], next_token: 'sync-2', reset: false }
+    })
+
+    await store.syncTasks()
+
+    expect(axios.get.mock.calls[0][1].params.since).toBe('sync-1')
+    expect(store.tasks.map(t => t.task_id)).toEqual([3, 2])
+    expect(store.tasks[1].title).toBe('Renamed')
+    expect(store.syncToken).toBe('sync-2')
+  })
+
+  it('reloads the full list when the sync token was reset', async () => {
+    const store = useTasksStore()
+    store.syncToken = 'stale'
+    axios.get
+      .mockResolvedValueOnce({ data: { tasks: [], deleted: [], next_token: 'sync-2', reset: true } })
+      .mockResolvedValueOnce({ data: { next_token: 'sync-3' } })
+      .mockResolvedValueOnce({ status: 200, headers: {}, data: { tasks: [task(5, '2024-01-05')], next_cursor: null } })
+
+    await store.syncTasks()
+
+    expect(store.tasks.map(t => t.task_id)).toEqual([5])
+    expect(store.syncToken).toBe('sync-3')
+  })
+})
+
+describe('tasks store event stream', () => {
+  const refused = (headers = {}) => ({ ok: false, status: 503, headers: new Headers(headers) })
+  let store
+
+  beforeEach(() => {
+    setActivePinia(createPinia())
+    vi.resetAllMocks()
+    vi.useFakeTimers()
+    vi.spyOn(console, 'error').mockImplementation(() => {})
+    store = useTasksStore()
+    store.syncToken = 'sync-1'
+    axios.get.mockResolvedValue({ data: { tasks: [], deleted: [], next_token: 'sync-1' } })
+  })
+
+  afterEach(() => {
+    store.unsubscribeFromEvents()
+    vi.useRealTimers()
+    vi.unstubAllGlobals()
+    vi.restoreAllMocks()
+  })
+
+  it('backs off exponentially while the server has no stream slot', async () => {
+    const fetch = vi.fn().mockResolvedValue(refused())
+    vi.stubGlobal('fetch', fetch)
+
+    store.subscribeToEvents()
+    await vi.advanceTimersByTimeAsync(0)
+    expect(fetch).toHaveBeenCalledTimes(1)
+    await vi.advanceTimersByTimeAsync(6000)
+    expect(fetch).toHaveBeenCalledTimes(2)
+    await vi.advanceTimersByTimeAsync(11000)
+    expect(fetch).toHaveBeenCalledTimes(2)
+    await vi.advanceTimersByTimeAsync(1000)
+    expect(fetch).toHaveBeenCalledTimes(3)
+  })
+
+  it('follows Retry-After and polls for changes until a slot frees', async () => {
+    const fetch = vi.fn().mockResolvedValue(refused({ 'Retry-After': '30' }))
+    vi.stubGlobal('fetch', fetch)
+
+    store.subscribeToEvents()
+    await vi.advanceTimersByTimeAsync(29000)
+    expect(fetch).toHaveBeenCalledTimes(1)
+    expect(axios.get).toHaveBeenCalledWith(expect.stringMatching(/\/api\/tasks\/changes$/), expect.anything())
+    await vi.advanceTimersByTimeAsync(1000)
+    expect(fetch).toHaveBeenCalledTimes(2)
+  })
+})